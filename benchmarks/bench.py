@@ -0,0 +1,244 @@
+"""Benchmarks for the pricing engine and the table hot paths.
+
+    python benchmarks/bench.py                      # run, compare with baseline.json
+    python benchmarks/bench.py --save-baseline      # run and store as the new baseline
+    python benchmarks/bench.py -k recompute --sizes 1000,100000
+
+Every benchmark reports the best of a few repeats in seconds per
+operation. Results are compared with the stored baseline and any that got
+slower by more than ``--threshold`` (default 20 %) are listed as
+regressions, with exit status 1. Baselines are only comparable on the same
+machine; regenerate it when the hardware changes.
+
+The table benchmarks drive a real ``PricingApp`` on Qt's offscreen
+platform, so no display is needed.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Loading big sheets would otherwise be journaled into the user's session
+os.environ.setdefault("GR24_AUTOSAVE", "0")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+DEFAULT_THRESHOLD = 0.2
+# Each benchmark repeats until this much time was spent (at least twice)
+MIN_TOTAL_S = 1.0
+MAX_REPEATS = 10
+# Calls without a setup are looped until one repeat takes this long
+MIN_REPEAT_S = 0.05
+
+# name -> (function to time, operations per call, setup run before each repeat)
+Benchmark = Tuple[Callable[[], None], int, Optional[Callable[[], None]]]
+
+# The QApplication of the table benchmarks, kept for the whole run
+_app = None
+
+
+def random_inputs(rows: int, seed: int = 0) -> List[np.ndarray]:
+    """Nine typed input columns with realistic amounts and percentages."""
+    rng = np.random.default_rng(seed)
+    money = [np.round(rng.uniform(0, 200, rows), 2) for _ in range(3)]
+    pct = [np.round(rng.uniform(0, 40, rows), 2)] + [np.round(rng.uniform(0, 15, rows), 2)
+                                                      for _ in range(3)]
+    vat = rng.choice([0.0, 7.0, 19.0], rows)
+    return [rng.integers(1, 100, rows)] + money + pct + [vat]
+
+
+def measure(fn: Callable[[], None], ops: int, setup: Optional[Callable[[], None]] = None) -> float:
+    """Best time per operation over repeated calls of ``fn``."""
+    number = 1
+    if setup is None:
+        # Loop fast calls so timer resolution and noise don't dominate
+        while True:
+            started = time.perf_counter()
+            for _ in range(number):
+                fn()
+            if time.perf_counter() - started >= MIN_REPEAT_S:
+                break
+            number *= 2
+    best, spent, repeats = float("inf"), 0.0, 0
+    while repeats < 2 or (spent < MIN_TOTAL_S and repeats < MAX_REPEATS):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - started
+        best, spent, repeats = min(best, elapsed), spent + elapsed, repeats + 1
+    return best / number / ops
+
+
+def engine_benchmarks(sizes) -> Dict[str, Benchmark]:
+    from gr24.batch import price_columns
+    from gr24.cache import PricingCache
+    from gr24.fixed import compute_pricing_fixed
+    from gr24.parallel import price_columns_parallel
+    from gr24.pricing import compute_pricing
+
+    rows = [list(map(str, r)) for r in zip(*random_inputs(1000))]
+    cache = PricingCache()
+
+    def scalar(pricer):
+        return lambda: [pricer(*row) for row in rows]
+
+    cases = {
+        "scalar/decimal": (scalar(compute_pricing), len(rows), None),
+        "scalar/fixed": (scalar(compute_pricing_fixed), len(rows), None),
+        "scalar/cached": (scalar(cache), len(rows), None),
+    }
+    for n in sizes:
+        columns = random_inputs(n)
+        for backend in ("float", "fixed"):
+            cases[f"batch/{backend}/{n}"] = (
+                lambda c=columns, b=backend: price_columns(*c, errors="coerce", backend=b), n, None)
+        cases[f"parallel/{n}"] = (
+            lambda c=columns: price_columns_parallel(*c, errors="coerce"), n, None)
+    return cases
+
+
+def table_benchmarks(sizes) -> Dict[str, Benchmark]:
+    from PySide6.QtWidgets import QApplication
+
+    import gr24_pricing_app
+    from gr24.export import write_xlsx
+    from gr24.project import write_json
+
+    global _app
+    _app = QApplication.instance() or QApplication([])
+    window = gr24_pricing_app.PricingApp()
+    caches = gr24_pricing_app.PRICING_CACHES
+    folder = tempfile.mkdtemp(prefix="gr24-bench-")
+    cases = {}
+
+    for n in sizes:
+        columns = random_inputs(n, seed=1)
+        picks = np.random.default_rng(n).integers(0, n, 1000).tolist()
+
+        def load(c=columns):
+            window.load_inputs(c)
+            # Let the background reprice finish so it doesn't compete with the timing
+            while window.repricer.pending():
+                _app.processEvents()
+                time.sleep(0.001)
+            for cache in caches.values():
+                cache.clear()
+
+        def recompute(picks=picks):
+            for row in picks:
+                window._recompute_row(row)
+
+        def add_rows():
+            for _ in range(100):
+                window._add_row()
+
+        def save_json():
+            rows, priced = window._snapshot()
+            write_json(os.path.join(folder, "sheet.json"), "en", rows, priced)
+
+        def export_excel():
+            rows, priced = window._snapshot()
+            write_xlsx(os.path.join(folder, "sheet.xlsx"), gr24_pricing_app.EN_COLS, rows, priced)
+
+        cases[f"recompute_row/{n}"] = (recompute, len(picks), load)
+        cases[f"add_row/{n}"] = (add_rows, 100, load)
+        cases[f"gather_dataframe/{n}"] = (window._gather_dataframe, 1, load)
+        cases[f"save_json/{n}"] = (save_json, 1, load)
+        cases[f"export_excel/{n}"] = (export_excel, 1, load)
+    return cases
+
+
+def run(sizes, pattern: str = "") -> Dict[str, float]:
+    results = {}
+    for group in (engine_benchmarks, table_benchmarks):
+        cases = group(sizes)
+        selected = {name: case for name, case in cases.items() if pattern in name}
+        for name, (fn, ops, setup) in selected.items():
+            results[name] = measure(fn, ops, setup)
+            print(f"{name:32} {format_time(results[name]):>12}", flush=True)
+    return results
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    """Names of the results that are slower than the baseline by more than ``threshold``."""
+    regressions = []
+    for name, seconds in results.items():
+        before = baseline.get(name)
+        if before:
+            change = seconds / before - 1
+            mark = "  REGRESSION" if change > threshold else ""
+            print(f"{name:32} {format_time(before):>12} -> {format_time(seconds):>12} "
+                  f"{change:+8.1%}{mark}")
+            if mark:
+                regressions.append(name)
+    return regressions
+
+
+def machine() -> Dict[str, str]:
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpus": str(os.cpu_count())}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="GR24 benchmarks")
+    parser.add_argument("-k", dest="pattern", default="", help="only run benchmarks whose name "
+                                                                "contains this text")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated row counts for the sized benchmarks")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store these results as the baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown reported as a regression (default: 0.2)")
+    parser.add_argument("--json", type=Path, help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = run([int(n) for n in args.sizes.split(",")], args.pattern)
+    report = {"machine": machine(), "results": results}
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+    if args.save_baseline:
+        if args.baseline.exists():
+            # Keep the entries of benchmarks that weren't run this time
+            stored = json.loads(args.baseline.read_text())["results"]
+            report["results"] = {**stored, **results}
+        args.baseline.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+        print(f"baseline saved to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    baseline = json.loads(args.baseline.read_text())
+    if baseline.get("machine") != report["machine"]:
+        print("note: the baseline was recorded on a different machine:", baseline.get("machine"))
+    print()
+    regressions = compare(results, baseline["results"], args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: "
+              + ", ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
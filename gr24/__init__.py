@@ -0,0 +1,30 @@
+"""GR24 pricing engine shared by the desktop app and headless tools."""
+
+from gr24.columns import (
+    DE_COLS, EN_COLS, DE_COLS_WRAPPED, EN_COLS_WRAPPED, COL_MAP_EN_TO_DE,
+    INPUT_COLS_IDX, INPUT_KEYS,
+)
+from gr24.pricing import compute_pricing, money
+from gr24.fixed import compute_pricing_fixed, price_columns_fixed
+from gr24.batch import compute_pricing_batch, price_columns
+from gr24.cache import PricingCache
+
+# Only the headless tools need these (and their process pools); the app
+# doesn't pay for importing them at startup
+_LAZY = {
+    "goal_seek_columns": "gr24.goalseek",
+    "ParallelPricer": "gr24.parallel",
+    "price_columns_parallel": "gr24.parallel",
+    "sweep": "gr24.sweep",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        import importlib
+
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+        # Also replaces the submodule the import bound to the same name (sweep)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
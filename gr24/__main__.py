@@ -0,0 +1,5 @@
+import sys
+
+from gr24.cli import main
+
+sys.exit(main())
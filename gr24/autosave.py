@@ -0,0 +1,366 @@
+"""Journaled autosave and session restore.
+
+The autosave folder holds generations of a snapshot and a journal:
+``snapshot-<g>.gr24`` is the sheet in the ``.gr24`` project format and
+``journal-<g>.log`` the edits made since it was taken, appended as they
+happen. Only changed cells are written, so the cost of saving follows
+the size of the edits, not of the sheet. Cells flagged as not a number
+are journaled with their text after the cells' typed values, and stored
+with the snapshot.
+
+Once a journal outgrows its snapshot (and ``COMPACT_MIN_BYTES``), a new
+generation is started: the sheet is copied, written as the next snapshot
+on the job pool, and the older generations are removed once that
+snapshot is complete. A reset of the sheet (open, import, Delete All)
+starts a new generation right away, since it replaces every cell; its
+journal begins with a ``RESET`` record. A project that was just opened
+memory-mapped is snapshotted by copying its file, so opening it doesn't
+read it into memory.
+
+On startup the newest complete snapshot is loaded and the journals from
+its generation on are replayed, up to the last intact record of a journal
+cut short by a crash. The replay stops at a journal that began with a
+reset but whose snapshot was never completed: its edits belong to a
+sheet that can't be rebuilt, so the sheet comes back as it was before
+the reset. Such journals, and files that can't be read at all, are
+renamed to ``*.bad`` and left alone: a bad snapshot falls back to the
+generation before it (or an empty sheet), a bad journal ends the replay.
+"""
+
+import glob
+import os
+import re
+import struct
+import zlib
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+from PySide6.QtCore import QLockFile, QModelIndex, QObject, QStandardPaths, QTimer
+
+from gr24.columns import INPUT_COLS_IDX
+from gr24.jobs import FileJob, start
+from gr24.project import read_project, write_project
+
+AUTOSAVE_DELAY_MS = 1000
+# A journal is compacted once it exceeds this size and half its snapshot
+COMPACT_MIN_BYTES = 16 << 20
+COMPACT_RATIO = 0.5
+
+JOURNAL_MAGIC = b"GR24JRNL"
+JOURNAL_VERSION = 1
+_JOURNAL_HEADER = struct.Struct("<8sI4x")
+# payload length, kind, first column, row, count; the payload and a crc32
+# of header and payload follow
+_RECORD = struct.Struct("<IBB2xQQ")
+_CRC = struct.Struct("<I")
+
+SET_CELLS, INSERT_ROWS, REMOVE_ROWS, LANGUAGE, FLAG_CELL, RESET = 1, 2, 3, 4, 5, 6
+
+_GENERATION = re.compile(r"(snapshot|journal)-(\d+)\.(gr24|log)$")
+
+
+def _cells_bytes(columns: List[np.ndarray], first_column: int) -> bytes:
+    return b"".join(np.ascontiguousarray(col, dtype="<i8" if c == 0 else "<f8").tobytes()
+                    for c, col in enumerate(columns, start=first_column))
+
+
+def encode_record(kind: int, row: int = 0, count: int = 0, column: int = 0,
+                  payload: bytes = b"") -> bytes:
+    head = _RECORD.pack(len(payload), kind, column, row, count)
+    return head + payload + _CRC.pack(zlib.crc32(payload, zlib.crc32(head)))
+
+
+def read_records(path) -> Iterator[Tuple[int, int, int, int, bytes]]:
+    """Yield ``(kind, column, row, count, payload)`` up to the first torn record."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:_JOURNAL_HEADER.size] != _JOURNAL_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION):
+        return
+    pos = _JOURNAL_HEADER.size
+    while pos + _RECORD.size <= len(data):
+        length, kind, column, row, count = _RECORD.unpack_from(data, pos)
+        end = pos + _RECORD.size + length
+        if end + _CRC.size > len(data):
+            return
+        (crc,) = _CRC.unpack_from(data, end)
+        if crc != zlib.crc32(data[pos + _RECORD.size:end], zlib.crc32(data[pos:pos + _RECORD.size])):
+            return
+        yield kind, column, row, count, data[pos + _RECORD.size:end]
+        pos = end + _CRC.size
+
+
+def _columns_from(payload: bytes, first_column: int, count: int) -> List[np.ndarray]:
+    ncols = len(payload) // (8 * count) if count else 0
+    return [np.frombuffer(payload, dtype="<i8" if c == 0 else "<f8", count=count,
+                          offset=i * 8 * count)
+            for i, c in enumerate(range(first_column, first_column + ncols))]
+
+
+def _copy_project(source, path: str, progress, chunk_bytes: int = 16 << 20):
+    """Copy the open file ``source`` to ``path`` and close it."""
+    with source, open(path, "wb") as f:
+        total = os.fstat(source.fileno()).st_size
+        done = 0
+        while True:
+            chunk = source.read(chunk_bytes)
+            if not chunk:
+                break
+            f.write(chunk)
+            done += len(chunk)
+            progress(done, total)
+
+
+class Autosave(QObject):
+    """Journal every input change of ``model`` to ``folder``; see the module docstring."""
+
+    def __init__(self, model, folder: str, language: str = "de", parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.folder = folder
+        self.language = language
+        self.generation = -1
+        self._journal = None
+        self._journal_bytes = 0
+        self._snapshot_bytes = 0
+        self._pending: List[bytes] = []
+        self._jobs = {}  # job signals -> (job, generation)
+        self._lock: Optional[QLockFile] = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(AUTOSAVE_DELAY_MS)
+        self._timer.timeout.connect(self.flush)
+
+    @classmethod
+    def from_env(cls, model, parent=None) -> Optional["Autosave"]:
+        """Autosave to ``GR24_AUTOSAVE_DIR`` (default: the app data folder).
+
+        Returns None if ``GR24_AUTOSAVE=0``, the folder can't be created,
+        or another instance already autosaves to the same folder.
+        """
+        if os.environ.get("GR24_AUTOSAVE", "1") == "0":
+            return None
+        folder = os.environ.get("GR24_AUTOSAVE_DIR") or os.path.join(
+            QStandardPaths.writableLocation(QStandardPaths.AppDataLocation) or
+            os.path.join(os.path.expanduser("~"), ".gr24"), "autosave")
+        try:
+            os.makedirs(folder, exist_ok=True)
+        except OSError:
+            return None  # the app still runs, just without autosave
+        # QLockFile takes over stale locks of crashed sessions; folders that
+        # aren't writable fail here too
+        lock = QLockFile(os.path.join(folder, "session.lock"))
+        if not lock.tryLock(0):
+            return None
+        autosave = cls(model, folder, parent=parent)
+        autosave._lock = lock
+        return autosave
+
+    # ---- Files ----
+    def _path(self, kind: str, generation: int) -> str:
+        extension = "gr24" if kind == "snapshot" else "log"
+        return os.path.join(self.folder, f"{kind}-{generation}.{extension}")
+
+    def _generations(self, kind: str) -> List[int]:
+        found = []
+        for path in glob.glob(os.path.join(self.folder, f"{kind}-*")):
+            match = _GENERATION.search(os.path.basename(path))
+            if match and match.group(1) == kind:
+                found.append(int(match.group(2)))
+        return sorted(found)
+
+    # ---- Restore ----
+    def restore(self) -> Optional[str]:
+        """Load the last session into the model; returns its language, or None if there is none."""
+        snapshots = self._generations("snapshot")
+        journals = self._generations("journal")
+        self.generation = max(snapshots + journals, default=-1)
+        for base in reversed(snapshots):
+            path = self._path("snapshot", base)
+            try:
+                language, quantity, inputs, flagged = read_project(path)
+                # Copied into memory, older generations are removed while the sheet is open
+                columns = [np.array(quantity)] + [np.array(col) for col in inputs]
+            except (OSError, ValueError):
+                self._set_aside(path)
+                continue
+            self.model.set_columns(columns)
+            self.model.set_invalid_cells(flagged)
+            broken = False
+            for generation in journals:
+                if generation < base:
+                    continue
+                path = self._path("journal", generation)
+                if not broken and generation > base and self._starts_with_reset(path):
+                    # Edits to the sheet of a reset whose snapshot never landed
+                    broken = True
+                if not broken:
+                    try:
+                        language = self._replay(path, language)
+                        continue
+                    except Exception:
+                        broken = True
+                # Later journals continue from a state that can't be rebuilt
+                self._set_aside(path)
+            self.language = language
+            return language
+        return None
+
+    @staticmethod
+    def _starts_with_reset(path: str) -> bool:
+        try:
+            first = next(read_records(path), None)
+        except OSError:
+            return True  # unreadable, ends the replay either way
+        return first is not None and first[0] == RESET
+
+    def _set_aside(self, path: str):
+        """Rename a file restore can't use to ``*.bad``, out of the way of restore and cleanup."""
+        try:
+            os.replace(path, path + ".bad")
+        except OSError:
+            pass
+
+    def _replay(self, path: str, language: str) -> str:
+        model = self.model
+        for kind, column, row, count, payload in read_records(path):
+            if kind == SET_CELLS:
+                model.set_inputs(row, column, _columns_from(payload, column, count))
+            elif kind == INSERT_ROWS:
+                model.insert_rows(row, _columns_from(payload, 0, count))
+            elif kind == REMOVE_ROWS:
+                model.removeRows(row, count)
+            elif kind == LANGUAGE:
+                language = payload.decode("ascii", "replace")
+            elif kind == FLAG_CELL:
+                model.set_invalid(row, column, payload.decode("utf-8", "replace"))
+        return language
+
+    # ---- Journaling ----
+    def start(self):
+        """Snapshot the current sheet as a new generation and journal from here on."""
+        model = self.model
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.rowsRemoved.connect(self._on_rows_removed)
+        model.dataChanged.connect(self._on_data_changed)
+        model.modelReset.connect(self._on_model_reset)
+        # The sheet as restored, so this journal continues the previous ones
+        self._on_model_reset(reset=False)
+
+    def set_language(self, language: str):
+        self.language = language
+        self._append(encode_record(LANGUAGE, payload=language.encode("ascii")))
+
+    def _append(self, record: bytes):
+        self._pending.append(record)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _on_rows_inserted(self, parent: QModelIndex, first: int, last: int):
+        count = last - first + 1
+        columns = self.model.input_columns(slice(first, last + 1))
+        self._append(encode_record(INSERT_ROWS, first, count, 0, _cells_bytes(columns, 0)))
+
+    def _on_rows_removed(self, parent: QModelIndex, first: int, last: int):
+        self._append(encode_record(REMOVE_ROWS, first, last - first + 1))
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        first_column = top_left.column()
+        last_column = min(bottom_right.column(), len(INPUT_COLS_IDX) - 1)
+        if first_column > last_column:
+            return  # outputs only
+        first, last = top_left.row(), bottom_right.row()
+        columns = self.model.input_columns(slice(first, last + 1))[first_column:last_column + 1]
+        self._append(encode_record(SET_CELLS, first, last - first + 1, first_column,
+                                   _cells_bytes(columns, first_column)))
+        # Replaying SET_CELLS clears the flags of those cells, so flags still set follow it
+        for row, column, text in self.model.invalid_cells(slice(first, last + 1)):
+            if first_column <= column <= last_column:
+                self._append(encode_record(FLAG_CELL, row, 1, column, text.encode("utf-8")))
+
+    def flush(self):
+        """Append the pending records to the journal (compacting if it has grown too big)."""
+        self._timer.stop()
+        if not self._pending or self._journal is None:
+            return
+        data = b"".join(self._pending)
+        self._pending.clear()
+        self._journal.write(data)
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._journal_bytes += len(data)
+        if self._journal_bytes > max(COMPACT_MIN_BYTES, COMPACT_RATIO * self._snapshot_bytes):
+            self.compact()
+
+    def _on_model_reset(self, reset: bool = True):
+        source = self.model.mapped_file()
+        if source is not None:
+            try:
+                # Opened here, so the copy is of this file even if it is saved over meanwhile
+                source = open(source, "rb")
+            except OSError:
+                source = None
+        self.compact(source, reset)
+
+    def compact(self, source=None, reset: bool = False):
+        """Start a new generation from a copy of the current sheet.
+
+        ``source``, an open project file the sheet holds unchanged, is
+        copied as the snapshot instead (and closed once it is). With
+        ``reset`` the journal is marked as not continuing the previous
+        generation, so it is only replayed on top of its own snapshot.
+        """
+        self.flush()
+        self._timer.stop()
+        self._pending.clear()
+        if self._journal is not None:
+            self._journal.close()
+        self.generation += 1
+        generation = self.generation
+        self._journal = open(self._path("journal", generation), "wb")
+        self._journal.write(_JOURNAL_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION))
+        if reset:
+            self._journal.write(encode_record(RESET))
+        self._journal.flush()
+        if reset:
+            os.fsync(self._journal.fileno())
+        self._journal_bytes = 0
+
+        if source is not None:
+            self._snapshot_bytes = os.fstat(source.fileno()).st_size
+            write = lambda part, progress: _copy_project(source, part, progress)
+        else:
+            inputs = [col.copy() for col in self.model.input_columns()]
+            flagged = self.model.invalid_cells(slice(None))
+            self._snapshot_bytes = 9 * 8 * len(inputs[0])
+            language = self.language
+            write = lambda part, progress: write_project(part, language, inputs, progress,
+                                                         flagged)
+        job = FileJob(self._path("snapshot", generation), write)
+        self._jobs[job.signals] = (job, generation)
+        job.signals.finished.connect(self._on_snapshot_written)
+        job.signals.failed.connect(self._on_snapshot_failed)
+        start(job)
+
+    def _on_snapshot_written(self, path: str):
+        _, generation = self._jobs.pop(self.sender())
+        # Everything older is covered by this snapshot
+        for kind in ("snapshot", "journal"):
+            for older in self._generations(kind):
+                if older < generation:
+                    try:
+                        os.remove(self._path(kind, older))
+                    except OSError:
+                        pass
+
+    def _on_snapshot_failed(self, error: str):
+        # The older generations stay and still restore; the next compaction retries
+        self._jobs.pop(self.sender())
+
+    def close(self):
+        """Write what is pending; the session is restored on the next start."""
+        self.flush()
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if self._lock is not None:
+            self._lock.unlock()
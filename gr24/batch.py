@@ -0,0 +1,177 @@
+"""Vectorized batch pricing.
+
+Prices whole columns at once with numpy. Results are reported in
+hundredths (cents for money columns, hundredths of a percent for the
+percentage columns) so that they can be compared with the scalar
+``compute_pricing`` exactly. Rows whose float result lies too close to a
+ROUND_HALF_UP tie, or whose inputs cannot be parsed as plain numbers, are
+repriced exactly by the integer backend (and, where that can't, by the
+scalar Decimal function), so every row comes out cent-exact.
+``backend="fixed"`` selects the integer backend in ``gr24.fixed`` instead.
+"""
+
+import sys
+from typing import TYPE_CHECKING, Dict, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from gr24.columns import DE_COLS, EN_COLS, INPUT_KEYS
+from gr24.fixed import price_columns_fixed
+from gr24.parsing import MAX_HUNDREDTHS, parse_float_column, parse_quantity_column
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Relative tolerance around a half-cent tie inside which float results are
+# not trusted and the row is repriced with Decimal
+_TIE_RTOL = 1e-12
+# Denominators closer to zero than this are left to the scalar path, which
+# knows whether the sum of percentages is exactly 100 %
+_MIN_DENOMINATOR = 1e-9
+
+
+def _round_half_up(x: np.ndarray) -> np.ndarray:
+    return (np.sign(x) * np.floor(np.abs(x) + 0.5)).astype(np.int64)
+
+
+def _near_tie(x: np.ndarray, tol: np.ndarray) -> np.ndarray:
+    frac = np.abs(x) - np.floor(np.abs(x))
+    return np.abs(frac - 0.5) <= tol
+
+
+def _is_dataframe(data) -> bool:
+    # pandas is only imported on demand; if it isn't loaded, data can't be a DataFrame
+    pd = sys.modules.get("pandas")
+    return pd is not None and isinstance(data, pd.DataFrame)
+
+
+def _input_columns(data) -> Sequence:
+    """Return the nine input columns of ``data`` in INPUT_KEYS order.
+
+    ``data`` is a DataFrame or mapping keyed by INPUT_KEYS, EN_COLS or
+    DE_COLS labels, or a sequence of nine column arrays.
+    """
+    if isinstance(data, Mapping) or _is_dataframe(data):
+        for labels in (INPUT_KEYS, EN_COLS[:9], DE_COLS[:9]):
+            if all(label in data for label in labels):
+                return [data[label] for label in labels]
+        raise KeyError("input columns not found; expected one of the label sets "
+                       "INPUT_KEYS, EN_COLS[:9] or DE_COLS[:9]")
+    columns = list(data)
+    if len(columns) != len(INPUT_KEYS):
+        raise ValueError(f"expected {len(INPUT_KEYS)} input columns, got {len(columns)}")
+    return columns
+
+
+def price_columns(quantity, purchase_price, shipping_costs, packaging_costs,
+                  margin_pct, amazon_pct, ebay_pct, extra_pct, vat_pct,
+                  errors: str = "raise",
+                  backend: str = "float") -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """Price aligned input columns in one pass.
+
+    Returns ``(columns, valid)``: ``columns`` maps every EN_COLS label to an
+    int64 array, "Quantity" in units and all other columns in hundredths.
+    ``valid`` is False for rows that could not be priced (only possible with
+    ``errors="coerce"``) or whose result is not a finite number; their values
+    are 0. With ``errors="raise"`` the exception compute_pricing would raise
+    for the first bad row is propagated.
+
+    ``backend`` is "float" (numpy float64 with exact repair of near-tie
+    rows) or "fixed" (exact int64 arithmetic, see ``gr24.fixed``).
+    """
+    if backend == "fixed":
+        return price_columns_fixed(quantity, purchase_price, shipping_costs, packaging_costs,
+                                   margin_pct, amazon_pct, ebay_pct, extra_pct, vat_pct,
+                                   errors=errors)
+    if backend != "float":
+        raise ValueError(f"unknown pricing backend {backend!r}")
+    if errors not in ("raise", "coerce"):
+        raise ValueError("errors must be 'raise' or 'coerce'")
+    raw = [np.asarray(col) for col in (quantity, purchase_price, shipping_costs, packaging_costs,
+                                        margin_pct, amazon_pct, ebay_pct, extra_pct, vat_pct)]
+    lengths = {len(col) for col in raw}
+    if len(lengths) != 1:
+        raise ValueError("input columns must all have the same length")
+
+    qty, scalar = parse_quantity_column(raw[0])
+    parsed = []
+    for col in raw[1:]:
+        num, bad = parse_float_column(col)
+        parsed.append(num)
+        scalar |= bad
+    purchase, shipping, packaging, margin, amazon, ebay, extra, vat = parsed
+
+    margin, amazon, ebay, extra, vat = (c / 100 for c in (margin, amazon, ebay, extra, vat))
+    base_cost = purchase + shipping + packaging
+    profit = purchase * margin
+    total_costs = base_cost + profit
+    total_pct = amazon + ebay + extra + vat
+    denominator = 1 - total_pct
+    scalar |= np.abs(denominator) < _MIN_DENOMINATOR
+    denominator = np.where(scalar, 1.0, denominator)
+    selling = total_costs / denominator
+
+    # Error bound (in cents) of the float pipeline for each row, scaled up
+    # generously from the few roundings each value goes through.
+    magnitude = (np.abs(purchase) + np.abs(shipping) + np.abs(packaging) + np.abs(profit)
+                 + np.abs(selling) * (1 + np.abs(total_pct))) * 100
+    tol = _TIE_RTOL * (1 + magnitude) / np.minimum(np.abs(denominator), 1.0)
+
+    values = {
+        "Purchase Price (€)": purchase,
+        "Shipping Costs (€)": shipping,
+        "Packaging Costs (€)": packaging,
+        "Margin (%)": margin * 100,
+        "Amazon Fees (%)": amazon * 100,
+        "eBay Fees (%)": ebay * 100,
+        "Additional Costs / Advertising Costs (%)": extra * 100,
+        "VAT (%)": vat * 100,
+        "Profit (€)": profit,
+        "Total Tax (€)": selling * vat,
+        "Total Costs (€)": total_costs,
+        "Total Amazon Fees (€)": selling * amazon,
+        "Total eBay Fees (€)": selling * ebay,
+        "Total Additional Costs / Advertising Costs (€)": selling * extra,
+        "Selling Price (€)": selling,
+    }
+    out: Dict[str, np.ndarray] = {"Quantity": qty}
+    for key, val in values.items():
+        scaled = val * 100
+        scalar |= _near_tie(scaled, tol) | ~(np.abs(scaled) < MAX_HUNDREDTHS)
+        out[key] = _round_half_up(np.where(scalar, 0.0, scaled))
+
+    # Near-tie rows are exact ratios of hundredths more often than not, so
+    # they go through the integer backend, which leaves only what it can't
+    # do exactly to compute_pricing.
+    valid = np.ones(len(qty), dtype=bool)
+    rows = np.flatnonzero(scalar)
+    if len(rows):
+        repaired, valid[rows] = price_columns_fixed(*(col[rows] for col in raw), errors=errors)
+        for key in EN_COLS:
+            out[key][rows] = repaired[key]
+    return out, valid
+
+
+def compute_pricing_batch(data, errors: str = "raise", backend: str = "float") -> "pd.DataFrame":
+    """Vectorized counterpart of ``compute_pricing``.
+
+    ``data`` holds the nine input columns (see ``_input_columns``). Returns a
+    DataFrame with EN_COLS columns and one row per input row, holding the
+    same cent-exact ROUND_HALF_UP values as the scalar function. With
+    ``errors="coerce"`` rows that can't be priced are returned as missing
+    values instead of raising. ``backend`` is passed to ``price_columns``.
+    """
+    import pandas as pd
+
+    index = data.index if isinstance(data, pd.DataFrame) else None
+    columns, valid = price_columns(*_input_columns(data), errors=errors, backend=backend)
+    frame = {}
+    for key in EN_COLS:
+        if key == "Quantity":
+            col = pd.array(columns[key], dtype="Int64")
+            col[~valid] = pd.NA
+        else:
+            col = columns[key] / 100
+            col[~valid] = np.nan
+        frame[key] = col
+    return pd.DataFrame(frame, columns=EN_COLS, index=index)
@@ -0,0 +1,63 @@
+"""Bounded LRU cache of scalar pricing results.
+
+Sheets repeat the same purchase price, fee and VAT combinations on many
+rows, so the scalar pricer used for single-row recomputes is memoized.
+The key is the tuple of inputs as given, which for the sheet are the
+typed values of ``PricingTableModel.row_inputs`` (an int and eight
+floats), so a lookup is one tuple hash. Results are handed out as
+read-only mappings shared by every hit.
+"""
+
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Callable, Dict, Mapping, Tuple
+
+from gr24.pricing import compute_pricing
+
+DEFAULT_CACHE_SIZE = 65536
+
+
+class PricingCache:
+    """Memoize a scalar pricer (``compute_pricing`` by default).
+
+    Calls take the same nine arguments as the pricer, which must be
+    hashable, and return its result as a read-only mapping. At most
+    ``maxsize`` results are kept; the least recently used one is evicted
+    first. Errors are raised as usual and never cached.
+    """
+
+    def __init__(self, pricer: Callable[..., Dict] = compute_pricing,
+                 maxsize: int = DEFAULT_CACHE_SIZE):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.pricer = pricer
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._results: "OrderedDict[Tuple, Mapping]" = OrderedDict()
+
+    def __call__(self, *inputs) -> Mapping:
+        result = self._results.get(inputs)
+        if result is not None:
+            self._results.move_to_end(inputs)
+            self.hits += 1
+            return result
+        result = MappingProxyType(self.pricer(*inputs))
+        self.misses += 1
+        self._results[inputs] = result
+        if len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+        return result
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def info(self) -> Dict[str, int]:
+        """Hit/miss counters and current size."""
+        return {"hits": self.hits, "misses": self.misses,
+                "size": len(self._results), "maxsize": self.maxsize}
+
+    def clear(self):
+        """Drop every cached result and reset the counters."""
+        self._results.clear()
+        self.hits = self.misses = 0
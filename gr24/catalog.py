@@ -0,0 +1,149 @@
+"""Supplier catalog import from CSV or XLSX.
+
+The header row is matched against the EN_COLS and DE_COLS input labels
+(or INPUT_KEYS), ignoring case, surrounding whitespace and the line
+breaks of the wrapped UI labels; other columns are ignored. The file is
+then read a chunk of rows at a time (xlsx in openpyxl's read-only mode)
+and each chunk is converted to the nine typed input columns, so callers
+can price and show rows while the rest of the file is still being read.
+"""
+
+import csv
+import re
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from gr24.columns import DE_COLS, EN_COLS, INPUT_KEYS
+from gr24.parsing import DECIMAL_POINT, parse_input_cells
+
+IMPORT_CHUNK_ROWS = 20_000
+
+# Header sets in detection order; the language is None for INPUT_KEYS
+_HEADER_SETS = [("en", EN_COLS[:9]), ("de", DE_COLS[:9]), (None, INPUT_KEYS)]
+
+
+def _normalize_label(label) -> str:
+    text = re.sub(r"-\s*\n\s*", "", str(label if label is not None else ""))
+    return " ".join(text.split()).casefold()
+
+
+def detect_header(labels: Sequence) -> Tuple[Optional[str], List[int]]:
+    """Find the nine input columns in a header row.
+
+    Returns ``(language, positions)``: "en" or "de" for the label set that
+    matched (None for INPUT_KEYS) and the position of each input column.
+    Raises ValueError if no set matches completely.
+    """
+    normalized = [_normalize_label(label) for label in labels]
+    for language, names in _HEADER_SETS:
+        wanted = [_normalize_label(name) for name in names]
+        if all(name in normalized for name in wanted):
+            return language, [normalized.index(name) for name in wanted]
+    raise ValueError("no input column headers found; expected the nine input columns "
+                     "with English or German headers")
+
+
+def _to_columns(rows: list, positions: List[int], first_row: int, decimal: str,
+                labels: List[str]) -> List[np.ndarray]:
+    cells = np.full((len(rows), len(positions)), "", dtype=object)
+    for r, row in enumerate(rows):
+        for c, pos in enumerate(positions):
+            if pos < len(row) and row[pos] is not None:
+                cells[r, c] = row[pos]
+    return parse_input_cells(cells, first_row=first_row, decimal=decimal, labels=labels)
+
+
+def _iter_csv(path, chunk_rows: int, sep: Optional[str]):
+    import pandas as pd
+
+    if sep is None:
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            sample = f.readline()
+        try:
+            sep = csv.Sniffer().sniff(sample, delimiters=",;\t").delimiter
+        except csv.Error:
+            sep = ","
+    options = dict(sep=sep, dtype=str, keep_default_na=False, header=None, encoding="utf-8-sig")
+    # Blank lines are kept (and skipped later) so rows keep their numbers;
+    # the width of the header row is given as pandas can't guess it from them
+    width = pd.read_csv(path, nrows=1, **options).shape[1]
+    reader = pd.read_csv(path, names=range(width), skip_blank_lines=False, chunksize=chunk_rows,
+                         **options)
+    header = None
+    for chunk in reader:
+        rows = chunk.to_numpy(dtype=object).tolist()
+        if header is None:
+            header, rows = rows[0], rows[1:]
+            yield header
+        if rows:
+            yield rows
+
+
+def _iter_xlsx(path, chunk_rows: int):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            raise ValueError("the worksheet is empty")
+        yield list(header)
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == chunk_rows:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        workbook.close()
+
+
+def read_catalog(path, chunk_rows: int = IMPORT_CHUNK_ROWS,
+                 sep: Optional[str] = None) -> Tuple[Optional[str], Iterator[List[np.ndarray]]]:
+    """Open a catalog and return ``(language, chunks)``.
+
+    ``path`` is a .csv (separator sniffed unless ``sep`` is given) or
+    .xlsx file. ``chunks`` yields the nine typed input columns for up to
+    ``chunk_rows`` rows at a time. Cells are read like sheet edits in the
+    language of the headers (so German files may group digits as
+    ``1.234,56``, blank as 0); a cell that isn't a number raises
+    ValueError naming its row, counted from the first data row (blank
+    rows included), and the file's header of its column. Close ``chunks``
+    to stop reading early.
+    """
+    if str(path).lower().endswith((".xlsx", ".xlsm")):
+        source = _iter_xlsx(path, chunk_rows)
+    else:
+        source = _iter_csv(path, chunk_rows, sep)
+    try:
+        header = next(source, None)
+        if header is None:
+            raise ValueError("the file is empty")
+        language, positions = detect_header(header)
+    except BaseException:
+        source.close()
+        raise
+    decimal = DECIMAL_POINT.get(language, ".")
+    labels = [" ".join(str(header[pos]).split()) for pos in positions]
+
+    def chunks():
+        first = 1
+        try:
+            for rows in source:
+                # Skip blank lines, common at the end of exported sheets. They are
+                # parsed along (as zeros) so errors name the row of the file.
+                columns = _to_columns(rows, positions, first, decimal, labels)
+                first += len(rows)
+                filled = np.array([any(cell not in (None, "") for cell in row) for row in rows],
+                                  dtype=bool)
+                if filled.any():
+                    yield columns if filled.all() else [col[filled] for col in columns]
+        finally:
+            # Closing the chunks early (a cancelled import) closes the file too
+            source.close()
+
+    return language, chunks()
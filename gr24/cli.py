@@ -0,0 +1,233 @@
+"""Headless command line entry point: ``python -m gr24 price in.csv out.csv``.
+
+Reads the input file in fixed-size chunks, prices each chunk with the
+batch engine and appends it to the output, so memory use does not grow
+with the size of the feed. ``goalseek`` does the same after solving each
+row for the purchase price or margin that meets a target selling price.
+``sweep`` prices a catalog under a grid of margins, fees and VAT rates and
+writes one summary row per scenario. Nothing here imports Qt.
+"""
+
+import argparse
+import sys
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from gr24.batch import _input_columns, price_columns
+from gr24.catalog import read_catalog
+from gr24.columns import DE_COLS, EN_COLS, INPUT_COLS_IDX, INPUT_KEYS
+from gr24.goalseek import SOLVE_TARGETS, goal_seek_columns
+from gr24.parallel import ParallelPricer
+from gr24.parsing import format_hundredths_column
+from gr24.sweep import SWEEP_PARAMS, iter_sweep, parse_values, sweep
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+def price_csv(src, dst, chunk_rows: int = DEFAULT_CHUNK_ROWS, sep: str = ",",
+              language: str = "en", backend: str = "float", strict: bool = False,
+              workers: int = 1) -> dict:
+    """Stream ``src`` to ``dst`` (paths or file objects), pricing chunk by chunk.
+
+    The input needs the nine input columns under INPUT_KEYS, EN_COLS or
+    DE_COLS labels. Like the GUI, commas in the inputs are read as decimal
+    points and empty cells count as 0. Rows that can't be priced keep their
+    input text and get empty outputs, or raise ValueError when ``strict``.
+    With ``workers`` other than 1 each chunk is priced by a pool of that
+    many processes (0 for all CPUs); use large chunks to make it pay off.
+    Returns row and invalid-row counts.
+    """
+    with ParallelPricer(workers=workers, backend=backend) as pricer:
+        return _price_chunks(src, dst, chunk_rows, sep, language, strict, pricer)
+
+
+def _price_chunks(src, dst, chunk_rows: int, sep: str, language: str, strict: bool,
+                  pricer: ParallelPricer) -> dict:
+    rows = invalid = 0
+    labels = DE_COLS if language == "de" else EN_COLS
+    reader = pd.read_csv(src, sep=sep, dtype=str, keep_default_na=False, chunksize=chunk_rows)
+    for n, chunk in enumerate(reader):
+        inputs = [col.str.replace(",", ".", regex=False).str.strip().to_numpy(dtype=object)
+                  for col in _input_columns(chunk)]
+        columns, valid = pricer(*inputs, errors="coerce")
+        bad = np.flatnonzero(~valid)
+        if strict and len(bad):
+            raise ValueError(f"row {rows + bad[0] + 1} can't be priced: "
+                             f"{[col[bad[0]] for col in inputs]}")
+        out = {}
+        for i, key in enumerate(EN_COLS):
+            text = (columns[key].astype(str) if key == "Quantity"
+                    else format_hundredths_column(columns[key])).astype(object)
+            text[bad] = inputs[i][bad] if i in INPUT_COLS_IDX else ""
+            out[labels[i]] = text
+        pd.DataFrame(out, columns=labels).to_csv(dst, sep=sep, index=False, header=n == 0,
+                                                 mode="a" if n else "w")
+        rows += len(chunk)
+        invalid += len(bad)
+    return {"rows": rows, "invalid": invalid}
+
+
+def _clean(col: pd.Series) -> np.ndarray:
+    return col.str.replace(",", ".", regex=False).str.strip().to_numpy(dtype=object)
+
+
+def _goal_seek_inputs(chunk: pd.DataFrame, solve: str) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """Target column and the nine input columns; the solved one may be missing."""
+    solved = 1 if solve == "purchase" else 4
+    for labels in (INPUT_KEYS + ["selling_price"], EN_COLS, DE_COLS):
+        needed = [labels[15 if len(labels) == 16 else 9]] + [
+            label for i, label in enumerate(labels[:9]) if i != solved]
+        if all(label in chunk for label in needed):
+            blank = np.full(len(chunk), "", dtype=object)
+            inputs = [_clean(chunk[label]) if label in chunk else blank for label in labels[:9]]
+            return _clean(chunk[needed[0]]), inputs
+    raise KeyError("columns not found; expected the target selling price and the input "
+                   "columns under INPUT_KEYS (+ selling_price), EN_COLS or DE_COLS labels")
+
+
+def goal_seek_csv(src, dst, solve: str = "purchase", chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                  sep: str = ",", language: str = "en", backend: str = "float") -> dict:
+    """Stream ``src`` to ``dst``, solving each row for ``solve`` ("purchase" or "margin").
+
+    The input holds the target selling price per unit in the selling price
+    column and the other inputs as for ``price_csv``. Each output row is
+    priced with the solved value filled in, so its selling price is the
+    highest one at or below the target. Rows without a solution keep their
+    input text with the solved and output columns empty.
+    """
+    rows = unsolved = 0
+    labels = DE_COLS if language == "de" else EN_COLS
+    solved = 1 if solve == "purchase" else 4
+    reader = pd.read_csv(src, sep=sep, dtype=str, keep_default_na=False, chunksize=chunk_rows)
+    for n, chunk in enumerate(reader):
+        target, inputs = _goal_seek_inputs(chunk, solve)
+        values, ok = goal_seek_columns(target, *inputs[1:], solve=solve)
+        inputs[solved] = values / 100
+        columns, valid = price_columns(*inputs, errors="coerce", backend=backend)
+        ok &= valid
+        bad = np.flatnonzero(~ok)
+        out = {}
+        for i, key in enumerate(EN_COLS):
+            text = (columns[key].astype(str) if key == "Quantity"
+                    else format_hundredths_column(columns[key])).astype(object)
+            text[bad] = inputs[i][bad] if i in INPUT_COLS_IDX and i != solved else ""
+            out[labels[i]] = text
+        pd.DataFrame(out, columns=labels).to_csv(dst, sep=sep, index=False, header=n == 0,
+                                                 mode="a" if n else "w")
+        rows += len(chunk)
+        unsolved += len(bad)
+    return {"rows": rows, "invalid": unsolved}
+
+
+def _write_long(dst, catalog: List[np.ndarray], grid: dict, backend: str, sep: str) -> None:
+    """Stream every priced row of every scenario: parameters, catalog row, outputs."""
+    rows = len(catalog[0])
+    keys = ["Selling Price (€)", "Profit (€)", "Total Tax (€)"]
+    for n, (block, outputs, valid) in enumerate(iter_sweep(catalog, grid, backend=backend)):
+        out = {name: np.repeat(block[:, j], rows) for j, name in enumerate(grid)}
+        out["row"] = np.tile(np.arange(1, rows + 1), len(block))
+        for key in keys:
+            text = format_hundredths_column(outputs[key]).astype(object)
+            text[~valid] = ""
+            out[key] = text
+        pd.DataFrame(out).to_csv(dst, sep=sep, index=False, header=n == 0,
+                                 mode="a" if n else "w")
+
+
+def sweep_csv(src, dst, grid: dict, long_dst=None, sep: str = ",", backend: str = "float",
+              workers: Optional[int] = None) -> dict:
+    """Price the catalog ``src`` under every scenario of ``grid``; write summaries to ``dst``.
+
+    ``src`` is read like a catalog import (CSV or XLSX, English or German
+    headers). With ``long_dst`` every priced row of every scenario is also
+    written there, block by block.
+    """
+    _, chunks = read_catalog(src)
+    parts = list(chunks)
+    if not parts:
+        raise ValueError("the catalog has no rows")
+    catalog = [np.concatenate([part[i] for part in parts]) for i in range(9)]
+    summary = sweep(catalog, grid, backend=backend, workers=workers)
+    summary.to_csv(dst, sep=sep, index=False)
+    if long_dst is not None:
+        _write_long(long_dst, catalog, grid, backend, sep)
+    return {"rows": len(summary), "invalid": int((summary["valid"] < summary["rows"]).sum())}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m gr24", description="GR24 pricing tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    price = commands.add_parser("price", help="price a CSV file of the nine input columns")
+    price.add_argument("input", help="input CSV path, or - for stdin")
+    price.add_argument("output", help="output CSV path, or - for stdout")
+    price.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    price.add_argument("--sep", default=",", help="field separator (default: ,)")
+    price.add_argument("--language", choices=["en", "de"], default="en",
+                       help="output header language (default: en)")
+    price.add_argument("--backend", choices=["float", "fixed"], default="float")
+    price.add_argument("--strict", action="store_true",
+                       help="fail on the first row that can't be priced instead of "
+                            "leaving its outputs empty")
+    price.add_argument("--workers", type=int, default=1,
+                       help="price each chunk with this many processes, 0 for all CPUs "
+                            "(default: 1)")
+
+    seek = commands.add_parser("goalseek", help="solve for the highest purchase price or margin "
+                                                 "that sells at or below a target price")
+    seek.add_argument("input", help="input CSV path, or - for stdin; the selling price column "
+                                    "holds the target")
+    seek.add_argument("output", help="output CSV path, or - for stdout")
+    seek.add_argument("--solve", choices=SOLVE_TARGETS, default="purchase")
+    seek.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    seek.add_argument("--sep", default=",", help="field separator (default: ,)")
+    seek.add_argument("--language", choices=["en", "de"], default="en",
+                      help="output header language (default: en)")
+    seek.add_argument("--backend", choices=["float", "fixed"], default="float")
+
+    grid = commands.add_parser("sweep", help="price a catalog under every combination of "
+                                             "margins, fees and VAT rates")
+    grid.add_argument("input", help="catalog CSV or XLSX path")
+    grid.add_argument("output", help="summary CSV path, or - for stdout")
+    for name in SWEEP_PARAMS:
+        grid.add_argument(f"--{name}", metavar="VALUES",
+                          help=f"{name} values to try, start:stop:step or a comma list")
+    grid.add_argument("--long", metavar="PATH", help="also write every priced row of every "
+                                                     "scenario to this CSV")
+    grid.add_argument("--workers", type=int, help="process pool size (default: all CPUs for "
+                                                  "large sweeps)")
+    grid.add_argument("--sep", default=",", help="output field separator (default: ,)")
+    grid.add_argument("--backend", choices=["float", "fixed"], default="float")
+
+    args = parser.parse_args(argv)
+    started = time.perf_counter()
+    src = sys.stdin if args.input == "-" else args.input
+    dst = sys.stdout if args.output == "-" else args.output
+    try:
+        if args.command == "sweep":
+            values = {name: parse_values(getattr(args, name)) for name in SWEEP_PARAMS
+                      if getattr(args, name) is not None}
+            if not values:
+                raise ValueError("give at least one parameter to sweep, e.g. --margin 10:40:1")
+            stats = sweep_csv(args.input, dst, values, long_dst=args.long, sep=args.sep,
+                              backend=args.backend, workers=args.workers)
+        elif args.command == "goalseek":
+            stats = goal_seek_csv(src, dst, solve=args.solve, chunk_rows=args.chunk_rows,
+                                  sep=args.sep, language=args.language, backend=args.backend)
+        else:
+            stats = price_csv(src, dst, chunk_rows=args.chunk_rows, sep=args.sep,
+                              language=args.language, backend=args.backend, strict=args.strict,
+                              workers=args.workers)
+    except (OSError, KeyError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    if args.command == "sweep":
+        done = f"swept {stats['rows']} scenarios ({stats['invalid']} with invalid rows)"
+    else:
+        verb = "solved" if args.command == "goalseek" else "priced"
+        done = f"{verb} {stats['rows']} rows ({stats['invalid']} invalid)"
+    print(f"{done} in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return 0
@@ -0,0 +1,96 @@
+"""Column labels shared by the GUI, batch pricing and exports."""
+
+DE_COLS = [
+    "Menge",
+    "Kaufpreis",
+    "Versandkosten",
+    "Verpackungskosten",
+    "Marge (%)",
+    "Amazon-Gebühren (%)",
+    "eBay-Gebühren (%)",
+    "Zusätzliche Kosten / Werbekosten (%)",
+    "MwSt (%)",
+    "Profit (€)",
+    "Gesamtsteuer (€)",
+    "Gesamtkosten (€)",
+    "Gesamte Amazon-Gebühren (€)",
+    "Gesamte eBay-Gebühren (€)",
+    "Gesamte Zusatzkosten / Werbekosten (€)",
+    "Verkaufspreis (€)",
+]
+
+EN_COLS = [
+    "Quantity",
+    "Purchase Price (€)",
+    "Shipping Costs (€)",
+    "Packaging Costs (€)",
+    "Margin (%)",
+    "Amazon Fees (%)",
+    "eBay Fees (%)",
+    "Additional Costs / Advertising Costs (%)",
+    "VAT (%)",
+    "Profit (€)",
+    "Total Tax (€)",
+    "Total Costs (€)",
+    "Total Amazon Fees (€)",
+    "Total eBay Fees (€)",
+    "Total Additional Costs / Advertising Costs (€)",
+    "Selling Price (€)",
+]
+
+# Wrapped (multi-line) headers for UI readability
+DE_COLS_WRAPPED = [
+    "Menge",
+    "Kaufpreis",
+    "Versand-\nkosten",
+    "Verpackungs-\nkosten",
+    "Marge (%)",
+    "Amazon-\nGebühren (%)",
+    "eBay-\nGebühren (%)",
+    "Zusätzliche Kosten\n/\nWerbekosten (%)",
+    "MwSt (%)",
+    "Profit (€)",
+    "Gesamt-\nsteuer (€)",
+    "Gesamt-\nkosten (€)",
+    "Gesamte Amazon-\nGebühren (€)",
+    "Gesamte eBay-\nGebühren (€)",
+    "Gesamte Zusatzkosten\n/\nWerbekosten (€)",
+    "Verkaufs-\npreis (€)",
+]
+
+EN_COLS_WRAPPED = [
+    "Quantity",
+    "Purchase\nPrice (€)",
+    "Shipping\nCosts (€)",
+    "Packaging\nCosts (€)",
+    "Margin (%)",
+    "Amazon\nFees (%)",
+    "eBay\nFees (%)",
+    "Additional Costs\n/\nAdvertising Costs (%)",
+    "VAT (%)",
+    "Profit (€)",
+    "Total\nTax (€)",
+    "Total\nCosts (€)",
+    "Total Amazon\nFees (€)",
+    "Total eBay\nFees (€)",
+    "Total Additional Costs\n/\nAdvertising Costs (€)",
+    "Selling\nPrice (€)",
+]
+
+
+COL_MAP_EN_TO_DE = dict(zip(EN_COLS, DE_COLS))
+
+INPUT_COLS_IDX = list(range(0, 9))   # first 9 columns are inputs
+
+# Keyword names of the nine compute_pricing inputs, in column order
+INPUT_KEYS = [
+    "quantity",
+    "purchase_price",
+    "shipping_costs",
+    "packaging_costs",
+    "margin_pct",
+    "amazon_pct",
+    "ebay_pct",
+    "extra_pct",
+    "vat_pct",
+]
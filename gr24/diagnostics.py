@@ -0,0 +1,88 @@
+"""Hidden diagnostics panel (Ctrl+Alt+Shift+D) showing the hot-path timings."""
+
+from typing import Callable, Optional
+
+from PySide6.QtCore import QTimer
+from PySide6.QtGui import QFontDatabase
+from PySide6.QtWidgets import (
+    QCheckBox, QDialog, QFileDialog, QHBoxLayout, QMessageBox, QPlainTextEdit, QPushButton,
+    QVBoxLayout,
+)
+
+from gr24.instrument import INSTRUMENTATION, PERCENTILES
+
+REFRESH_MS = 1000
+
+
+def format_summary(summary: dict) -> str:
+    columns = ["count", "rows", "total_ms", "mean_ms"] + [f"p{p}_ms" for p in PERCENTILES] + ["max_ms"]
+    lines = [f"{'operation':24}" + "".join(f"{c:>12}" for c in columns)]
+    for name, entry in summary.items():
+        cells = [f"{entry[c]:12d}" if isinstance(entry[c], int) else f"{entry[c]:12.3f}"
+                 for c in columns]
+        lines.append(f"{name:24}" + "".join(cells))
+    return "\n".join(lines)
+
+
+class DiagnosticsPanel(QDialog):
+    """Live table of INSTRUMENTATION; ``extra()`` adds sections (e.g. cache stats) to it."""
+
+    def __init__(self, parent=None, extra: Optional[Callable[[], dict]] = None):
+        super().__init__(parent)
+        self.setWindowTitle("GR24 diagnostics")
+        self.resize(900, 360)
+        self._extra = extra or dict
+
+        self.collect = QCheckBox("Collect timings")
+        self.collect.setChecked(INSTRUMENTATION.enabled)
+        self.collect.toggled.connect(self._set_enabled)
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+
+        buttons = QHBoxLayout()
+        buttons.addWidget(self.collect)
+        buttons.addStretch()
+        for label, slot in (("Reset", self._reset), ("Save JSON...", self._save)):
+            button = QPushButton(label)
+            button.clicked.connect(slot)
+            buttons.addWidget(button)
+        layout = QVBoxLayout(self)
+        layout.addLayout(buttons)
+        layout.addWidget(self.text)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self._timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        sections = [format_summary(INSTRUMENTATION.summary())]
+        for title, values in self._extra().items():
+            sections.append(f"{title}: {values}")
+        self.text.setPlainText("\n\n".join(sections))
+
+    def _set_enabled(self, enabled: bool):
+        INSTRUMENTATION.enabled = enabled
+
+    def _reset(self):
+        INSTRUMENTATION.reset()
+        self.refresh()
+
+    def _save(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save diagnostics", "gr24_diagnostics.json",
+                                              "JSON (*.json)")
+        if not path:
+            return
+        try:
+            INSTRUMENTATION.dump(path, self._extra())
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to save diagnostics:\n{e}")
@@ -0,0 +1,235 @@
+"""Streaming Excel export.
+
+Writes the sheet straight from its typed columns into an .xlsx package:
+the worksheet XML is produced a chunk of rows at a time with vectorized
+string operations and streamed into the zip archive. Nothing is repriced,
+no intermediate DataFrame or cell objects are built, and memory stays flat
+however many rows are exported.
+
+A workbook can hold the same rows under several headers, e.g. a DE and an
+EN sheet. The rows are formatted once: while the first sheet is written
+its XML is also kept, compressed, in a temporary file, and the other
+sheets replay it. An optional summary sheet lists the totals.
+
+Input cells flagged as not a number are written as their text, on a red
+background, rather than as a number nobody entered.
+"""
+
+import tempfile
+import zipfile
+import zlib
+from html import escape
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from gr24.columns import DE_COLS, EN_COLS
+from gr24.parsing import format_hundredths_column
+from gr24.totals import SheetTotals
+
+EXPORT_CHUNK_ROWS = 10_000
+# Block size when replaying the formatted rows into further sheets
+_REPLAY_BYTES = 1 << 20
+SUMMARY_SHEET = "Summary"
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '{sheets}</Types>'
+)
+_SHEET_TYPE = (
+    '<Override PartName="/xl/worksheets/sheet{n}.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="xl/workbook.xml" Type='
+    '"http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+    '</Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets>{sheets}</sheets></workbook>'
+)
+_SHEET_ENTRY = '<sheet name="{name}" sheetId="{n}" r:id="rId{n}"/>'
+
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '{sheets}<Relationship Id="rIdStyles" Target="styles.xml" Type='
+    '"http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles"/>'
+    '</Relationships>'
+)
+_SHEET_REL = (
+    '<Relationship Id="rId{n}" Target="worksheets/sheet{n}.xml" Type='
+    '"http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+)
+# Style 1 is the built-in "0.00" number format, used for the money outputs;
+# style 2 the red background of flagged cells
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="3"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FFFEE2E2"/></patternFill></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="2" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="0" fontId="0" fillId="2" borderId="0" xfId="0" applyFill="1"/>'
+    '</cellXfs><cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/>'
+    '</cellStyles></styleSheet>'
+)
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_TAIL = '</sheetData></worksheet>'
+
+_LETTERS = [chr(ord("A") + i) for i in range(26)]
+
+
+def _rows_xml(columns: Sequence[np.ndarray], priced: np.ndarray, start: int, stop: int,
+              flagged: Sequence[Tuple[int, int, str]] = ()) -> str:
+    """Worksheet XML for rows ``start:stop`` (sheet row numbers start + 2...).
+
+    ``flagged`` are the flagged cells among those rows.
+    """
+    rows = slice(start, stop)
+    ok = priced[rows]
+    numbers = np.arange(start + 2, stop + 2).astype(str).astype(object)
+    xml = '<row r="' + numbers + '">'
+    for c, col in enumerate(columns):
+        values = col[rows]
+        if c < 9:
+            text = values.astype(str).astype(object)
+            present = np.isfinite(values) if values.dtype.kind == "f" else True
+            style = ""
+        else:
+            text = format_hundredths_column(values).astype(object)
+            present = ok
+            style = ' s="1"'
+        cell = '<c r="' + _LETTERS[c] + numbers + '"' + style + '><v>' + text + '</v></c>'
+        cell = np.where(present, cell, "")
+        for row, column, value in flagged:
+            if column == c:
+                cell[row - start] = _text_cell(f"{_LETTERS[c]}{row + 2}", value, ' s="2"')
+        xml = xml + cell
+    return "".join((xml + "</row>").tolist())
+
+
+def _header_xml(headers: Sequence[str]) -> str:
+    return '<row r="1">' + "".join(_text_cell(f"{_LETTERS[c]}1", label)
+                                   for c, label in enumerate(headers)) + "</row>"
+
+
+def _text_cell(ref: str, text: str, style: str = "") -> str:
+    return f'<c r="{ref}"{style} t="inlineStr"><is><t>{escape(text, quote=False)}</t></is></c>'
+
+
+def _number_cell(ref: str, value, style: str = "") -> str:
+    return "" if value is None else f'<c r="{ref}"{style}><v>{value}</v></c>'
+
+
+def summary_xml(totals: SheetTotals) -> str:
+    """Worksheet XML listing the sums and averages of ``totals`` per column, in DE and EN."""
+    rows = [[_text_cell("A1", "Spalte"), _text_cell("B1", "Column"),
+             _text_cell("C1", "Summe (Menge × Wert) / Sum (quantity × value)"),
+             _text_cell("D1", "Durchschnitt pro Stück / Average per unit")]]
+    for c, (de, en) in enumerate(zip(DE_COLS, EN_COLS)):
+        r = c + 2
+        total, average = totals.line_total(c), totals.average(c)
+        if c > 0 and total is not None:
+            total /= 100
+        if average is not None:
+            average = round(average) / 100
+        rows.append([_text_cell(f"A{r}", de), _text_cell(f"B{r}", en),
+                     _number_cell(f"C{r}", total, ' s="1"' if c else ""),
+                     _number_cell(f"D{r}", average, ' s="1"')])
+    r = len(DE_COLS) + 2
+    rows.append([_text_cell(f"A{r}", "Zeilen"), _text_cell(f"B{r}", "Rows"),
+                 _number_cell(f"C{r}", totals.rows)])
+    rows.append([_text_cell(f"A{r + 1}", "Nicht bepreist"), _text_cell(f"B{r + 1}", "Not priced"),
+                 _number_cell(f"C{r + 1}", totals.rows - totals.counted)])
+    body = "".join(f'<row r="{r}">' + "".join(cells) + "</row>" for r, cells in enumerate(rows, 1))
+    return _SHEET_HEAD + body + _SHEET_TAIL
+
+
+def write_workbook(path, sheets: Sequence[Tuple[str, Sequence[str]]],
+                   columns: Sequence[np.ndarray], priced: np.ndarray,
+                   summary: Optional[SheetTotals] = None, chunk_rows: int = EXPORT_CHUNK_ROWS,
+                   progress: Optional[Callable[[int, int], None]] = None,
+                   flagged: Sequence[Tuple[int, int, str]] = ()):
+    """Write the rows to ``path`` once per ``(sheet name, headers)`` in ``sheets``.
+
+    ``columns`` are the sixteen sheet columns in EN_COLS order: quantity,
+    the eight inputs as numbers, then the seven outputs in hundredths.
+    Outputs of rows not marked ``priced`` are left empty, and the
+    ``flagged`` cells, as ``(row, column, text)``, are marked text cells.
+    With ``summary`` a last sheet lists its totals. ``progress(done,
+    total)`` is called after every chunk, counting rows over all sheets.
+    """
+    names: List[str] = [name for name, _ in sheets] + ([SUMMARY_SHEET] if summary else [])
+    by_chunk = {}
+    for cell in flagged:
+        by_chunk.setdefault(cell[0] // chunk_rows, []).append(cell)
+    numbers = range(1, len(names) + 1)
+    n = len(priced)
+    total = n * len(sheets)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as z, \
+            tempfile.TemporaryFile() as kept:
+        z.writestr("[Content_Types].xml", _CONTENT_TYPES.format(
+            sheets="".join(_SHEET_TYPE.format(n=i) for i in numbers)))
+        z.writestr("_rels/.rels", _ROOT_RELS)
+        z.writestr("xl/workbook.xml", _WORKBOOK.format(sheets="".join(
+            _SHEET_ENTRY.format(name=escape(name), n=i) for i, name in zip(numbers, names))))
+        z.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS.format(
+            sheets="".join(_SHEET_REL.format(n=i) for i in numbers)))
+        z.writestr("xl/styles.xml", _STYLES)
+        # Rows formatted for the first sheet are kept for the others
+        keep = zlib.compressobj(1) if len(sheets) > 1 else None
+        for i, (_, headers) in enumerate(sheets):
+            with z.open(f"xl/worksheets/sheet{i + 1}.xml", "w", force_zip64=True) as f:
+                f.write((_SHEET_HEAD + _header_xml(headers)).encode("utf-8"))
+                if i == 0:
+                    for start in range(0, n, chunk_rows):
+                        stop = min(start + chunk_rows, n)
+                        data = _rows_xml(columns, priced, start, stop,
+                                         by_chunk.get(start // chunk_rows, ())).encode("utf-8")
+                        f.write(data)
+                        if keep is not None:
+                            kept.write(keep.compress(data))
+                        if progress is not None:
+                            progress(stop, total)
+                    if keep is not None:
+                        kept.write(keep.flush())
+                else:
+                    kept.seek(0)
+                    replay = zlib.decompressobj()
+                    for block in iter(lambda: kept.read(_REPLAY_BYTES), b""):
+                        f.write(replay.decompress(block))
+                    f.write(replay.flush())
+                    if progress is not None:
+                        progress(n * (i + 1), total)
+                f.write(_SHEET_TAIL.encode("utf-8"))
+        if summary is not None:
+            z.writestr(f"xl/worksheets/sheet{len(names)}.xml", summary_xml(summary))
+
+
+def write_xlsx(path, headers: Sequence[str], columns: Sequence[np.ndarray],
+               priced: np.ndarray, chunk_rows: int = EXPORT_CHUNK_ROWS,
+               progress: Optional[Callable[[int, int], None]] = None,
+               flagged: Sequence[Tuple[int, int, str]] = ()):
+    """Write one sheet of priced rows to ``path``; see ``write_workbook``."""
+    write_workbook(path, [("Sheet1", headers)], columns, priced, chunk_rows=chunk_rows,
+                   progress=progress, flagged=flagged)
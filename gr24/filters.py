@@ -0,0 +1,91 @@
+"""Row filters such as ``selling price > 50 and profit < 0``.
+
+A filter is one or more conditions joined by ``and`` (``und``, ``&&`` or
+``;``). Each condition names a column by its English or German label or
+its input key, ignoring case, units and hyphens (or by an alias such as
+``Gewinn``, as the German header keeps "Profit"); any unambiguous start
+of a label will do. Values take a comma or a dot as decimal separator.
+Conditions are evaluated on the numeric column values, never on text;
+rows without a price match no condition on an output column.
+"""
+
+import operator
+import re
+from typing import Callable, List, NamedTuple
+
+import numpy as np
+
+from gr24.columns import DE_COLS, EN_COLS, INPUT_KEYS
+
+_OPERATORS = {
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+    "=": operator.eq, "==": operator.eq, "!=": operator.ne, "<>": operator.ne,
+}
+_CONDITION = re.compile(r"^(?P<name>.*?)\s*(?P<op><=|>=|!=|<>|==|=|<|>)\s*(?P<value>.+)$")
+_JOIN = re.compile(r"\s+(?:and|und)\s+|&&|;", re.IGNORECASE)
+
+
+class Condition(NamedTuple):
+    column: int
+    op: str
+    value: float
+
+
+def _normalize(name: str) -> str:
+    name = re.sub(r"\((?:€|%)\)|[-_/]", " ", name.casefold())
+    return " ".join(name.split())
+
+
+# Names users reach for that no header uses
+_ALIASES = {"Gewinn": EN_COLS.index("Profit (€)")}
+
+# (normalized name, column) for every way of naming a column
+_NAMES = [(_normalize(label), c) for labels in (EN_COLS, DE_COLS, INPUT_KEYS)
+          for c, label in enumerate(labels)]
+_NAMES += [(_normalize(alias), c) for alias, c in _ALIASES.items()]
+
+
+def match_column(name: str) -> int:
+    """Column index for a column name; raises ValueError if unknown or ambiguous."""
+    wanted = _normalize(name)
+    if not wanted:
+        raise ValueError("missing column name")
+    for label, c in _NAMES:
+        if label == wanted:
+            return c
+    found = {c for label, c in _NAMES if label.startswith(wanted)}
+    if len(found) == 1:
+        return found.pop()
+    if found:
+        choices = ", ".join(EN_COLS[c] for c in sorted(found))
+        raise ValueError(f"{name.strip()!r} could mean {choices}")
+    raise ValueError(f"unknown column {name.strip()!r}")
+
+
+def parse_filter(text: str) -> List[Condition]:
+    """Parse a filter; an empty text gives no conditions. Raises ValueError."""
+    conditions = []
+    for part in _JOIN.split(text.strip()):
+        if not part.strip():
+            continue
+        found = _CONDITION.match(part.strip())
+        if found is None:
+            raise ValueError(f"expected <column> <op> <number>, got {part.strip()!r}")
+        raw = found.group("value").strip().rstrip("€%").strip().replace(",", ".")
+        try:
+            value = float(raw)
+        except ValueError:
+            raise ValueError(f"not a number: {found.group('value').strip()!r}") from None
+        conditions.append(Condition(match_column(found.group("name")), found.group("op"), value))
+    return conditions
+
+
+def filter_mask(conditions: List[Condition], values: Callable[[int], np.ndarray]) -> np.ndarray:
+    """Rows matching every condition; ``values(column)`` gives a column as float64 (NaN = no value)."""
+    mask = None
+    for cond in conditions:
+        col = values(cond.column)
+        with np.errstate(invalid="ignore"):
+            hit = _OPERATORS[cond.op](col, cond.value) & ~np.isnan(col)
+        mask = hit if mask is None else mask & hit
+    return mask
@@ -0,0 +1,181 @@
+"""Fixed-point pricing backend on scaled integers.
+
+Money is held in cents and percentages in hundredths of a percent (basis
+points of the percent value, so 19 % is 1900). With those units every
+compute_pricing output is a ratio of integers:
+
+    C = (purchase + shipping + packaging) * 10000 + purchase * margin
+    b = 10000 - (amazon + ebay + extra + vat)      (10000 if that is 0)
+
+    profit  = purchase * margin / 10000
+    costs   = C / 10000
+    selling = C / b
+    fee     = C * rate / (b * 10000)
+
+and ROUND_HALF_UP is done with integer division. The one place where the
+Decimal path differs from the exact ratio is a fee that lands exactly on
+a half cent while the selling price is a non-terminating decimal: there
+Decimal's 28-digit rounding of the selling price decides the direction.
+Those rows, like inputs with more than two decimals or values too large
+for int64, are priced by ``compute_pricing`` itself. Negative zeros are
+reported as 0.00.
+"""
+
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from gr24.columns import EN_COLS
+from gr24.parsing import (
+    MAX_HUNDREDTHS, hundredths, parse_hundredths_column, parse_quantity_column, to_hundredths,
+)
+from gr24.pricing import compute_pricing
+
+# Largest intermediate allowed; leaves a bit of headroom for the doubling
+# done by the rounding division
+_INT_LIMIT = 2 ** 61
+
+# A count of hundredths times this is its two-decimal Decimal, cheaper than scaleb
+_CENT = Decimal("0.01")
+
+_FEE_COLS = [
+    ("Total Tax (€)", 8),
+    ("Total Amazon Fees (€)", 5),
+    ("Total eBay Fees (€)", 6),
+    ("Total Additional Costs / Advertising Costs (€)", 7),
+]
+
+
+def _div_half_up(num: np.ndarray, den) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(round_half_up(num / den), tie)`` for int64 arrays, den != 0."""
+    sign = np.sign(num) * np.sign(den)
+    num, den = np.abs(num), np.abs(den)
+    quotient = (2 * num + den) // (2 * den)
+    tie = (2 * num) % (2 * den) == den
+    return sign * quotient, tie
+
+
+def _div_half_up_int(num: int, den: int) -> Tuple[int, bool]:
+    """``_div_half_up`` for plain ints, without the numpy overhead per call."""
+    if num >= 0 and den > 0:
+        quotient, remainder = divmod(num, den)
+        twice = 2 * remainder
+        return quotient + (twice >= den), twice == den
+    quotient, tie = _div_half_up_int(abs(num), abs(den))
+    return (-quotient if (num < 0) != (den < 0) else quotient), tie
+
+
+def _dec(value: int) -> Decimal:
+    return Decimal(int(value)).scaleb(-2)
+
+
+def price_columns_fixed(quantity, purchase_price, shipping_costs, packaging_costs,
+                        margin_pct, amazon_pct, ebay_pct, extra_pct, vat_pct,
+                        errors: str = "raise") -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """Fixed-point counterpart of ``gr24.batch.price_columns``, same contract."""
+    if errors not in ("raise", "coerce"):
+        raise ValueError("errors must be 'raise' or 'coerce'")
+    raw = [np.asarray(col) for col in (quantity, purchase_price, shipping_costs, packaging_costs,
+                                        margin_pct, amazon_pct, ebay_pct, extra_pct, vat_pct)]
+    if len({len(col) for col in raw}) != 1:
+        raise ValueError("input columns must all have the same length")
+
+    qty, scalar = parse_quantity_column(raw[0])
+    scaled = [qty]
+    for col in raw[1:]:
+        num, bad = parse_hundredths_column(col)
+        scaled.append(num)
+        scalar |= bad
+    _, purchase, shipping, packaging, margin, amazon, ebay, extra, vat = scaled
+
+    # Bound every product in float before doing it in int64
+    costs = (purchase + shipping + packaging) * 10000
+    scalar |= np.abs(purchase.astype(np.float64)) * np.abs(margin) >= _INT_LIMIT / 4
+    c = costs + np.where(scalar, 0, purchase * margin)
+    max_rate = np.max(np.abs(np.stack([amazon, ebay, extra, vat])), axis=0)
+    scalar |= np.abs(c.astype(np.float64)) * np.maximum(max_rate, 1) >= _INT_LIMIT
+    c = np.where(scalar, 0, c)
+
+    denominator = 10000 - (amazon + ebay + extra + vat)
+    denominator = np.where(denominator == 0, 10000, denominator)
+
+    out: Dict[str, np.ndarray] = {"Quantity": qty}
+    for key, col in zip(EN_COLS[1:9], scaled[1:9]):
+        out[key] = col.copy()
+    out["Profit (€)"], _ = _div_half_up(np.where(scalar, 0, purchase * margin), 10000)
+    out["Total Costs (€)"], _ = _div_half_up(c, 10000)
+    out["Selling Price (€)"], _ = _div_half_up(c, denominator)
+    inexact_selling = c % np.abs(denominator) != 0
+    for key, idx in _FEE_COLS:
+        out[key], tie = _div_half_up(c * scaled[idx], denominator * 10000)
+        scalar |= tie & inexact_selling
+
+    valid = np.ones(len(qty), dtype=bool)
+    for r in np.flatnonzero(scalar):
+        try:
+            row = compute_pricing(*(col[r] for col in raw))
+        except Exception:
+            if errors == "raise":
+                raise
+            row = None
+        if row is not None and all(v.is_finite() for k, v in row.items() if k != "Quantity"):
+            try:
+                for key in EN_COLS:
+                    out[key][r] = hundredths(row[key])
+                continue
+            except OverflowError:
+                # Result doesn't fit int64 hundredths
+                if errors == "raise":
+                    raise
+        valid[r] = False
+        for key in EN_COLS:
+            out[key][r] = 0
+    return out, valid
+
+
+def _scalar_hundredths(value) -> Optional[int]:
+    """``to_hundredths`` with a shortcut for plain text like "12.5"."""
+    if type(value) is str and value.isascii():
+        whole, _, fraction = value.partition(".")
+        if len(fraction) <= 2 and (whole + fraction).isdigit():
+            scaled = int(whole + fraction.ljust(2, "0"))
+            if scaled < MAX_HUNDREDTHS:
+                return scaled
+    return to_hundredths(value)
+
+
+def compute_pricing_fixed(quantity, purchase_price, shipping_costs, packaging_costs,
+                          margin_pct, amazon_pct, ebay_pct, extra_pct, vat_pct):
+    """Drop-in replacement for ``compute_pricing`` using integer arithmetic.
+
+    Plain Python ints throughout; numpy's per-call overhead would cost
+    more than the arithmetic for a single row.
+    """
+    args = (quantity, purchase_price, shipping_costs, packaging_costs,
+            margin_pct, amazon_pct, ebay_pct, extra_pct, vat_pct)
+    scaled = [_scalar_hundredths(v) for v in args[1:]]
+    if None in scaled:
+        return compute_pricing(*args)
+    purchase, shipping, packaging, margin, amazon, ebay, extra, vat = scaled
+
+    c = (purchase + shipping + packaging) * 10000 + purchase * margin
+    if abs(c) * max(abs(amazon), abs(ebay), abs(extra), abs(vat), 1) >= _INT_LIMIT:
+        return compute_pricing(*args)
+    denominator = 10000 - (amazon + ebay + extra + vat) or 10000
+    div = _div_half_up_int
+
+    inexact_selling = c % abs(denominator) != 0
+    fees = []
+    # In EN_COLS order: tax, Amazon, eBay, additional costs
+    for rate in (vat, amazon, ebay, extra):
+        fee, tie = div(c * rate, denominator * 10000)
+        if tie and inexact_selling:
+            return compute_pricing(*args)
+        fees.append(fee)
+    tax, amazon_fee, ebay_fee, extra_fee = fees
+    values = scaled + [div(purchase * margin, 10000)[0], tax, div(c, 10000)[0],
+                       amazon_fee, ebay_fee, extra_fee, div(c, denominator)[0]]
+    out = {"Quantity": int(float(str(quantity) or 0))}
+    out.update(zip(EN_COLS[1:], [_CENT * v for v in values]))
+    return out
@@ -0,0 +1,129 @@
+"""Totals footer pinned below the pricing table.
+
+Two rows under the table's columns: Σ, the sums of the line totals
+(quantity × value) of the money columns and the total quantity, and Ø,
+the quantity-weighted averages per unit (per row for the quantity).
+Both are read from ``PricingTableModel.totals``, which keeps them up to
+date per changed row, so a refresh costs the same for any sheet size.
+
+Outputs only count once their rows are priced. Given the app's
+``BackgroundRepricer``, the footer has the rows that are still stale
+(after opening a project, or after undo) priced by it and refreshes as
+their results come in. Until every row counts, the output totals are
+greyed out and end in "…".
+"""
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QTimer, Qt
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QAbstractItemView, QHeaderView, QTableView
+
+from gr24.columns import EN_COLS
+from gr24.parsing import format_hundredths
+
+# Bursts of changes are shown together after this delay
+FOOTER_DELAY_MS = 50
+
+_ALIGN = int(Qt.AlignVCenter | Qt.AlignRight)
+_LABELS = ("Σ", "Ø")
+_PARTIAL_COLOR = QColor("#94A3B8")
+
+
+class TotalsModel(QAbstractTableModel):
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.model = model
+
+    def refresh(self):
+        self.dataChanged.emit(self.index(0, 0), self.index(len(_LABELS) - 1, len(EN_COLS) - 1))
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(_LABELS)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(EN_COLS)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        totals = self.model.totals()
+        row, col = index.row(), index.column()
+        partial = col >= 9 and totals.counted < totals.rows
+        if role == Qt.DisplayRole:
+            value = totals.line_total(col) if row == 0 else totals.average(col)
+            if value is None:
+                return ""
+            if row == 0 and col == 0:
+                text = str(value)
+            else:
+                text = format_hundredths(round(value))
+            if partial:
+                text += " …"
+            return f"{_LABELS[row]} {text}" if col == 0 else text
+        if role == Qt.TextAlignmentRole:
+            return _ALIGN
+        if role == Qt.ForegroundRole and partial:
+            return _PARTIAL_COLOR
+        if role == Qt.ToolTipRole and partial:
+            return f"{totals.rows - totals.counted} rows not priced yet"
+        return None
+
+
+class TotalsFooter(QTableView):
+    """Footer for ``table`` showing the totals of its source ``model``.
+
+    Stale rows are priced by ``repricer`` (a ``BackgroundRepricer``) if given.
+    """
+
+    def __init__(self, model, table: QTableView, parent=None, repricer=None):
+        super().__init__(parent)
+        self.model = model
+        self._repricer = repricer
+        self.totals_model = TotalsModel(model, self)
+        self.setModel(self.totals_model)
+        self.horizontalHeader().setVisible(False)
+        self.verticalHeader().setVisible(False)
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.verticalHeader().setDefaultSectionSize(table.verticalHeader().defaultSectionSize())
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.setStyleSheet("QTableView { background: #F0F4FF; font-weight: 700; }")
+        self.setFixedHeight(len(_LABELS) * self.verticalHeader().defaultSectionSize()
+                            + 2 * self.frameWidth())
+
+        # Columns follow the table's, which stretch with the window
+        self._header = table.horizontalHeader()
+        self._header.sectionResized.connect(self._on_section_resized)
+        self._header.geometriesChanged.connect(self._sync_widths)
+        self._sync_widths()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(FOOTER_DELAY_MS)
+        self._timer.timeout.connect(self._refresh)
+        for signal in (model.dataChanged, model.rowsInserted, model.rowsRemoved, model.modelReset,
+                       model.totalsChanged):
+            signal.connect(self._schedule)
+
+    def _refresh(self):
+        self.totals_model.refresh()
+        if self._repricer is None or not len(self.model.stale_rows()):
+            return
+        if self._repricer.pending():
+            # Look again once those results are in; they may cover these rows
+            self._timer.start()
+        else:
+            self._repricer.submit_stale()
+
+    def _schedule(self, *args):
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _on_section_resized(self, section: int, old: int, new: int):
+        self.setColumnWidth(section, new)
+
+    def _sync_widths(self):
+        for section in range(self._header.count()):
+            self.setColumnWidth(section, self._header.sectionSize(section))
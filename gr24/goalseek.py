@@ -0,0 +1,129 @@
+"""Reverse pricing: solve for the purchase price or margin that meets a target.
+
+The selling price ``compute_pricing`` reports is
+
+    money(((purchase + shipping + packaging) + purchase * margin) / b)
+
+with ``b = 1 - (amazon + ebay + extra + vat)`` (1 if that is 0), rounded
+ROUND_HALF_UP to the cent. In the integer units of ``gr24.fixed`` (cents
+and hundredths of a percent, ``b`` scaled by 10000) it stays at or below a
+target of ``X`` cents exactly when
+
+    2 * ((purchase + shipping + packaging) * 10000 + purchase * margin) < (2X + 1) * b
+
+which is linear in both purchase price and margin, so the largest
+purchase price (in cents) or margin (in hundredths of a percent) that
+still sells at or below the target is one integer division per row.
+Rows with more than two decimals or values too large for int64 are solved
+with the same inequality in exact fractions.
+
+A row has no solution when the fees and VAT add up to more than 100 %,
+when the price would have to be negative, or, for the margin, when the
+purchase price is 0.
+"""
+
+from decimal import Decimal
+from fractions import Fraction
+from typing import Optional, Tuple
+
+import numpy as np
+
+from gr24.parsing import parse_hundredths_column
+
+SOLVE_TARGETS = ("purchase", "margin")
+
+# Largest intermediate allowed, as in gr24.fixed
+_INT_LIMIT = 2 ** 61
+
+
+def _fraction(value) -> Fraction:
+    return Fraction(Decimal(str(value or 0)))
+
+
+def _denominator(fees) -> Fraction:
+    b = 1 - sum(fees, Fraction(0)) / 100
+    return b if b != 0 else Fraction(1)
+
+
+def _solve_scalar(solve: str, target, purchase, shipping, packaging, margin,
+                  fees) -> Optional[int]:
+    """Exact-fraction solution in hundredths, or None if there is none."""
+    x, p, s, k, m = (_fraction(v) for v in (target, purchase, shipping, packaging, margin))
+    b = _denominator([_fraction(f) for f in fees])
+    if b < 0:
+        return None
+    # selling < x + 0.005 keeps the rounded selling price at or below x
+    limit = (x + Fraction(1, 200)) * b
+    if solve == "purchase":
+        factor = 1 + m / 100
+        if factor <= 0:
+            return None
+        bound = (limit - s - k) / factor * 100
+    else:
+        if p <= 0:
+            return None
+        bound = (limit - p - s - k) / p * 10000
+    # Largest integer strictly below bound
+    result = -((-bound.numerator) // bound.denominator) - 1
+    return result if result >= 0 else None
+
+
+def goal_seek_columns(target, purchase_price, shipping_costs, packaging_costs, margin_pct,
+                      amazon_pct, ebay_pct, extra_pct, vat_pct,
+                      solve: str = "purchase") -> Tuple[np.ndarray, np.ndarray]:
+    """Solve every row for the largest purchase price or margin meeting ``target``.
+
+    ``target`` is the selling price per unit each row may reach at most;
+    the other columns are the usual pricing inputs (quantity is not
+    needed), and the column being solved for is ignored. Returns
+    ``(values, valid)``: int64 hundredths (cents for the purchase price,
+    hundredths of a percent for the margin) and False where a row has no
+    solution or can't be parsed.
+    """
+    if solve not in SOLVE_TARGETS:
+        raise ValueError(f"solve must be one of {SOLVE_TARGETS}")
+    raw = [np.asarray(col) for col in (target, purchase_price, shipping_costs, packaging_costs,
+                                        margin_pct, amazon_pct, ebay_pct, extra_pct, vat_pct)]
+    if len({len(col) for col in raw}) != 1:
+        raise ValueError("input columns must all have the same length")
+
+    scalar = np.zeros(len(raw[0]), dtype=bool)
+    scaled = []
+    for i, col in enumerate(raw):
+        if solve == "purchase" and i == 1 or solve == "margin" and i == 4:
+            # The solved-for column may hold anything, it isn't used
+            scaled.append(np.zeros(len(col), dtype=np.int64))
+            continue
+        num, bad = parse_hundredths_column(col)
+        scaled.append(num)
+        scalar |= bad
+    x, purchase, shipping, packaging, margin, amazon, ebay, extra, vat = scaled
+
+    b = 10000 - (amazon + ebay + extra + vat)
+    b = np.where(b == 0, 10000, b)
+    known = shipping + packaging + (purchase if solve == "margin" else 0)
+    # Bound the products in float before doing them in int64
+    big = np.abs((2 * x + 1).astype(np.float64) * b) + 20000 * np.abs(known.astype(np.float64))
+    scalar |= big >= _INT_LIMIT
+    rhs = np.where(scalar, 0, (2 * x + 1) * b - 20000 * known)
+
+    if solve == "purchase":
+        factor = 2 * (10000 + margin)
+        solvable = (b > 0) & (factor > 0)
+    else:
+        factor = 2 * purchase
+        solvable = (b > 0) & (purchase > 0)
+    factor = np.where(solvable, factor, 1)
+    # Largest integer v with factor * v < rhs
+    values = -((-rhs) // factor) - 1
+    valid = solvable & (values >= 0) & ~scalar
+
+    for r in np.flatnonzero(scalar):
+        try:
+            result = _solve_scalar(solve, raw[0][r], raw[1][r], raw[2][r], raw[3][r], raw[4][r],
+                                   [raw[i][r] for i in range(5, 9)])
+        except (ArithmeticError, ValueError, TypeError):
+            result = None
+        if result is not None and abs(result) < 2 ** 63:
+            values[r], valid[r] = result, True
+    return np.where(valid, values, 0), valid
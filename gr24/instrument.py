@@ -0,0 +1,132 @@
+"""Optional timing of the GUI hot paths, and session profiling.
+
+``INSTRUMENTATION`` collects, per operation, the call count, total and
+percentile latencies and the number of rows handled. It is off unless
+``GR24_INSTRUMENT=1`` is set or it is switched on from the diagnostics
+panel; while off, an instrumented call costs one attribute check.
+
+``GR24_PROFILE=<path>`` runs the whole session under cProfile and writes
+the stats to ``<path>`` on exit (read them with ``python -m pstats``).
+Nothing here imports Qt.
+"""
+
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Optional
+
+import numpy as np
+
+# Latency samples kept per operation for the percentiles
+SAMPLE_SIZE = 10_000
+PERCENTILES = (50, 90, 99)
+
+
+class _Series:
+    __slots__ = ("count", "total", "rows", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.rows = 0
+        self.samples: Deque[float] = deque(maxlen=SAMPLE_SIZE)
+
+
+class Instrumentation:
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._series: Dict[str, _Series] = {}
+        # Save and export report from worker threads
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float, rows: int = 1):
+        with self._lock:
+            series = self._series.get(name)
+            if series is None:
+                series = self._series[name] = _Series()
+            series.count += 1
+            series.total += seconds
+            series.rows += rows
+            series.samples.append(seconds)
+
+    @contextmanager
+    def timed(self, name: str, rows: int = 1):
+        """Time the ``with`` block as one call of ``name`` (if enabled)."""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started, rows)
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def summary(self) -> Dict[str, dict]:
+        """Per operation: count, rows, total, mean, percentiles and max, in milliseconds."""
+        with self._lock:
+            series = {name: (s.count, s.total, s.rows, np.array(s.samples))
+                      for name, s in self._series.items()}
+        out = {}
+        for name, (count, total, rows, samples) in sorted(series.items()):
+            entry = {"count": count, "rows": rows, "total_ms": total * 1000,
+                     "mean_ms": total / count * 1000}
+            for p, value in zip(PERCENTILES, np.percentile(samples, PERCENTILES)):
+                entry[f"p{p}_ms"] = value * 1000
+            entry["max_ms"] = samples.max() * 1000
+            out[name] = entry
+        return out
+
+    def dump(self, path, extra: Optional[dict] = None):
+        """Write the summary (and ``extra``, e.g. cache statistics) as JSON."""
+        report = {"operations": self.summary(), **(extra or {})}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+INSTRUMENTATION = Instrumentation(enabled=os.environ.get("GR24_INSTRUMENT", "") not in ("", "0"))
+
+
+def instrumented(name: str, rows: Optional[Callable[..., int]] = None):
+    """Decorator timing every call as ``name``; ``rows(*args)`` gives the rows handled."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            stats = INSTRUMENTATION
+            if not stats.enabled:
+                return fn(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                stats.record(name, time.perf_counter() - started,
+                             rows(*args, **kwargs) if rows is not None else 1)
+        return wrapper
+    return decorate
+
+
+def start_profile() -> Optional[Callable[[], None]]:
+    """Start cProfile if ``GR24_PROFILE`` names an output file.
+
+    Returns a function that stops profiling and writes the stats, or None
+    when profiling is off.
+    """
+    path = os.environ.get("GR24_PROFILE")
+    if not path:
+        return None
+    profile = cProfile.Profile()
+    profile.enable()
+
+    def stop():
+        profile.disable()
+        profile.dump_stats(path)
+
+    return stop
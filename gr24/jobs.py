@@ -0,0 +1,125 @@
+"""Background file jobs (save, export, import) on a worker thread pool.
+
+A write job works from a snapshot of the sheet columns, so the user can
+keep editing while it runs. Output goes to ``<path>.part`` and is renamed
+into place only when complete; a failed or cancelled job leaves no
+partial file behind. An import job reads and prices a catalog chunk by
+chunk and hands each priced chunk over as soon as it is ready. Progress
+and the outcome are reported through signals, which Qt delivers on the
+GUI thread.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
+
+from PySide6.QtCore import QObject, Signal
+
+_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="gr24-job")
+
+
+class Cancelled(Exception):
+    """Raised inside a running job once cancel() was requested."""
+
+
+class JobSignals(QObject):
+    progress = Signal(int, int)   # done, total
+    finished = Signal(str)        # path
+    failed = Signal(str)          # error message
+    cancelled = Signal()
+
+
+class FileJob:
+    """Run ``write(path, progress)`` on a worker thread.
+
+    ``write`` must call ``progress(done, total)`` regularly; that is where
+    progress is reported and cancellation takes effect.
+    """
+
+    def __init__(self, path: str, write: Callable[[str, Callable[[int, int], None]], None]):
+        self.path = path
+        self.signals = JobSignals()
+        self._write = write
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _progress(self, done: int, total: int):
+        if self._cancel.is_set():
+            raise Cancelled()
+        self.signals.progress.emit(done, total)
+
+    def run(self):
+        part = self.path + ".part"
+        try:
+            self._write(part, self._progress)
+            if self._cancel.is_set():
+                raise Cancelled()
+            os.replace(part, self.path)
+        except Cancelled:
+            self._remove(part)
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self._remove(part)
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(self.path)
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class ImportSignals(QObject):
+    chunk = Signal(object)        # (columns, outputs, valid)
+    finished = Signal(int)        # rows imported
+    failed = Signal(str)          # error message
+    cancelled = Signal()
+
+
+class ImportJob:
+    """Price every chunk of ``chunks`` with ``pricer`` on a worker thread.
+
+    ``chunks`` yields nine typed input columns at a time, ``pricer`` is
+    called with them and returns ``(outputs, valid)``.
+    """
+
+    def __init__(self, chunks: Iterator, pricer: Callable):
+        self.signals = ImportSignals()
+        self._chunks = chunks
+        self._pricer = pricer
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        rows = 0
+        try:
+            for columns in self._chunks:
+                if self._cancel.is_set():
+                    raise Cancelled()
+                outputs, valid = self._pricer(columns)
+                self.signals.chunk.emit((columns, outputs, valid))
+                rows += len(columns[0])
+        except Cancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(rows)
+        finally:
+            # Releases the file when the import stops early
+            close = getattr(self._chunks, "close", None)
+            if close is not None:
+                close()
+
+
+def start(job):
+    """Run ``job.run()`` on the worker pool."""
+    _pool.submit(job.run)
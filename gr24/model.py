@@ -0,0 +1,650 @@
+"""Columnar table model behind the pricing sheet.
+
+Rows are not stored as items. Each column lives in a typed numpy array
+(quantity as int64, the other inputs as float64, outputs as int64
+hundredths), and text, flags and alignment are produced on demand in
+``data()``/``flags()`` for the rows the view actually paints.
+
+Rows whose inputs changed since they were last priced are *stale*. With a
+pricer installed (``set_pricer``), stale rows are priced lazily a block at
+a time when their outputs are first read, and ``sheet_columns`` prices
+whatever is still stale. That lets a sheet be adopted from memory-mapped
+columns without reading or pricing rows nobody looks at.
+
+Every row carries a version, a number that is unique across the sheet
+and renewed whenever the row's inputs are written. Outputs priced in the
+background are applied with ``apply_outputs`` only to rows whose version
+still matches the inputs they were priced from.
+
+With an undo stack installed (``set_undo_stack``), cell edits made through
+``setData`` are pushed onto it as commands from ``gr24.undo``.
+
+Edits are parsed once, in the sheet's locale (``set_locale``). Text that
+is not a number is kept in its cell and flagged instead of being dropped;
+the row stays unpriced until the cell is corrected. Rows whose inputs
+can't be priced are flagged as well.
+
+Quantity-weighted totals (``totals``) are kept up to date by subtracting
+each row before it is written and adding it back afterwards. After the
+whole sheet is replaced they are recomputed once, when next asked for.
+"""
+
+import csv
+import io
+import os
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PySide6.QtCore import QAbstractTableModel, QLocale, QModelIndex, Qt, Signal
+from PySide6.QtGui import QBrush, QColor
+
+from gr24.columns import EN_COLS, INPUT_COLS_IDX
+from gr24.parsing import QUANTITY_LIMIT, format_hundredths, parse_input_cells, parse_number
+from gr24.totals import MONEY_COLS, SheetTotals, input_hundredths
+from gr24.undo import FlagCell, SetCells
+
+OUTPUT_COLS = EN_COLS[9:]
+# Stale rows are priced in aligned blocks of this many rows when displayed
+LAZY_PRICE_ROWS = 1024
+
+_ALIGN = int(Qt.AlignVCenter | Qt.AlignRight)
+_INPUT_FLAGS = Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable
+_OUTPUT_FLAGS = Qt.ItemIsSelectable | Qt.ItemIsEnabled
+_ERROR_BRUSH = QBrush(QColor("#FEE2E2"))
+
+
+def format_input(value: float) -> str:
+    """Format an input amount: two decimals unless it carries more precision."""
+    if abs(value) < 1e13 and round(value * 100) / 100 == value:
+        return f"{value:.2f}"
+    return repr(value)
+
+
+def parse_input(text, column: int, locale: Optional[QLocale] = None):
+    """Parse a cell edit into the typed value stored for ``column``.
+
+    The text is read with ``gr24.parsing.parse_number`` in the decimal
+    separator of ``locale`` (the C locale by default): a dot as shown in
+    the sheet, a decimal comma, or the locale's digit grouping where that
+    is unambiguous. Raises ValueError for anything else, and for
+    quantities that don't fit int64.
+    """
+    value = parse_number(text, (locale or QLocale.c()).decimalPoint())
+    if column == 0:
+        if not -QUANTITY_LIMIT <= value < QUANTITY_LIMIT:
+            raise ValueError(f"quantity out of range: {text!r}")
+        return int(value)
+    return value
+
+
+def parse_input_block(text: str, column: int = 0,
+                      locale: Optional[QLocale] = None) -> List[np.ndarray]:
+    """Parse a tab-separated clipboard range into typed input columns.
+
+    The block is placed starting at input ``column``; cells beyond the last
+    input column are ignored and short lines are padded with blanks. Values
+    are read with ``gr24.parsing.parse_input_cells`` in the decimal
+    separator of ``locale``, by the same rules as ``parse_input``. Raises
+    ValueError naming the first cell that isn't a number.
+    """
+    lines = [line for line in csv.reader(io.StringIO(text), delimiter="\t")]
+    while lines and not any(cell.strip() for cell in lines[-1]):
+        lines.pop()
+    width = min(max((len(line) for line in lines), default=0), len(INPUT_COLS_IDX) - column)
+    if not lines or width <= 0:
+        return []
+    cells = np.full((len(lines), width), "", dtype=object)
+    for r, line in enumerate(lines):
+        line = line[:width]
+        cells[r, :len(line)] = line
+    return parse_input_cells(cells, column, decimal=(locale or QLocale.c()).decimalPoint())
+
+
+def _unmapped(array: np.ndarray, path: str) -> np.ndarray:
+    """``array`` copied into memory if it is memory-mapped from ``path``, else ``array``."""
+    if isinstance(array, np.memmap) and array.filename is not None:
+        mapped, target = (os.path.normcase(os.path.abspath(p)) for p in (array.filename, path))
+        if mapped == target:
+            return np.array(array)
+    return array
+
+
+class PricingTableModel(QAbstractTableModel):
+    # Emitted after the user edits an input cell: (row, column)
+    inputEdited = Signal(int, int)
+    # Emitted after stale rows were priced on being read (painted, saved, ...),
+    # which changes the totals without a dataChanged
+    totalsChanged = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._headers: List[str] = list(EN_COLS)
+        self._set_empty()
+        self._next_version = 0
+        # (file, version) of columns adopted by attach_columns
+        self._mapped: Optional[Tuple[str, int]] = None
+        self._pricer: Optional[Callable] = None
+        self._undo = None
+        self._locale = QLocale.c()
+
+    def set_pricer(self, pricer: Optional[Callable]):
+        """Install ``pricer(columns) -> (outputs, valid)`` used to price stale rows.
+
+        ``columns`` are nine typed input columns, the result is as returned
+        by ``gr24.batch.price_columns``.
+        """
+        self._pricer = pricer
+
+    def set_undo_stack(self, stack):
+        """Push cell edits onto the QUndoStack ``stack`` (None to apply them directly)."""
+        self._undo = stack
+
+    def set_locale(self, locale: QLocale):
+        """Read cell edits as numbers written in ``locale`` (see ``parse_input``)."""
+        self._locale = locale
+
+    def locale(self) -> QLocale:
+        return self._locale
+
+    # ---- Storage ----
+    def _set_empty(self):
+        self._rows = 0
+        self._quantity = np.zeros(0, dtype=np.int64)
+        self._inputs = np.zeros((8, 0), dtype=np.float64)
+        self._outputs = np.zeros((len(OUTPUT_COLS), 0), dtype=np.int64)
+        self._priced = np.zeros(0, dtype=bool)
+        self._stale = np.zeros(0, dtype=bool)
+        self._version = np.zeros(0, dtype=np.int64)
+        # Per row None, or {input column: text that is not a number}
+        self._invalid = np.full(0, None, dtype=object)
+        self._totals: Optional[SheetTotals] = SheetTotals()
+
+    def _tally(self, rows, sign: int, inputs: bool = True):
+        """Add (``sign=-1``: subtract) ``rows`` to the totals; outputs only unless ``inputs``."""
+        if self._totals is None:
+            return  # recomputed when next asked for
+        if np.ndim(rows) == 0 and not isinstance(rows, slice):
+            rows = slice(int(rows), int(rows) + 1)
+        n = self._rows
+        quantity = self._quantity[:n][rows]
+        if inputs:
+            self._totals.add_inputs(quantity, self._inputs[:, :n][:, rows], sign)
+        counted = self._priced[:n][rows] & ~self._stale[:n][rows]
+        self._totals.add_outputs(quantity, self._outputs[:, :n][:, rows], counted, sign)
+
+    def _stamp(self, rows: slice):
+        """Give ``rows`` (a contiguous slice) fresh versions."""
+        start, stop, _ = rows.indices(self._rows)
+        self._version[start:stop] = np.arange(self._next_version,
+                                              self._next_version + stop - start)
+        self._next_version += stop - start
+
+    def _reserve(self, rows: int):
+        capacity = len(self._quantity)
+        if rows <= capacity:
+            return
+        capacity = max(rows, capacity * 2, 64)
+        n = self._rows
+        quantity = np.zeros(capacity, dtype=np.int64)
+        inputs = np.zeros((8, capacity), dtype=np.float64)
+        outputs = np.zeros((len(OUTPUT_COLS), capacity), dtype=np.int64)
+        priced = np.zeros(capacity, dtype=bool)
+        stale = np.zeros(capacity, dtype=bool)
+        version = np.zeros(capacity, dtype=np.int64)
+        invalid = np.full(capacity, None, dtype=object)
+        quantity[:n] = self._quantity[:n]
+        inputs[:, :n] = self._inputs[:, :n]
+        outputs[:, :n] = self._outputs[:, :n]
+        priced[:n] = self._priced[:n]
+        stale[:n] = self._stale[:n]
+        version[:n] = self._version[:n]
+        invalid[:n] = self._invalid[:n]
+        self._quantity, self._inputs, self._outputs = quantity, inputs, outputs
+        self._priced, self._stale, self._version = priced, stale, version
+        self._invalid = invalid
+
+    def _arrays(self):
+        return (self._quantity, self._inputs, self._outputs, self._priced, self._stale,
+                self._version, self._invalid)
+
+    def insert_rows(self, row: int, columns: Sequence[Sequence]):
+        """Insert rows at ``row`` from nine typed input columns (outputs unpriced)."""
+        count = len(columns[0])
+        if count == 0:
+            return
+        n = self._rows
+        self.beginInsertRows(QModelIndex(), row, row + count - 1)
+        self._reserve(n + count)
+        if row < n:
+            for arr in self._arrays():
+                arr[..., row + count:n + count] = arr[..., row:n]
+        self._quantity[row:row + count] = columns[0]
+        self._inputs[:, row:row + count] = columns[1:9]
+        self._outputs[:, row:row + count] = 0
+        self._priced[row:row + count] = False
+        self._stale[row:row + count] = True
+        self._invalid[row:row + count] = None
+        self._rows = n + count
+        self._stamp(slice(row, row + count))
+        self._tally(slice(row, row + count), 1)
+        self.endInsertRows()
+
+    def set_inputs(self, row: int, column: int, columns: Sequence[np.ndarray]):
+        """Overwrite input cells from ``(row, column)`` with typed columns.
+
+        Rows past the end are appended first. Emits at most one rowsInserted
+        and one dataChanged; outputs are left for the caller to reprice.
+        """
+        count = len(columns[0])
+        if count == 0:
+            return
+        extra = row + count - self._rows
+        if extra > 0:
+            self.insert_rows(self._rows, [np.zeros(extra, dtype=np.int64)] * len(INPUT_COLS_IDX))
+        self._tally(slice(row, row + count), -1)
+        self._unflag(slice(row, row + count), range(column, column + len(columns)))
+        for c, values in enumerate(columns, start=column):
+            if c == 0:
+                self._quantity[row:row + count] = values
+            else:
+                self._inputs[c - 1, row:row + count] = values
+        self._stale[row:row + count] = True
+        self._stamp(slice(row, row + count))
+        self._tally(slice(row, row + count), 1)
+        self.dataChanged.emit(self.createIndex(row, column),
+                              self.createIndex(row + count - 1, column + len(columns) - 1))
+        # The outputs of those rows are stale now too
+        self.dataChanged.emit(self.createIndex(row, 9),
+                              self.createIndex(row + count - 1, len(EN_COLS) - 1))
+
+    def removeRows(self, row: int, count: int, parent: QModelIndex = QModelIndex()) -> bool:
+        n = self._rows
+        if count <= 0 or row < 0 or row + count > n:
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        self._tally(slice(row, row + count), -1)
+        for arr in self._arrays():
+            arr[..., row:n - count] = arr[..., row + count:n]
+        self._rows = n - count
+        self.endRemoveRows()
+        return True
+
+    def set_columns(self, columns: Sequence[Sequence]):
+        """Replace the whole sheet with nine typed input columns in one reset."""
+        self.beginResetModel()
+        count = len(columns[0])
+        self._rows = 0
+        self._reserve(count)
+        self._quantity[:count] = columns[0]
+        for c in range(8):
+            self._inputs[c, :count] = columns[c + 1]
+        self._outputs[:, :count] = 0
+        self._priced[:count] = False
+        self._stale[:count] = True
+        self._invalid[:count] = None
+        self._rows = count
+        self._stamp(slice(0, count))
+        self._totals = None
+        self.endResetModel()
+
+    def attach_columns(self, quantity: np.ndarray, inputs: np.ndarray):
+        """Adopt ``quantity`` (rows,) and ``inputs`` (8, rows) as the sheet without copying.
+
+        Meant for memory-mapped project columns: every row starts stale and
+        is priced only once its outputs are read. The arrays are copied
+        into regular memory when the sheet first grows.
+        """
+        self.beginResetModel()
+        count = len(quantity)
+        self._quantity, self._inputs = quantity, inputs
+        # np.zeros pages stay untouched until written
+        self._outputs = np.zeros((len(OUTPUT_COLS), count), dtype=np.int64)
+        self._priced = np.zeros(count, dtype=bool)
+        self._stale = np.ones(count, dtype=bool)
+        self._version = np.zeros(count, dtype=np.int64)
+        self._invalid = np.full(count, None, dtype=object)
+        self._rows = count
+        self._stamp(slice(0, count))
+        self._mapped = (getattr(quantity, "filename", None), self._next_version)
+        self._totals = None
+        self.endResetModel()
+
+    def mapped_file(self) -> Optional[str]:
+        """The project file the sheet is memory-mapped from, while it holds exactly that file.
+
+        None once any input has been written or a row removed since
+        ``attach_columns``, or if the columns weren't mapped from a file.
+        """
+        if self._mapped is None or not isinstance(self._quantity, np.memmap):
+            return None
+        path, version = self._mapped
+        if version != self._next_version or self._rows != len(self._quantity):
+            return None
+        return path
+
+    def release_mapping(self, path: str):
+        """Copy the columns into memory if they are memory-mapped from ``path``.
+
+        Windows can't replace a file while it is mapped, so this comes
+        before saving over the project the sheet was opened from.
+        """
+        self._quantity = _unmapped(self._quantity, path)
+        self._inputs = _unmapped(self._inputs, path)
+
+    @staticmethod
+    def unmapped_storage(storage: tuple, path: str) -> tuple:
+        """``release_mapping`` for arrays returned by ``take_storage``."""
+        rows, totals, quantity, inputs, *rest = storage
+        return (rows, totals, _unmapped(quantity, path), _unmapped(inputs, path), *rest)
+
+    def clear(self):
+        self.beginResetModel()
+        self._rows = 0
+        self._totals = SheetTotals()
+        self.endResetModel()
+
+    def take_storage(self) -> tuple:
+        """Empty the sheet and return its arrays, without copying them.
+
+        Hand the result to ``restore_storage`` to bring the sheet back
+        exactly as it was, outputs included.
+        """
+        self.beginResetModel()
+        storage = (self._rows, self._totals) + self._arrays()
+        self._set_empty()
+        self.endResetModel()
+        return storage
+
+    def restore_storage(self, storage: tuple):
+        """Replace the sheet with arrays returned by ``take_storage``."""
+        self.beginResetModel()
+        (self._rows, self._totals, self._quantity, self._inputs, self._outputs, self._priced,
+         self._stale, self._version, self._invalid) = storage
+        self.endResetModel()
+
+    # ---- Flagged cells ----
+    def invalid_text(self, row: int, col: int) -> Optional[str]:
+        """Text kept in input cell ``(row, col)`` because it isn't a number, else None."""
+        cells = self._invalid[row]
+        return None if cells is None else cells.get(col)
+
+    def invalid_cells(self, rows: slice) -> List[Tuple[int, int, str]]:
+        """``(row, column, text)`` of every flagged input cell among ``rows``."""
+        start, stop, _ = rows.indices(self._rows)
+        found = np.flatnonzero(np.not_equal(self._invalid[start:stop], None)) + start
+        return [(int(r), c, text) for r in found for c, text in self._invalid[r].items()]
+
+    def set_invalid(self, row: int, col: int, text: str):
+        """Keep ``text``, which isn't a number, in input cell ``(row, col)`` and flag it.
+
+        The typed value stays as it was, but the row is not priced until
+        the cell gets a number again.
+        """
+        self._tally(row, -1)
+        self._invalid[row] = {**(self._invalid[row] or {}), col: text}
+        self._stale[row] = True
+        self._stamp(slice(row, row + 1))
+        self._tally(row, 1)
+        self.dataChanged.emit(self.index(row, col), self.index(row, len(EN_COLS) - 1))
+
+    def set_invalid_cells(self, cells: Sequence[Tuple[int, int, str]]):
+        """Flag ``(row, column, text)`` cells, as read back from a file (see ``set_invalid``)."""
+        for row, col, text in cells:
+            self.set_invalid(row, col, text)
+
+    def _unflag(self, rows: slice, columns: range):
+        """Clear the flags of ``columns`` in ``rows``, which are about to get numbers."""
+        start, stop, _ = rows.indices(self._rows)
+        for r in np.flatnonzero(np.not_equal(self._invalid[start:stop], None)) + start:
+            cells = {c: text for c, text in self._invalid[r].items() if c not in columns}
+            self._invalid[r] = cells or None
+
+    def cell_error(self, row: int, col: int) -> Optional[str]:
+        """Why cell ``(row, col)`` is flagged, or None if it isn't."""
+        cells = self._invalid[row]
+        if col in INPUT_COLS_IDX:
+            if cells is not None and col in cells:
+                return f"Not a number: {cells[col]!r}"
+            return None
+        if cells is not None:
+            return "Not priced: the row has a cell that is not a number"
+        if not self._stale[row] and not self._priced[row]:
+            return "These inputs cannot be priced"
+        return None
+
+    def input_columns(self, rows=slice(None)) -> List[np.ndarray]:
+        """Typed input columns (quantity first) for ``rows``, as views where possible."""
+        n = self._rows
+        quantity = self._quantity[:n][rows]
+        return [quantity] + [self._inputs[c, :n][rows] for c in range(8)]
+
+    def ensure_priced(self, rows=slice(None)):
+        """Price the stale rows among ``rows`` (all by default), if a pricer is set."""
+        if self._pricer is None:
+            return
+        if isinstance(rows, slice):
+            start, stop, _ = rows.indices(self._rows)
+            stale = np.flatnonzero(self._stale[start:stop]) + start
+        else:
+            rows = np.asarray(rows)
+            stale = rows[self._stale[rows]]
+        if not len(stale):
+            return
+        for start in range(0, len(stale), 65536):
+            block = stale[start:start + 65536]
+            outputs, valid = self._pricer(self.input_columns(block))
+            self._store_outputs(block, outputs, valid)
+        self.totalsChanged.emit()
+
+    def stale_rows(self) -> np.ndarray:
+        """Indices of the rows whose outputs are out of date."""
+        return np.flatnonzero(self._stale[:self._rows])
+
+    def _store_outputs(self, rows, outputs: Dict[str, np.ndarray], valid: Optional[np.ndarray]):
+        if isinstance(rows, (int, np.integer)):
+            # One row (a cell edit) without the fancy indexing below
+            self._tally(rows, -1, inputs=False)
+            self._outputs[:, rows] = [outputs[key] for key in OUTPUT_COLS]
+            self._priced[rows] = (valid is None or bool(valid)) and self._invalid[rows] is None
+            self._stale[rows] = False
+            self._tally(rows, 1, inputs=False)
+            return
+        n = self._rows
+        self._tally(rows, -1, inputs=False)
+        for i, key in enumerate(OUTPUT_COLS):
+            self._outputs[i, :n][rows] = outputs[key]
+        # Rows with a cell that isn't a number stay unpriced
+        flagged = np.not_equal(self._invalid[:n][rows], None)
+        self._priced[:n][rows] = (True if valid is None else valid) & ~flagged
+        self._stale[:n][rows] = False
+        self._tally(rows, 1, inputs=False)
+
+    def sheet_columns(self) -> Tuple[List[np.ndarray], np.ndarray]:
+        """All sixteen columns (outputs in hundredths) and the priced mask, as views.
+
+        Stale rows are priced first.
+        """
+        self.ensure_priced()
+        n = self._rows
+        columns = [self._quantity[:n]] + [self._inputs[c, :n] for c in range(8)]
+        columns += [self._outputs[i, :n] for i in range(len(OUTPUT_COLS))]
+        return columns, self._priced[:n]
+
+    def column_values(self, column: int, rows=slice(None)) -> np.ndarray:
+        """Numeric values of ``column`` for ``rows`` as float64 (a copy).
+
+        Outputs are in currency units, stale rows among ``rows`` are priced
+        first and rows that could not be priced are NaN.
+        """
+        n = self._rows
+        if column == 0:
+            return self._quantity[:n][rows].astype(np.float64)
+        if column in INPUT_COLS_IDX:
+            return self._inputs[column - 1, :n][rows].astype(np.float64)
+        self.ensure_priced(rows)
+        values = self._outputs[column - 9, :n][rows] / 100
+        values[~self._priced[:n][rows]] = np.nan
+        return values
+
+    def totals(self) -> SheetTotals:
+        """Quantity-weighted totals of the sheet; outputs count for priced, up-to-date rows."""
+        if self._totals is None:
+            self._totals = SheetTotals()
+            self._tally(slice(None), 1)
+        return self._totals
+
+    def line_total(self, row: int, col: int) -> Optional[int]:
+        """Quantity × value of a money cell in hundredths, None if it has no value."""
+        if col not in MONEY_COLS:
+            return None
+        if col < 9:
+            value = int(input_hundredths(self._inputs[col - 1, row]))
+        else:
+            self.cell_text(row, col)  # prices the row if stale
+            if not self._priced[row]:
+                return None
+            value = int(self._outputs[col - 9, row])
+        return int(self._quantity[row]) * value
+
+    def row_versions(self, rows=slice(None)) -> np.ndarray:
+        """Current versions of ``rows`` (a copy)."""
+        return self._version[:self._rows][rows].copy()
+
+    def apply_outputs(self, rows: np.ndarray, versions: np.ndarray, outputs: Dict[str, np.ndarray],
+                      valid: np.ndarray) -> int:
+        """Store outputs priced from the inputs ``rows`` had at ``versions``.
+
+        Rows that have moved since (rows inserted or removed above them) are
+        found by their version; rows edited or removed since are skipped, their
+        newer inputs get priced separately. Returns the number of rows updated.
+        """
+        n = self._rows
+        rows, versions = np.asarray(rows), np.asarray(versions)
+        target = np.full(len(rows), -1, dtype=np.int64)
+        inside = np.flatnonzero(rows < n)
+        same = inside[self._version[rows[inside]] == versions[inside]]
+        target[same] = rows[same]
+        moved = np.flatnonzero(target < 0)
+        if len(moved):
+            # Only rows still waiting for a price can be the ones we priced
+            stale = np.flatnonzero(self._stale[:n])
+            order = np.argsort(versions[moved])
+            wanted = versions[moved][order]
+            pos = np.minimum(np.searchsorted(wanted, self._version[stale]), len(wanted) - 1)
+            hit = wanted[pos] == self._version[stale]
+            target[moved[order[pos[hit]]]] = stale[hit]
+        keep = np.flatnonzero(target >= 0)
+        if len(keep):
+            self.set_outputs(target[keep], {key: col[keep] for key, col in outputs.items()},
+                             valid[keep])
+        return len(keep)
+
+    def row_inputs(self, row: int) -> list:
+        return [int(self._quantity[row])] + self._inputs[:, row].tolist()
+
+    def set_outputs(self, rows, outputs: Dict[str, np.ndarray], valid: Optional[np.ndarray] = None):
+        """Store priced outputs (hundredths keyed by EN label) for ``rows``.
+
+        ``rows`` is a row index, a slice or an index array. One dataChanged
+        covering the touched rows is emitted.
+        """
+        self._store_outputs(rows, outputs, valid)
+        if isinstance(rows, slice):
+            first, stop, _ = rows.indices(self._rows)
+            last = stop - 1
+        elif np.ndim(rows) == 0:
+            first = last = int(rows)
+        else:
+            first, last = (int(np.min(rows)), int(np.max(rows))) if np.size(rows) else (0, -1)
+        if first <= last:
+            self.dataChanged.emit(self.createIndex(first, 9),
+                                  self.createIndex(last, len(EN_COLS) - 1))
+
+    def cell_text(self, row: int, col: int) -> str:
+        cells = self._invalid[row]
+        if cells is not None and col in cells:
+            return cells[col]
+        if col == 0:
+            return str(int(self._quantity[row]))
+        if col in INPUT_COLS_IDX:
+            return format_input(float(self._inputs[col - 1, row]))
+        if self._stale[row]:
+            start = row - row % LAZY_PRICE_ROWS
+            self.ensure_priced(slice(start, min(start + LAZY_PRICE_ROWS, self._rows)))
+        if not self._priced[row]:
+            return ""
+        return format_hundredths(self._outputs[col - 9, row])
+
+    def row_texts(self, row: int) -> List[str]:
+        return [self.cell_text(row, c) for c in range(len(EN_COLS))]
+
+    def set_headers(self, labels: Sequence[str]):
+        self._headers = list(labels)
+        self.headerDataChanged.emit(Qt.Horizontal, 0, len(self._headers) - 1)
+
+    # ---- Qt model interface ----
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(EN_COLS)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self.cell_text(index.row(), index.column())
+        if role == Qt.TextAlignmentRole:
+            return _ALIGN
+        if role == Qt.BackgroundRole:
+            return _ERROR_BRUSH if self.cell_error(index.row(), index.column()) else None
+        if role == Qt.ToolTipRole:
+            row, col = index.row(), index.column()
+            error = self.cell_error(row, col)
+            if error is not None:
+                return error
+            line = self.line_total(row, col)
+            if line is not None:
+                return f"{self._quantity[row]} × {self.cell_text(row, col)} = {format_hundredths(line)}"
+        return None
+
+    def flags(self, index: QModelIndex):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return _INPUT_FLAGS if index.column() in INPUT_COLS_IDX else _OUTPUT_FLAGS
+
+    def setData(self, index: QModelIndex, value, role: int = Qt.EditRole) -> bool:
+        if role != Qt.EditRole or not index.isValid() or index.column() not in INPUT_COLS_IDX:
+            return False
+        row, col = index.row(), index.column()
+        try:
+            parsed = parse_input(value, col, self._locale)
+        except (TypeError, ValueError, OverflowError):
+            # Kept and flagged in the cell, so the input isn't lost
+            text = str(value).strip()
+            if self._undo is not None:
+                self._undo.push(FlagCell(self, row, col, text))
+            else:
+                self.set_invalid(row, col, text)
+            self.inputEdited.emit(row, col)
+            return True
+        if self._undo is not None:
+            self._undo.push(SetCells(self, row, col, [np.array([parsed])]))
+        else:
+            self._tally(row, -1)
+            self._unflag(slice(row, row + 1), range(col, col + 1))
+            if col == 0:
+                self._quantity[row] = parsed
+            else:
+                self._inputs[col - 1, row] = parsed
+            self._stale[row] = True
+            self._stamp(slice(row, row + 1))
+            self._tally(row, 1)
+            self.dataChanged.emit(index, index)
+        self.inputEdited.emit(row, col)
+        return True
+
+    def headerData(self, section: int, orientation, role: int = Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self._headers[section]
+        return None
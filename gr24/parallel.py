@@ -0,0 +1,165 @@
+"""Multi-process batch pricing over shared memory.
+
+``ParallelPricer`` copies the nine input columns into one shared memory
+block, lets a pool of worker processes price a row range each with
+``price_columns`` and write the results straight into output arrays in
+the same block, so rows are never pickled and the only per-task message
+is a block name and a row range. Text columns are parsed to float64 in
+the calling process first (the way the sheet stores its inputs); rows
+that don't parse are priced there from the original values.
+
+Each worker runs under a copy of the caller's Decimal context, so the
+rows that fall back to ``compute_pricing`` see the same precision (28
+digits, set by ``gr24.pricing``) and rounding no matter how the process
+was started.
+"""
+
+import decimal
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+import gr24.pricing  # noqa: F401  (sets the 28-digit Decimal precision)
+from gr24.batch import price_columns
+from gr24.columns import EN_COLS
+from gr24.parsing import parse_float_column, parse_quantity_column
+
+# Rows per task; small enough to balance the load, large enough that the
+# per-task overhead doesn't show
+PARALLEL_CHUNK_ROWS = 250_000
+# Below this many rows a single process is faster than starting the tasks
+PARALLEL_MIN_ROWS = 100_000
+
+
+def _layout(rows: int) -> Tuple[Dict[str, Tuple[int, tuple, type]], int]:
+    """Offset, shape and dtype of each array in a block for ``rows`` rows."""
+    parts = [("quantity", (rows,), np.int64), ("inputs", (8, rows), np.float64),
+             ("outputs", (len(EN_COLS), rows), np.int64), ("valid", (rows,), np.bool_)]
+    layout, offset = {}, 0
+    for name, shape, dtype in parts:
+        layout[name] = (offset, shape, dtype)
+        offset += int(np.prod(shape)) * np.dtype(dtype).itemsize
+    return layout, max(offset, 1)
+
+
+def _views(buf, rows: int) -> Dict[str, np.ndarray]:
+    layout, _ = _layout(rows)
+    return {name: np.ndarray(shape, dtype=dtype, buffer=buf, offset=offset)
+            for name, (offset, shape, dtype) in layout.items()}
+
+
+def _init_worker(context: decimal.Context):
+    decimal.setcontext(context)
+
+
+def _price_range(name: str, rows: int, start: int, stop: int, errors: str, backend: str):
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        views = _views(block.buf, rows)
+        inputs = views["inputs"][:, start:stop]
+        outputs, valid = price_columns(views["quantity"][start:stop], *inputs,
+                                       errors=errors, backend=backend)
+        for i, key in enumerate(EN_COLS):
+            views["outputs"][i, start:stop] = outputs[key]
+        views["valid"][start:stop] = valid
+        # Drop the views before closing, close() fails while they're alive
+        del views, inputs
+    finally:
+        block.close()
+
+
+class ParallelPricer:
+    """Price columns with a pool of ``workers`` processes (default: all CPUs).
+
+    Call it like ``price_columns`` without the backend; use it as a
+    context manager, or call ``close()``, to shut the pool down. The pool
+    is started on first use and reused for every call.
+    """
+
+    def __init__(self, workers: Optional[int] = None, backend: str = "float",
+                 chunk_rows: int = PARALLEL_CHUNK_ROWS):
+        self.workers = workers or os.cpu_count() or 1
+        self.backend = backend
+        self.chunk_rows = chunk_rows
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "ParallelPricer":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             initargs=(decimal.getcontext().copy(),))
+        return self._pool
+
+    def __call__(self, quantity, purchase_price, shipping_costs, packaging_costs,
+                 margin_pct, amazon_pct, ebay_pct, extra_pct, vat_pct,
+                 errors: str = "raise") -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+        raw = [np.asarray(col) for col in (quantity, purchase_price, shipping_costs,
+                                            packaging_costs, margin_pct, amazon_pct, ebay_pct,
+                                            extra_pct, vat_pct)]
+        if len({len(col) for col in raw}) != 1:
+            raise ValueError("input columns must all have the same length")
+        rows = len(raw[0])
+        if self.workers <= 1 or rows < PARALLEL_MIN_ROWS:
+            return price_columns(*raw, errors=errors, backend=self.backend)
+
+        _, size = _layout(rows)
+        block = shared_memory.SharedMemory(create=True, size=size)
+        try:
+            views = _views(block.buf, rows)
+            local = self._load(views, raw)
+            step = max(1, min(self.chunk_rows, -(-rows // self.workers)))
+            tasks = [self._executor().submit(_price_range, block.name, rows, start,
+                                             min(start + step, rows), errors, self.backend)
+                     for start in range(0, rows, step)]
+            for task in tasks:
+                # In row order, so errors="raise" reports the first bad row
+                task.result()
+            outputs = {key: views["outputs"][i].copy() for i, key in enumerate(EN_COLS)}
+            valid = views["valid"].copy()
+            del views
+        finally:
+            block.close()
+            block.unlink()
+
+        if len(local):
+            repaired, valid[local] = price_columns(*(col[local] for col in raw), errors=errors,
+                                                   backend=self.backend)
+            for key in EN_COLS:
+                outputs[key][local] = repaired[key]
+        return outputs, valid
+
+    @staticmethod
+    def _load(views: Dict[str, np.ndarray], raw: List[np.ndarray]) -> np.ndarray:
+        """Fill the input arrays; return the rows to price in this process."""
+        local = np.zeros(len(raw[0]), dtype=bool)
+        if raw[0].dtype.kind in "iu":
+            views["quantity"][:] = raw[0]
+        else:
+            views["quantity"][:], local = parse_quantity_column(raw[0])
+        for i, col in enumerate(raw[1:]):
+            if col.dtype.kind in "iuf":
+                views["inputs"][i] = col
+            else:
+                views["inputs"][i], bad = parse_float_column(col)
+                local |= bad
+        return np.flatnonzero(local)
+
+
+def price_columns_parallel(*columns, errors: str = "raise", backend: str = "float",
+                           workers: Optional[int] = None) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """``price_columns`` spread over ``workers`` processes; see ``ParallelPricer``."""
+    with ParallelPricer(workers=workers, backend=backend) as pricer:
+        return pricer(*columns, errors=errors)
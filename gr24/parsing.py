@@ -0,0 +1,237 @@
+"""Column parsers shared by the batch pricing backends.
+
+Each parser returns the parsed column together with a ``bad`` mask of
+entries a vectorized backend can't reproduce exactly; those rows are left
+to the scalar ``compute_pricing``.
+"""
+
+import math
+import re
+from decimal import Decimal
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Inputs beyond this magnitude (in hundredths) are priced by the scalar path
+MAX_HUNDREDTHS = 2 ** 40
+# Quantities are stored as int64; anything at or beyond this would wrap around
+QUANTITY_LIMIT = 2 ** 63
+
+# Decimal separator of each UI language
+DECIMAL_POINT = {"de": ",", "en": "."}
+# Digit grouping by decimal separator: 1.234,56 (German) and 1,234.56 (English)
+_GROUPED = {
+    ",": re.compile(r"([+-]?\d{1,3}(?:\.\d{3})+)(?:,(\d*))?"),
+    ".": re.compile(r"([+-]?\d{1,3}(?:,\d{3})+)(?:\.(\d*))?"),
+}
+_DECIMAL_COMMA = re.compile(r"[+-]?(?:\d+,\d*|,\d+)")
+
+
+def _blank_mask(obj: np.ndarray, blank_is_zero: bool) -> np.ndarray:
+    # compute_pricing treats "" (and None for the money columns) as 0
+    blank = obj == ""
+    if blank_is_zero:
+        blank |= np.equal(obj, None)
+    return blank
+
+
+def parse_float_column(values, blank_is_zero: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """Parse a column into float64, returning ``(values, bad)``."""
+    arr = np.asarray(values)
+    if arr.dtype.kind in "iuf":
+        num = arr.astype(np.float64)
+    else:
+        obj = arr.astype(object)
+        blank = _blank_mask(obj, blank_is_zero)
+        try:
+            # Python's float() per element; the common case of clean text
+            num = np.where(blank, 0.0, obj).astype(np.float64)
+        except (TypeError, ValueError):
+            import pandas as pd
+
+            num = np.array(pd.to_numeric(pd.Series(obj), errors="coerce"), dtype=np.float64)
+            num[blank] = 0.0
+    bad = ~np.isfinite(num) | (np.abs(num) * 100 >= MAX_HUNDREDTHS)
+    num[bad] = 0.0
+    return num, bad
+
+
+def parse_quantity_column(values) -> Tuple[np.ndarray, np.ndarray]:
+    """Parse the quantity column the way ``int(float(str(q) or 0))`` does."""
+    qty, bad = parse_float_column(values, blank_is_zero=False)
+    # Distrust values that sit right at an integer since the float parse may
+    # have landed on either side of it.
+    nearest = np.round(qty)
+    bad |= (np.abs(qty - nearest) < 1e-9) & (qty != nearest)
+    wide = np.abs(qty) >= QUANTITY_LIMIT
+    qty[wide] = 0.0
+    return np.trunc(qty).astype(np.int64), bad | wide
+
+
+def parse_hundredths_column(values, blank_is_zero: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """Parse a column into exact int64 hundredths (cents or basis points).
+
+    Only values with at most two decimal places are accepted; anything else
+    (more decimals, comma decimals, huge values) is marked bad.
+    """
+    arr = np.asarray(values)
+    if arr.dtype.kind in "iu":
+        num = arr.astype(np.int64)
+        bad = np.abs(num) >= MAX_HUNDREDTHS // 100
+        return np.where(bad, 0, num * 100), bad
+
+    num, bad = parse_float_column(arr, blank_is_zero)
+    scaled = np.round(num * 100)
+    # A float only reprs with <= 2 decimals if it is the double nearest to
+    # scaled / 100. Negative zero reprs as "-0.0", keep it scalar.
+    bad |= (scaled / 100 != num) | np.signbit(num) & (num == 0)
+    if arr.dtype.kind != "f":
+        # Text must spell out at most two decimals, otherwise the float parse
+        # may have rounded away digits that Decimal keeps.
+        obj = arr.astype(object)
+        kind = np.fromiter((type(v) for v in obj), dtype=object, count=len(obj))
+        is_str = kind == str
+        text = np.char.strip(np.where(is_str, obj, "").astype(str))
+        dot = np.char.find(text, ".")
+        decimals = np.where(dot >= 0, np.char.str_len(text) - dot - 1, 0)
+        plain = is_str | (kind == float) | (kind == int) | _blank_mask(obj, blank_is_zero)
+        bad |= (decimals > 2) | ~plain
+    return np.where(bad, 0, scaled).astype(np.int64), bad
+
+
+def parse_number(text, decimal: str = ".") -> float:
+    """Read a number typed into the sheet in a language whose decimal separator is ``decimal``.
+
+    The sheet shows numbers with a decimal dot, so text with a dot and no
+    comma is always read that way ("12.345" is twelve point three four
+    five, in any language). Besides that a decimal comma ("12,5") and the
+    digit grouping of the language ("1.234,56" for ``decimal=","``,
+    "1,234.56" for ".") are accepted, but only where the text can't be
+    read two ways: with a decimal dot, "1,500" could be 1500 or 1.5 and
+    is rejected. A trailing € or % is ignored and blank text is 0. Raises
+    ValueError for anything else.
+    """
+    text = str(text).strip().rstrip("€%").strip()
+    if not text:
+        return 0.0
+    value = None
+    if "," not in text:
+        try:
+            value = float(text)
+        except ValueError:
+            pass  # may still be grouped, e.g. "1.234.567" in German
+    if value is None:
+        readings = set()
+        grouped = _GROUPED[decimal].fullmatch(text) if decimal in _GROUPED else None
+        if grouped:
+            whole, fraction = grouped.groups()
+            readings.add(float(re.sub(r"[.,]", "", whole) + "." + (fraction or "")))
+        if _DECIMAL_COMMA.fullmatch(text):
+            readings.add(float(text.replace(",", ".")))
+        if len(readings) > 1:
+            raise ValueError(f"ambiguous number: {text!r}")
+        if not readings:
+            raise ValueError(f"not a number: {text!r}")
+        value = readings.pop()
+    if not math.isfinite(value):
+        raise ValueError(f"not a finite number: {text!r}")
+    return value
+
+
+def parse_input_cells(cells: np.ndarray, column: int = 0, first_row: int = 1,
+                      decimal: str = ".", flagged: Optional[list] = None,
+                      labels: Optional[Sequence[str]] = None) -> List[np.ndarray]:
+    """Parse a 2-D block of input cell text the way the sheet reads edits.
+
+    ``cells`` holds rows by columns, the first one being input ``column``
+    (0 is quantity). Each cell is read like ``parse_number`` with the
+    decimal separator ``decimal``; quantity is truncated to int64, the
+    rest become float64. Raises ValueError naming the first cell that
+    isn't a finite number (or a quantity beyond int64), with rows
+    numbered from ``first_row`` and columns by ``labels`` if given (else
+    counted from 1). Given a list as ``flagged``, such cells
+    are read as 0 and appended to it as ``(row, column, text)`` instead,
+    with rows counted from 0 at ``first_row - 1``.
+    """
+    columns = []
+    for c in range(cells.shape[1]):
+        obj = cells[:, c].astype(object)
+        try:
+            # Python's float() per element; the common case of dot decimals
+            values = np.where(obj == "", 0.0, obj).astype(np.float64)
+        except (TypeError, ValueError):
+            values = None
+        if values is None:
+            text = np.char.strip(np.char.rstrip(np.char.strip(obj.astype(str)), "€%"))
+            # Cells without a comma, and in German those with just a decimal comma,
+            # are converted at once; grouped or ambiguous ones one by one
+            simple = np.char.find(text, ",") < 0
+            if decimal == ",":
+                simple |= (np.char.count(text, ",") == 1) & (np.char.find(text, ".") < 0)
+            values = np.full(len(text), np.nan)
+            rest = np.flatnonzero(~simple)
+            try:
+                plain = np.char.replace(text[simple], ",", ".")
+                values[simple] = np.where(plain == "", "0", plain).astype(np.float64)
+            except ValueError:
+                rest = np.arange(len(text))
+            for r in rest:
+                try:
+                    values[r] = parse_number(text[r], decimal)
+                except ValueError:
+                    values[r] = np.nan
+        bad = ~np.isfinite(values)
+        if column + c == 0:
+            bad |= np.abs(values) >= QUANTITY_LIMIT
+        bad = np.flatnonzero(bad)
+        if len(bad) and flagged is None:
+            r = bad[0]
+            name = repr(labels[c]) if labels is not None else c + 1
+            raise ValueError(f"row {first_row + r}, column {name}: {cells[r, c]!r}")
+        for r in bad:
+            flagged.append((first_row - 1 + int(r), column + c, str(cells[r, c]).strip()))
+        values[bad] = 0.0
+        columns.append(np.trunc(values).astype(np.int64) if column + c == 0 else values)
+    return columns
+
+
+def to_hundredths(value, blank_is_zero: bool = True) -> Optional[int]:
+    """Scalar counterpart of ``parse_hundredths_column``; None if not exact."""
+    if blank_is_zero and not value and not isinstance(value, float):
+        return 0
+    try:
+        dec = Decimal(str(value))
+    except Exception:
+        return None
+    if not dec.is_finite() or dec.is_signed() and dec == 0:
+        return None
+    scaled = dec.scaleb(2)
+    if scaled != scaled.to_integral_value() or abs(scaled) >= MAX_HUNDREDTHS:
+        return None
+    return int(scaled)
+
+
+def hundredths(value) -> int:
+    """Convert a value returned by compute_pricing to an integer count of hundredths."""
+    if isinstance(value, Decimal):
+        return int(value.scaleb(2))
+    return int(value)
+
+
+def format_hundredths(value: int) -> str:
+    """Format an integer count of hundredths as a two-decimal string."""
+    value = int(value)
+    sign = "-" if value < 0 else ""
+    value = abs(value)
+    return f"{sign}{value // 100}.{value % 100:02d}"
+
+
+def format_hundredths_column(values: np.ndarray) -> np.ndarray:
+    """Vectorized ``format_hundredths`` returning a numpy string array."""
+    values = np.asarray(values, dtype=np.int64)
+    magnitude = np.abs(values)
+    whole = (magnitude // 100).astype(str)
+    frac = np.char.zfill((magnitude % 100).astype(str), 2)
+    sign = np.where(values < 0, "-", "")
+    return np.char.add(np.char.add(sign, whole), np.char.add(".", frac))
+
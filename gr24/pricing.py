@@ -0,0 +1,56 @@
+"""Scalar Decimal pricing, the reference for every other pricing path."""
+
+from decimal import Decimal, ROUND_HALF_UP, getcontext
+
+getcontext().prec = 28
+D = lambda x: Decimal(str(x))
+Q2 = Decimal("0.01")
+
+def money(x: Decimal) -> Decimal:
+    return x.quantize(Q2, rounding=ROUND_HALF_UP)
+
+def compute_pricing(quantity, purchase_price, shipping_costs, packaging_costs,
+                    margin_pct, amazon_pct, ebay_pct, extra_pct, vat_pct):
+
+    quantity      = int(float(str(quantity) or 0))
+    purchase      = D(str(purchase_price or 0))
+    shipping      = D(str(shipping_costs or 0))
+    packaging     = D(str(packaging_costs or 0))
+    margin_pct    = D(str(margin_pct or 0)) / 100
+    amazon_pct    = D(str(amazon_pct or 0)) / 100
+    ebay_pct      = D(str(ebay_pct or 0)) / 100
+    extra_pct     = D(str(extra_pct or 0)) / 100
+    vat_pct       = D(str(vat_pct or 0)) / 100
+
+    base_cost = purchase + shipping + packaging
+    profit_unit = purchase * margin_pct
+    total_costs_unit = base_cost + profit_unit
+
+    total_pct = amazon_pct + ebay_pct + extra_pct + vat_pct
+    denominator = (Decimal(1) - total_pct) if (Decimal(1) - total_pct) != 0 else Decimal(1)
+    selling_price_unit = total_costs_unit / denominator
+
+    total_tax_unit   = selling_price_unit * vat_pct
+    amazon_fee_unit  = selling_price_unit * amazon_pct
+    ebay_fee_unit    = selling_price_unit * ebay_pct
+    extra_fee_unit   = selling_price_unit * extra_pct
+
+    out_unit = {
+        "Quantity": quantity,
+        "Purchase Price (€)": money(purchase),
+        "Shipping Costs (€)": money(shipping),
+        "Packaging Costs (€)": money(packaging),
+        "Margin (%)": money(margin_pct * 100),
+        "Amazon Fees (%)": money(amazon_pct * 100),
+        "eBay Fees (%)": money(ebay_pct * 100),
+        "Additional Costs / Advertising Costs (%)": money(extra_pct * 100),
+        "VAT (%)": money(vat_pct * 100),
+        "Profit (€)": money(profit_unit),
+        "Total Tax (€)": money(total_tax_unit),
+        "Total Costs (€)": money(total_costs_unit),
+        "Total Amazon Fees (€)": money(amazon_fee_unit),
+        "Total eBay Fees (€)": money(ebay_fee_unit),
+        "Total Additional Costs / Advertising Costs (€)": money(extra_fee_unit),
+        "Selling Price (€)": money(selling_price_unit),
+    }
+    return out_unit
@@ -0,0 +1,260 @@
+"""Project files.
+
+Two formats are written:
+
+* ``.gr24``, the columnar project format: a 64-byte header followed by
+  the typed input columns as raw little-endian arrays (quantity int64,
+  then the eight other inputs float64). Outputs are not stored, they are
+  derived. Opening memory-maps the columns copy-on-write, so only the
+  pages that are actually read are loaded and edits never reach the file.
+  Since version 2 the cells flagged as not a number follow the columns,
+  as a JSON list of ``[row, column, text]``.
+* JSON, ``{"language": ..., "rows": [[16 strings], ...]}`` with the cells
+  as displayed, indented like ``json.dump(..., indent=2)``. It is written
+  a chunk of rows at a time from the typed columns, and read back the same
+  way: only the nine input cells of each row are kept, as typed columns.
+  Flagged cells are written with their text and come back flagged.
+
+Flagged cells are passed around as ``(row, column, text)`` tuples, as
+returned by ``PricingTableModel.invalid_cells``.
+"""
+
+import json
+import os
+import re
+import struct
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from gr24.columns import INPUT_COLS_IDX
+from gr24.parsing import DECIMAL_POINT, format_hundredths_column, parse_input_cells
+
+SAVE_CHUNK_ROWS = 10_000
+LOAD_CHUNK_BYTES = 4 << 20
+
+PROJECT_MAGIC = b"GR24COLS"
+PROJECT_VERSION = 2
+PROJECT_EXTENSION = ".gr24"
+# magic, version, language, row count, size of the flagged cells (0 in
+# version 1); data starts at _DATA_OFFSET
+_HEADER = struct.Struct("<8sI2s2xQQ")
+_DATA_OFFSET = 64
+
+Progress = Callable[[int, int], None]
+
+
+def format_input_column(values: np.ndarray) -> np.ndarray:
+    """Vectorized ``gr24.model.format_input`` returning an object array."""
+    values = np.asarray(values, dtype=np.float64)
+    text = np.char.mod("%.2f", values).astype(object)
+    with np.errstate(invalid="ignore", over="ignore"):
+        two_decimals = (np.abs(values) < 1e13) & (np.round(values * 100) / 100 == values)
+    for i in np.flatnonzero(~two_decimals):
+        text[i] = repr(float(values[i]))
+    return text
+
+
+def row_text_columns(columns: Sequence[np.ndarray], priced: np.ndarray) -> list:
+    """The sixteen sheet columns as display text (object arrays)."""
+    text = [np.asarray(columns[0], dtype=np.int64).astype(str).astype(object)]
+    text += [format_input_column(col) for col in columns[1:9]]
+    for col in columns[9:]:
+        text.append(np.where(priced, format_hundredths_column(col).astype(object), ""))
+    return text
+
+
+def write_json(path, language: str, columns: Sequence[np.ndarray], priced: np.ndarray,
+               chunk_rows: int = SAVE_CHUNK_ROWS, progress: Optional[Progress] = None,
+               flagged: Sequence[Tuple[int, int, str]] = ()):
+    """Write the sheet in the JSON save format.
+
+    ``columns`` and ``priced`` are as returned by ``PricingTableModel.sheet_columns``;
+    the ``flagged`` cells are written with their text.
+    ``progress(done, total)`` is called after every chunk.
+    """
+    n = len(priced)
+    by_chunk = {}
+    for row, column, text in flagged:
+        by_chunk.setdefault(row // chunk_rows, []).append((row, column, text))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{\n  "language": %s,\n  "rows": [' % json.dumps(language, ensure_ascii=False))
+        for start in range(0, n, chunk_rows):
+            stop = min(start + chunk_rows, n)
+            cells = row_text_columns([col[start:stop] for col in columns], priced[start:stop])
+            for row, column, text in by_chunk.get(start // chunk_rows, ()):
+                cells[column][row - start] = json.dumps(text, ensure_ascii=False)[1:-1]
+            rows = '\n    [\n      "' + cells[0]
+            for col in cells[1:]:
+                rows = rows + '",\n      "' + col
+            rows = rows + '"\n    ]'
+            f.write(("," if start else "") + ",".join(rows.tolist()))
+            if progress is not None:
+                progress(stop, n)
+        f.write("\n  ]\n}" if n else "]\n}")
+
+
+def write_project(path, language: str, inputs: Sequence[np.ndarray],
+                  progress: Optional[Progress] = None,
+                  flagged: Sequence[Tuple[int, int, str]] = ()):
+    """Write the nine typed input columns (quantity first) as a ``.gr24`` project.
+
+    The ``flagged`` cells are stored after the columns.
+    """
+    n = len(inputs[0])
+    flags = b""
+    if flagged:
+        flags = json.dumps([list(cell) for cell in flagged], ensure_ascii=False).encode("utf-8")
+    with open(path, "wb") as f:
+        header = _HEADER.pack(PROJECT_MAGIC, PROJECT_VERSION, language.encode("ascii")[:2], n,
+                              len(flags))
+        f.write(header.ljust(_DATA_OFFSET, b"\0"))
+        for c, col in enumerate(inputs):
+            np.ascontiguousarray(col, dtype="<i8" if c == 0 else "<f8").tofile(f)
+            if progress is not None:
+                progress((c + 1) * n // len(inputs), n)
+        f.write(flags)
+
+
+def read_project(path) -> Tuple[str, np.ndarray, np.ndarray, List[Tuple[int, int, str]]]:
+    """Open a ``.gr24`` project as ``(language, quantity, inputs, flagged)``.
+
+    ``quantity`` has shape (rows,) and ``inputs`` (8, rows); both are
+    copy-on-write memory maps of the file. ``flagged`` lists the cells
+    flagged as not a number. Raises ValueError if the file isn't a
+    project this version can read.
+    """
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ValueError("not a GR24 project file")
+    magic, version, language, n, flag_bytes = _HEADER.unpack(header)
+    if magic != PROJECT_MAGIC:
+        raise ValueError("not a GR24 project file")
+    if version not in (1, PROJECT_VERSION):
+        raise ValueError(f"unsupported project version {version}")
+    data_bytes = 9 * 8 * n
+    if os.path.getsize(path) != _DATA_OFFSET + data_bytes + flag_bytes:
+        raise ValueError("project file is truncated or corrupt")
+    language = language.decode("ascii", "replace")
+    flagged = []
+    if flag_bytes:
+        with open(path, "rb") as f:
+            f.seek(_DATA_OFFSET + data_bytes)
+            try:
+                flagged = [(int(row), int(column), str(text))
+                           for row, column, text in json.loads(f.read(flag_bytes).decode("utf-8"))]
+            except (TypeError, ValueError) as e:
+                raise ValueError("project file is truncated or corrupt") from e
+        if any(not (0 <= row < n and column in INPUT_COLS_IDX) for row, column, _ in flagged):
+            raise ValueError("project file is truncated or corrupt")
+    if n == 0:
+        return language, np.zeros(0, dtype=np.int64), np.zeros((8, 0), dtype=np.float64), flagged
+    quantity = np.memmap(path, dtype="<i8", mode="c", offset=_DATA_OFFSET, shape=(n,))
+    inputs = np.memmap(path, dtype="<f8", mode="c", offset=_DATA_OFFSET + 8 * n, shape=(8, n))
+    return language, quantity, inputs, flagged
+
+
+_ROWS_KEY = re.compile(r'"rows"\s*:\s*\[')
+_LANGUAGE_KEY = re.compile(r'"language"\s*:\s*"([^"]*)"')
+# Whitespace and the comma before the next row
+_ROW_GAP = re.compile(r"\s*(?:,\s*)?")
+_DECODER = json.JSONDecoder()
+
+
+def _split_rows(buffer: str) -> Tuple[list, int, bool]:
+    """Decode the complete row arrays at the start of ``buffer``.
+
+    Returns ``(rows, pos, closed)``: the rows, where the rest of the buffer
+    starts and whether the rows array is closed there. Every row is read
+    by the JSON decoder, so brackets and commas in cell text are never
+    taken for the end of a row. A row that doesn't decode is left in the
+    rest, as it may just be cut short by the end of the buffer.
+    """
+    rows = []
+    pos = 0
+    while True:
+        start = _ROW_GAP.match(buffer, pos).end()
+        if start == len(buffer):
+            return rows, pos, False
+        if buffer[start] == "]":
+            return rows, start, True
+        try:
+            row, pos = _DECODER.raw_decode(buffer, start)
+        except json.JSONDecodeError:
+            return rows, pos, False
+        rows.append(row)
+
+
+def _rows_to_columns(rows: list, first_row: int, decimal: str, flagged: list) -> List[np.ndarray]:
+    width = len(INPUT_COLS_IDX)
+    for r, row in enumerate(rows):
+        if not isinstance(row, list) or len(row) < width:
+            raise ValueError(f"row {first_row + r} has fewer than {width} cells")
+    cells = np.empty((len(rows), width), dtype=object)
+    cells[:] = [row[:width] for row in rows]
+    return parse_input_cells(cells, first_row=first_row, decimal=decimal, flagged=flagged)
+
+
+def read_json(path, chunk_bytes: int = LOAD_CHUNK_BYTES
+              ) -> Tuple[str, List[np.ndarray], List[Tuple[int, int, str]]]:
+    """Read a JSON save file as ``(language, nine typed input columns, flagged)``.
+
+    The file is read ``chunk_bytes`` at a time and the complete rows of
+    each chunk are converted column-wise, so only the typed columns are
+    kept for the whole file. Cells are read like sheet edits in the file's
+    language; those that aren't numbers are read as 0 and listed in
+    ``flagged``. A file that names its language only after the rows is
+    read a second time. Raises ValueError if the file isn't a save file.
+    """
+    language, columns, flagged, decimal = _read_json(path, chunk_bytes)
+    if DECIMAL_POINT.get(language, ".") != decimal:
+        language, columns, flagged, _ = _read_json(path, chunk_bytes,
+                                                   DECIMAL_POINT.get(language, "."))
+    return language, columns, flagged
+
+
+def _read_json(path, chunk_bytes: int, decimal: Optional[str] = None):
+    chunks: List[List[np.ndarray]] = []
+    flagged: List[Tuple[int, int, str]] = []
+    loaded = 0
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = f.read(chunk_bytes)
+        head = _ROWS_KEY.search(buffer)
+        while head is None:
+            more = f.read(chunk_bytes)
+            if not more:
+                raise ValueError("not a GR24 save file: no rows")
+            buffer += more
+            head = _ROWS_KEY.search(buffer)
+        found = _LANGUAGE_KEY.search(buffer, 0, head.start())
+        language = found.group(1) if found else ""
+        if decimal is None:
+            decimal = DECIMAL_POINT.get(language, ".")
+        buffer = buffer[head.end():]
+        at_end = False
+        while True:
+            rows, pos, closed = _split_rows(buffer)
+            buffer = buffer[pos:]
+            if rows:
+                chunks.append(_rows_to_columns(rows, loaded + 1, decimal, flagged))
+                loaded += len(rows)
+            if closed:
+                break
+            if at_end:
+                try:
+                    _DECODER.raw_decode(buffer, _ROW_GAP.match(buffer).end())
+                    reason = "the rows are not closed"
+                except json.JSONDecodeError as e:
+                    reason = e.msg
+                raise ValueError(f"malformed rows after row {loaded}: {reason}")
+            more = f.read(chunk_bytes)
+            at_end = not more
+            buffer += more
+        if not found:
+            found = _LANGUAGE_KEY.search(buffer + f.read())
+            language = found.group(1) if found else ""
+    if not chunks:
+        empty = [np.zeros(0, dtype=np.int64)] + [np.zeros(0)] * (len(INPUT_COLS_IDX) - 1)
+        return language, empty, flagged, decimal
+    return language, [np.concatenate(cols) for cols in zip(*chunks)], flagged, decimal
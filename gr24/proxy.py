@@ -0,0 +1,283 @@
+"""Sorting and filtering of the pricing sheet on numeric keys.
+
+``NumericSortFilterProxy`` sits between ``PricingTableModel`` and the
+view. Sort keys and filter values are read straight from the model's
+typed columns (``column_values``), so ``9.00`` sorts before ``100.00``
+and no cell text is ever parsed. A sort is one stable ``argsort``
+over the visible rows.
+
+While neither sorted nor filtered the proxy passes rows straight
+through. Otherwise it keeps the source row of each proxy row, and, for
+each source row, its proxy row. When rows are edited, repriced,
+inserted or removed, only those rows are re-evaluated: each one that
+enters, leaves or changes place is inserted, removed or moved on its
+own, which keeps the current cell and selection. Batches larger than
+``INCREMENTAL_ROWS`` reset the proxy instead.
+"""
+
+from typing import List, Optional
+
+import numpy as np
+from PySide6.QtCore import QAbstractProxyModel, QModelIndex, Qt
+
+from gr24.filters import Condition, filter_mask, parse_filter
+
+# Changes touching more rows than this rebuild the mapping in one reset
+INCREMENTAL_ROWS = 32
+
+
+class NumericSortFilterProxy(QAbstractProxyModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._column = -1
+        self._order = Qt.AscendingOrder
+        self._conditions: List[Condition] = []
+        # proxy row -> source row; None while neither sorted nor filtered
+        self._map: Optional[np.ndarray] = None
+        # source row -> proxy row, -1 for rows filtered out
+        self._pos: Optional[np.ndarray] = None
+        # sort key of each proxy row, ascending in proxy order (see _sort_keys)
+        self._keys: Optional[np.ndarray] = None
+        self._resetting = False
+
+    def setSourceModel(self, model):
+        self.beginResetModel()
+        super().setSourceModel(model)
+        model.modelAboutToBeReset.connect(self.beginResetModel)
+        model.modelReset.connect(self._on_reset)
+        model.rowsAboutToBeInserted.connect(self._on_rows_about_to_be_inserted)
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.rowsAboutToBeRemoved.connect(self._on_rows_about_to_be_removed)
+        model.rowsRemoved.connect(self._on_rows_removed)
+        model.dataChanged.connect(self._on_data_changed)
+        model.headerDataChanged.connect(self.headerDataChanged)
+        self._rebuild()
+        self.endResetModel()
+
+    # ---- Sorting and filtering ----
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        """Sort by ``column`` (-1 for source order); rows with no value go last either way."""
+        if (column, order) == (self._column, self._order):
+            return  # the mapping is kept sorted as rows change
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        sources = [self.mapToSource(index) for index in persistent]
+        self._column, self._order = column, order
+        self._rebuild()
+        self.changePersistentIndexList(persistent, [self.mapFromSource(index) for index in sources])
+        self.layoutChanged.emit()
+
+    def set_filter(self, text: str):
+        """Show only rows matching ``text`` (see ``gr24.filters``); raises ValueError if invalid."""
+        conditions = parse_filter(text)
+        if conditions == self._conditions:
+            return
+        self.beginResetModel()
+        self._conditions = conditions
+        self._rebuild()
+        self.endResetModel()
+
+    def _sort_keys(self, rows) -> np.ndarray:
+        # Negated for descending so keys always ascend; NaN (no value) becomes +inf to sort last
+        keys = self.sourceModel().column_values(self._column, rows)
+        if self._order == Qt.DescendingOrder:
+            keys = -keys
+        keys[np.isnan(keys)] = np.inf
+        return keys
+
+    def _matches(self, rows) -> np.ndarray:
+        model = self.sourceModel()
+        return filter_mask(self._conditions, lambda column: model.column_values(column, rows))
+
+    def _rebuild(self):
+        n = self.sourceModel().rowCount()
+        if self._column < 0 and not self._conditions:
+            self._map = self._pos = self._keys = None
+            return
+        rows = np.flatnonzero(self._matches(slice(None))) if self._conditions else np.arange(n)
+        self._keys = None
+        if self._column >= 0:
+            keys = self._sort_keys(rows)
+            order = np.argsort(keys, kind="stable")
+            rows, self._keys = rows[order], keys[order]
+        self._map = rows
+        self._pos = np.full(n, -1, dtype=np.int64)
+        self._pos[rows] = np.arange(len(rows))
+
+    def _reset(self):
+        self.beginResetModel()
+        self._rebuild()
+        self.endResetModel()
+
+    # ---- Incremental updates ----
+    def _position(self, mapping: np.ndarray, keys: Optional[np.ndarray], row: int, key) -> int:
+        """Proxy row ``row`` belongs at in ``mapping``; equal keys keep source order."""
+        if keys is None:
+            return int(np.searchsorted(mapping, row))
+        lo = int(np.searchsorted(keys, key, side="left"))
+        hi = int(np.searchsorted(keys, key, side="right"))
+        return lo + int(np.searchsorted(mapping[lo:hi], row))
+
+    def _remove_at(self, p: int):
+        self.beginRemoveRows(QModelIndex(), p, p)
+        self._pos[self._map[p]] = -1
+        self._map = np.delete(self._map, p)
+        if self._keys is not None:
+            self._keys = np.delete(self._keys, p)
+        self._pos[self._map[p:]] -= 1
+        self.endRemoveRows()
+
+    def _insert(self, row: int, key):
+        p = self._position(self._map, self._keys, row, key)
+        self.beginInsertRows(QModelIndex(), p, p)
+        self._map = np.insert(self._map, p, row)
+        if self._keys is not None:
+            self._keys = np.insert(self._keys, p, key)
+        self._pos[self._map[p + 1:]] += 1
+        self._pos[row] = p
+        self.endInsertRows()
+
+    def _move(self, p: int, key):
+        row = int(self._map[p])
+        mapping, keys = np.delete(self._map, p), np.delete(self._keys, p)
+        q = self._position(mapping, keys, row, key)
+        if q == p:
+            self._keys[p] = key
+            return
+        # Qt wants the destination counted before the row is taken out
+        self.beginMoveRows(QModelIndex(), p, p, QModelIndex(), q + 1 if q > p else q)
+        self._map, self._keys = np.insert(mapping, q, row), np.insert(keys, q, key)
+        lo, hi = min(p, q), max(p, q) + 1
+        self._pos[self._map[lo:hi]] = np.arange(lo, hi)
+        self.endMoveRows()
+
+    def _update_rows(self, rows: np.ndarray):
+        """Re-evaluate filter and sort key of source ``rows`` (sorted, unique)."""
+        keep = self._matches(rows) if self._conditions else np.ones(len(rows), dtype=bool)
+        pos = self._pos[rows]
+        shown = pos >= 0
+        changed = shown != keep
+        keys = None
+        if self._keys is not None:
+            keys = self._sort_keys(rows)
+            stay = np.flatnonzero(shown & keep)
+            changed[stay] = self._keys[pos[stay]] != keys[stay]
+        changed = np.flatnonzero(changed)
+        if len(changed) > INCREMENTAL_ROWS:
+            self._reset()
+            return
+        for i in changed:
+            row, key = int(rows[i]), None if keys is None else keys[i]
+            p = int(self._pos[row])
+            if p >= 0 and keep[i]:
+                self._move(p, key)
+            elif p >= 0:
+                self._remove_at(p)
+            else:
+                self._insert(row, key)
+
+    def _on_reset(self):
+        self._rebuild()
+        self.endResetModel()
+
+    def _on_rows_about_to_be_inserted(self, parent: QModelIndex, first: int, last: int):
+        if self._map is None:
+            self.beginInsertRows(QModelIndex(), first, last)
+
+    def _on_rows_inserted(self, parent: QModelIndex, first: int, last: int):
+        if self._map is None:
+            self.endInsertRows()
+            return
+        count = last - first + 1
+        self._map[self._map >= first] += count
+        self._pos = np.concatenate([self._pos[:first], np.full(count, -1, dtype=np.int64),
+                                    self._pos[first:]])
+        self._update_rows(np.arange(first, last + 1))
+
+    def _on_rows_about_to_be_removed(self, parent: QModelIndex, first: int, last: int):
+        if self._map is None:
+            self.beginRemoveRows(QModelIndex(), first, last)
+            return
+        shown = self._pos[first:last + 1]
+        shown = np.sort(shown[shown >= 0])[::-1]
+        if len(shown) > INCREMENTAL_ROWS:
+            self._resetting = True
+            self.beginResetModel()
+            return
+        for p in shown:
+            self._remove_at(int(p))
+
+    def _on_rows_removed(self, parent: QModelIndex, first: int, last: int):
+        if self._map is None:
+            self.endRemoveRows()
+            return
+        if self._resetting:
+            self._resetting = False
+            self._on_reset()
+            return
+        self._pos = np.concatenate([self._pos[:first], self._pos[last + 1:]])
+        self._map[self._map > last] -= last - first + 1
+
+    def _on_data_changed(self, top_left: QModelIndex, bottom_right: QModelIndex, roles=()):
+        first, last = top_left.row(), bottom_right.row()
+        left, right = top_left.column(), bottom_right.column()
+        if self._map is None:
+            # Same rows as the source, so no bounds checks through index()
+            self.dataChanged.emit(self.createIndex(first, left), self.createIndex(last, right),
+                                  roles)
+            return
+        rows = np.arange(first, last + 1)
+        watched = {c.column for c in self._conditions} | {self._column}
+        if any(left <= c <= right for c in watched):
+            self._update_rows(rows)
+        shown = self._pos[rows]
+        shown = shown[shown >= 0]
+        if len(shown):
+            self.dataChanged.emit(self.index(int(shown.min()), left),
+                                  self.index(int(shown.max()), right), roles)
+
+    # ---- Qt proxy interface ----
+    def mapToSource(self, index: QModelIndex) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        row = index.row() if self._map is None else int(self._map[index.row()])
+        return self.sourceModel().index(row, index.column())
+
+    def source_rows(self, row: int, count: int) -> np.ndarray:
+        """Source rows of the (at most ``count``) visible rows from proxy row ``row`` on."""
+        stop = min(row + count, self.rowCount())
+        if self._map is None:
+            return np.arange(row, max(row, stop), dtype=np.int64)
+        return np.asarray(self._map[row:stop], dtype=np.int64)
+
+    def mapFromSource(self, index: QModelIndex) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        row = index.row() if self._map is None else int(self._pos[index.row()])
+        return self.createIndex(row, index.column()) if row >= 0 else QModelIndex()
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        if parent.isValid() or not (0 <= row < self.rowCount() and 0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index: QModelIndex = None):
+        if index is None:
+            return super().parent()  # QObject.parent()
+        return QModelIndex()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return self.sourceModel().rowCount() if self._map is None else len(self._map)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.sourceModel().columnCount()
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and self.rowCount() > 0
+
+    def headerData(self, section: int, orientation, role: int = Qt.DisplayRole):
+        if orientation == Qt.Horizontal:
+            return self.sourceModel().headerData(section, orientation, role)
+        return None
@@ -0,0 +1,93 @@
+"""Repricing on a background thread.
+
+``BackgroundRepricer.submit`` copies the inputs of the rows together with
+their versions and prices the copy on a worker thread. Results come back
+in submission order through a signal, on the GUI thread, and are applied
+with ``PricingTableModel.apply_outputs``, which skips rows edited since.
+Until then the rows stay stale, so any that get painted are priced on the
+spot, and saving or exporting prices whatever is still missing itself.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+import numpy as np
+from PySide6.QtCore import QObject, Signal
+
+
+class RepriceSignals(QObject):
+    priced = Signal(object)       # (generation, rows, versions, outputs, valid)
+
+
+class BackgroundRepricer(QObject):
+    """Price rows of ``model`` with ``pricer(columns) -> (outputs, valid)`` off the GUI thread."""
+
+    def __init__(self, model, pricer: Callable, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self._pricer = pricer
+        # One worker, so results arrive in the order they were asked for
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gr24-reprice")
+        self._generation = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self.signals = RepriceSignals()
+        self.signals.priced.connect(self._on_priced)
+        # A reset replaces every row, work for the old ones is dropped
+        model.modelReset.connect(self.cancel)
+
+    def submit(self, rows):
+        """Reprice ``rows`` (a slice or index array) in the background."""
+        if isinstance(rows, slice):
+            rows = np.arange(*rows.indices(self.model.rowCount()))
+        rows = np.asarray(rows, dtype=np.int64)
+        if not len(rows):
+            return
+        columns = self.model.input_columns(rows)  # fancy indexing copies
+        versions = self.model.row_versions(rows)
+        with self._lock:
+            self._pending += 1
+        self._pool.submit(self._run, self._generation, rows, versions, columns)
+
+    def submit_stale(self, chunk_rows: int = 65536):
+        """Reprice every stale row of the model, ``chunk_rows`` at a time."""
+        rows = self.model.stale_rows()
+        for start in range(0, len(rows), chunk_rows):
+            self.submit(rows[start:start + chunk_rows])
+
+    def pending(self) -> int:
+        """Submitted batches whose results haven't been applied yet."""
+        with self._lock:
+            return self._pending
+
+    def cancel(self):
+        """Drop every submitted batch; ones already running are discarded when they finish."""
+        self._generation += 1
+
+    def close(self):
+        """Drop the queued batches and wait for the running one."""
+        self.cancel()
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def _run(self, generation: int, rows, versions, columns):
+        if generation != self._generation:
+            self._done()
+            return
+        try:
+            outputs, valid = self._pricer(columns)
+        except Exception:
+            # The rows stay stale and are priced when next read
+            self._done()
+            return
+        self.signals.priced.emit((generation, rows, versions, outputs, valid))
+
+    def _done(self):
+        with self._lock:
+            self._pending -= 1
+
+    def _on_priced(self, result):
+        generation, rows, versions, outputs, valid = result
+        self._done()
+        if generation == self._generation:
+            self.model.apply_outputs(rows, versions, outputs, valid)
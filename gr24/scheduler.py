@@ -0,0 +1,63 @@
+"""Debounced recompute of edited rows.
+
+Edits only mark their row dirty. A short single-shot timer collects the
+burst, then every dirty row is repriced in one batch with one view update.
+Dirty row numbers follow row inserts and removals on the model, so a
+pending recompute always lands on the row that was edited.
+"""
+
+from typing import Callable, Set
+
+import numpy as np
+from PySide6.QtCore import QModelIndex, QObject, QTimer
+
+RECOMPUTE_DELAY_MS = 20
+
+
+class RecomputeScheduler(QObject):
+    """Collect dirty rows of ``model`` and hand them to ``reprice`` in bulk.
+
+    ``reprice`` receives a sorted int64 array of row numbers.
+    """
+
+    def __init__(self, model, reprice: Callable[[np.ndarray], None],
+                 delay_ms: int = RECOMPUTE_DELAY_MS, parent=None):
+        super().__init__(parent)
+        self._reprice = reprice
+        self._dirty: Set[int] = set()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self.flush)
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.rowsRemoved.connect(self._on_rows_removed)
+        model.modelReset.connect(self.cancel)
+
+    def mark(self, row: int):
+        """Mark ``row`` dirty and (re)start the debounce timer."""
+        self._dirty.add(row)
+        self._timer.start()
+
+    def pending(self) -> int:
+        return len(self._dirty)
+
+    def flush(self):
+        """Reprice every dirty row now."""
+        self._timer.stop()
+        if not self._dirty:
+            return
+        rows = np.array(sorted(self._dirty), dtype=np.int64)
+        self._dirty.clear()
+        self._reprice(rows)
+
+    def cancel(self):
+        self._timer.stop()
+        self._dirty.clear()
+
+    def _on_rows_inserted(self, parent: QModelIndex, first: int, last: int):
+        count = last - first + 1
+        self._dirty = {r + count if r >= first else r for r in self._dirty}
+
+    def _on_rows_removed(self, parent: QModelIndex, first: int, last: int):
+        count = last - first + 1
+        self._dirty = {r - count if r > last else r for r in self._dirty if not first <= r <= last}
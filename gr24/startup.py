@@ -0,0 +1,68 @@
+"""Startup timing for the GUI entry point.
+
+Set ``GR24_STARTUP_TIMING=1`` to print the import, window and first-paint
+milestones to stderr, measured from the moment the entry module started
+loading. ``GR24_STARTUP_TIMING=exit`` also quits right after the first
+paint, with exit status 1 if time-to-interactive exceeded the budget
+(``STARTUP_BUDGET_S``, or ``GR24_STARTUP_BUDGET`` in seconds), so packaged
+builds can be checked from a script.
+"""
+
+import os
+import sys
+import time
+from typing import List, Optional, Tuple
+
+from PySide6.QtCore import QEvent, QObject, QTimer
+from PySide6.QtWidgets import QApplication
+
+STARTUP_BUDGET_S = 1.5
+
+
+class StartupTimer(QObject):
+    def __init__(self, started: float, exit_after_paint: bool = False, budget: float = STARTUP_BUDGET_S):
+        super().__init__()
+        self.started = started
+        self.exit_after_paint = exit_after_paint
+        self.budget = budget
+        self.marks: List[Tuple[str, float]] = []
+        self._watched = None
+
+    @classmethod
+    def from_env(cls, started: float) -> Optional["StartupTimer"]:
+        """A timer configured from the environment, or None when timing is off."""
+        mode = os.environ.get("GR24_STARTUP_TIMING", "")
+        if not mode or mode == "0":
+            return None
+        budget = float(os.environ.get("GR24_STARTUP_BUDGET", STARTUP_BUDGET_S))
+        return cls(started, exit_after_paint=mode == "exit", budget=budget)
+
+    def mark(self, name: str, at: Optional[float] = None):
+        self.marks.append((name, (time.perf_counter() if at is None else at) - self.started))
+
+    def watch_first_paint(self, widget):
+        """Mark "first paint" once ``widget`` has painted, then report."""
+        self._watched = widget
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event) -> bool:
+        if obj is self._watched and event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            self._watched = None
+            # Runs once the paint event itself has been handled
+            QTimer.singleShot(0, self._painted)
+        return False
+
+    def _painted(self):
+        self.mark("first paint")
+        print(self.report(), file=sys.stderr)
+        if self.exit_after_paint:
+            QApplication.exit(0 if self.within_budget() else 1)
+
+    def within_budget(self) -> bool:
+        return bool(self.marks) and self.marks[-1][1] <= self.budget
+
+    def report(self) -> str:
+        steps = ", ".join(f"{name} {at:.3f}s" for name, at in self.marks)
+        verdict = "within" if self.within_budget() else "OVER"
+        return f"startup: {steps} ({verdict} {self.budget:.2f}s budget)"
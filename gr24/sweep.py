@@ -0,0 +1,174 @@
+"""Scenario sweeps: price a catalog under every combination of a parameter grid.
+
+A grid maps parameters (margin, fees, VAT, shipping, packaging) to the
+values to try; every combination is one scenario in which those inputs
+replace the catalog's own for all rows. Scenarios are priced in blocks:
+the catalog columns are tiled once per scenario in the block and priced
+with a single ``price_columns`` call, so the work is vectorized over both
+rows and scenarios. Large sweeps are split across a process pool. Each
+scenario is reduced to summary statistics; ``iter_sweep`` also exposes
+the priced rows for long-format output.
+"""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from gr24.batch import price_columns
+
+# Sweepable parameters and the input column each one replaces
+SWEEP_PARAMS = {
+    "shipping": 2,
+    "packaging": 3,
+    "margin": 4,
+    "amazon": 5,
+    "ebay": 6,
+    "extra": 7,
+    "vat": 8,
+}
+# Rows x scenarios priced per price_columns call
+SWEEP_BLOCK_CELLS = 1_000_000
+# Sweeps at least this large (rows x scenarios) go to a process pool
+POOL_MIN_CELLS = 20_000_000
+
+SUMMARY_STATS = ["rows", "valid", "selling_mean", "selling_min", "selling_max",
+                 "revenue", "profit", "fees", "tax"]
+
+_FEE_KEYS = ["Total Amazon Fees (€)", "Total eBay Fees (€)",
+             "Total Additional Costs / Advertising Costs (€)"]
+
+
+def parse_values(spec: str) -> List[float]:
+    """Parse ``"10:40:1"`` (inclusive range with step) or ``"7,19"`` (list) into values."""
+    spec = spec.strip()
+    if ":" in spec:
+        parts = [Decimal(p.strip()) for p in spec.split(":")]
+        if len(parts) != 3 or parts[2] <= 0:
+            raise ValueError(f"expected start:stop:step with a positive step, got {spec!r}")
+        start, stop, step = parts
+        count = int((stop - start) // step) + 1
+        return [float(start + i * step) for i in range(max(count, 0))]
+    return [float(Decimal(p.strip())) for p in spec.split(",") if p.strip()]
+
+
+def scenario_grid(grid: Dict[str, Sequence[float]]) -> Tuple[List[str], np.ndarray]:
+    """Return the parameter names and every combination, shape (scenarios, params)."""
+    names = list(grid)
+    unknown = [name for name in names if name not in SWEEP_PARAMS]
+    if unknown:
+        raise ValueError(f"unknown sweep parameters {unknown}; expected {list(SWEEP_PARAMS)}")
+    scenarios = np.array(list(itertools.product(*(grid[name] for name in names))),
+                         dtype=np.float64).reshape(-1, len(names))
+    return names, scenarios
+
+
+def _block_size(rows: int, block_cells: int) -> int:
+    return max(1, block_cells // max(rows, 1))
+
+
+def _price_block(catalog: Sequence[np.ndarray], names: Sequence[str], block: np.ndarray,
+                 backend: str):
+    rows = len(catalog[0])
+    columns = [np.tile(col, len(block)) for col in catalog]
+    for j, name in enumerate(names):
+        columns[SWEEP_PARAMS[name]] = np.repeat(block[:, j], rows)
+    return price_columns(*columns, errors="coerce", backend=backend)
+
+
+def _summarize(catalog: Sequence[np.ndarray], outputs: Dict[str, np.ndarray], valid: np.ndarray,
+               scenarios: int) -> Dict[str, np.ndarray]:
+    """Per-scenario statistics in euros; totals are weighted by quantity."""
+    shape = (scenarios, len(catalog[0]))
+    ok = valid.reshape(shape)
+    count = ok.sum(axis=1)
+    quantity = np.where(ok, catalog[0][None, :], 0)
+    selling = outputs["Selling Price (€)"].reshape(shape)
+
+    def total(key: str) -> np.ndarray:
+        return (quantity * outputs[key].reshape(shape)).sum(axis=1) / 100
+
+    lowest = np.where(ok, selling, np.iinfo(np.int64).max).min(axis=1, initial=np.iinfo(np.int64).max)
+    highest = np.where(ok, selling, np.iinfo(np.int64).min).max(axis=1, initial=np.iinfo(np.int64).min)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Scenarios without a valid row report NaN for the selling price stats
+        return {
+            "rows": np.full(scenarios, shape[1]),
+            "valid": count,
+            "selling_mean": np.where(ok, selling, 0).sum(axis=1) / count / 100,
+            "selling_min": np.where(count, lowest / 100, np.nan),
+            "selling_max": np.where(count, highest / 100, np.nan),
+            "revenue": total("Selling Price (€)"),
+            "profit": total("Profit (€)"),
+            "fees": sum(total(key) for key in _FEE_KEYS),
+            "tax": total("Total Tax (€)"),
+        }
+
+
+def iter_sweep(catalog: Sequence[np.ndarray], grid: Dict[str, Sequence[float]],
+               backend: str = "float", block_cells: int = SWEEP_BLOCK_CELLS
+               ) -> Iterator[Tuple[np.ndarray, Dict[str, np.ndarray], np.ndarray]]:
+    """Yield ``(scenarios, outputs, valid)`` block by block, in this process.
+
+    ``scenarios`` is a (s, params) slice of the grid; ``outputs`` and
+    ``valid`` are as from ``price_columns`` for the catalog tiled s times,
+    scenario-major (row ``i * rows + r`` is catalog row r under scenario i).
+    """
+    names, scenarios = scenario_grid(grid)
+    step = _block_size(len(catalog[0]), block_cells)
+    for start in range(0, len(scenarios), step):
+        block = scenarios[start:start + step]
+        outputs, valid = _price_block(catalog, names, block, backend)
+        yield block, outputs, valid
+
+
+# Catalog and settings of a pool worker, set once per process
+_worker_state: Optional[tuple] = None
+
+
+def _init_worker(catalog, names, backend):
+    global _worker_state
+    _worker_state = (catalog, names, backend)
+
+
+def _summarize_block(block: np.ndarray) -> Dict[str, np.ndarray]:
+    catalog, names, backend = _worker_state
+    outputs, valid = _price_block(catalog, names, block, backend)
+    return _summarize(catalog, outputs, valid, len(block))
+
+
+def sweep(catalog: Sequence[np.ndarray], grid: Dict[str, Sequence[float]], backend: str = "float",
+          workers: Optional[int] = None, block_cells: int = SWEEP_BLOCK_CELLS):
+    """Price ``catalog`` under every scenario of ``grid`` and summarize each one.
+
+    ``catalog`` is the nine typed input columns, ``grid`` maps names from
+    SWEEP_PARAMS to the values to try. Returns a DataFrame with one row per
+    scenario: the parameter values followed by SUMMARY_STATS. ``workers``
+    sets the process pool size; by default a pool of all CPUs is used for
+    sweeps of at least POOL_MIN_CELLS rows x scenarios, 1 means in-process.
+    """
+    import pandas as pd
+
+    names, scenarios = scenario_grid(grid)
+    rows = len(catalog[0])
+    if workers is None:
+        workers = (os.cpu_count() or 1) if rows * len(scenarios) >= POOL_MIN_CELLS else 1
+    step = _block_size(rows, block_cells)
+    blocks = [scenarios[i:i + step] for i in range(0, len(scenarios), step)]
+    if workers > 1 and len(blocks) > 1:
+        catalog = [np.ascontiguousarray(col) for col in catalog]
+        with ProcessPoolExecutor(max_workers=min(workers, len(blocks)), initializer=_init_worker,
+                                 initargs=(catalog, names, backend)) as pool:
+            parts = list(pool.map(_summarize_block, blocks))
+    else:
+        parts = []
+        for block in blocks:
+            outputs, valid = _price_block(catalog, names, block, backend)
+            parts.append(_summarize(catalog, outputs, valid, len(block)))
+    summary = {name: scenarios[:, j] for j, name in enumerate(names)}
+    for stat in SUMMARY_STATS:
+        summary[stat] = np.concatenate([part[stat] for part in parts]) if parts else np.zeros(0)
+    return pd.DataFrame(summary)
@@ -0,0 +1,90 @@
+"""Quantity-weighted totals of a sheet, maintained by deltas.
+
+A row's line total in a money column is its quantity times the unit
+value. ``SheetTotals`` keeps the sums of those line totals (and of the
+quantities) as rows are added and subtracted, so a sheet only has to
+hand it the rows that change: subtract a row before it is overwritten,
+add it back after. All sums are integer hundredths, so subtracting a
+row exactly undoes adding it, however many edits go by.
+
+Outputs are only counted for rows that are priced and up to date; the
+number of other rows is ``rows - counted``.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+# Columns whose line totals are summed (the money inputs and every output)
+MONEY_COLS = [1, 2, 3] + list(range(9, 16))
+# Percentages, only averaged (weighted by quantity)
+PERCENT_COLS = [4, 5, 6, 7, 8]
+
+
+def input_hundredths(inputs: np.ndarray) -> np.ndarray:
+    """Input amounts in whole hundredths, the precision the sheet shows."""
+    return np.round(np.asarray(inputs, dtype=np.float64) * 100).astype(np.int64)
+
+
+class SheetTotals:
+    def __init__(self):
+        self.rows = 0
+        self.quantity = 0
+        # Σ quantity × value in hundredths, per input column (quantity excluded)
+        self.inputs = [0] * 8
+        # Rows whose outputs are counted, their quantity, and Σ quantity × output
+        self.counted = 0
+        self.counted_quantity = 0
+        self.outputs = [0] * 7
+
+    def add_inputs(self, quantity: np.ndarray, inputs: np.ndarray, sign: int = 1):
+        """Add (``sign=-1``: subtract) rows given as quantity (k,) and inputs (8, k)."""
+        quantity = np.asarray(quantity, dtype=np.int64)
+        if len(quantity) == 1:
+            # Single rows (cell edits) in plain Python, cheaper than the numpy calls
+            q = int(quantity[0])
+            self.rows += sign
+            self.quantity += sign * q
+            self.inputs = [total + sign * q * round(value * 100)
+                           for total, value in zip(self.inputs, np.asarray(inputs)[:, 0].tolist())]
+            return
+        self.rows += sign * len(quantity)
+        self.quantity += sign * int(quantity.sum())
+        lines = (input_hundredths(inputs) * quantity).sum(axis=1)
+        self.inputs = [total + sign * int(line) for total, line in zip(self.inputs, lines)]
+
+    def add_outputs(self, quantity: np.ndarray, outputs: np.ndarray, counted: np.ndarray,
+                    sign: int = 1):
+        """Add (or subtract) the outputs (7, k) of the ``counted`` rows among k rows."""
+        if len(quantity) == 1:
+            if counted[0]:
+                q = sign * int(quantity[0])
+                self.counted += sign
+                self.counted_quantity += q
+                self.outputs = [total + q * value for total, value
+                                in zip(self.outputs, np.asarray(outputs)[:, 0].tolist())]
+            return
+        quantity = np.where(counted, np.asarray(quantity, dtype=np.int64), 0)
+        self.counted += sign * int(np.count_nonzero(counted))
+        self.counted_quantity += sign * int(quantity.sum())
+        lines = (np.asarray(outputs, dtype=np.int64) * quantity).sum(axis=1)
+        self.outputs = [total + sign * int(line) for total, line in zip(self.outputs, lines)]
+
+    def line_total(self, column: int) -> Optional[int]:
+        """Σ quantity × value of a money column in hundredths (the quantity itself for column 0)."""
+        if column == 0:
+            return self.quantity
+        if column in PERCENT_COLS:
+            return None
+        return self.inputs[column - 1] if column < 9 else self.outputs[column - 9]
+
+    def average(self, column: int) -> Optional[float]:
+        """Quantity-weighted average of a column in hundredths (per row for column 0).
+
+        None while there is nothing to average.
+        """
+        if column == 0:
+            return self.quantity * 100 / self.rows if self.rows else None
+        if column < 9:
+            return self.inputs[column - 1] / self.quantity if self.quantity else None
+        return self.outputs[column - 9] / self.counted_quantity if self.counted_quantity else None
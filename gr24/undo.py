@@ -0,0 +1,133 @@
+"""Undo commands for the pricing sheet.
+
+Commands keep only what they change: the old and new values of the
+edited input cells, the input columns of inserted or removed rows, or,
+for clearing the sheet, the model's arrays themselves, handed over
+without a copy. Flagged cells (text that isn't a number) they overwrite
+or remove are restored on undo. A whole paste or delete is one command. Undone and
+redone rows come back stale and are repriced lazily when displayed.
+"""
+
+from typing import List, Sequence
+
+import numpy as np
+from PySide6.QtGui import QUndoCommand
+
+UNDO_LIMIT = 100
+
+
+class SetCells(QUndoCommand):
+    """Write a block of typed input columns at ``(row, column)``, appending rows past the end."""
+
+    def __init__(self, model, row: int, column: int, columns: Sequence[np.ndarray],
+                 text: str = "Edit"):
+        super().__init__(text)
+        self.model = model
+        self.row, self.column = row, column
+        self.new = [np.array(col) for col in columns]
+        count = len(self.new[0])
+        rows = model.rowCount()
+        self.existing = max(0, min(count, rows - row))
+        self.appended = max(0, row + count - rows)
+        block = model.input_columns(slice(row, row + self.existing))
+        self.old = [col.copy() for col in block[column:column + len(columns)]]
+        self.flagged = [cell for cell in model.invalid_cells(slice(row, row + self.existing))
+                        if column <= cell[1] < column + len(columns)]
+
+    def redo(self):
+        self.model.set_inputs(self.row, self.column, self.new)
+
+    def undo(self):
+        if self.appended:
+            self.model.removeRows(self.model.rowCount() - self.appended, self.appended)
+        if self.existing:
+            self.model.set_inputs(self.row, self.column, self.old)
+        for row, column, text in self.flagged:
+            self.model.set_invalid(row, column, text)
+
+
+class FlagCell(QUndoCommand):
+    """Keep ``text``, which isn't a number, flagged in input cell ``(row, column)``."""
+
+    def __init__(self, model, row: int, column: int, text: str, label: str = "Edit"):
+        super().__init__(label)
+        self.model = model
+        self.row, self.column, self.text = row, column, text
+        self.old_text = model.invalid_text(row, column)
+        self.old = model.input_columns(slice(row, row + 1))[column].copy()
+
+    def redo(self):
+        self.model.set_invalid(self.row, self.column, self.text)
+
+    def undo(self):
+        self.model.set_inputs(self.row, self.column, [self.old])
+        if self.old_text is not None:
+            self.model.set_invalid(self.row, self.column, self.old_text)
+
+
+class InsertRows(QUndoCommand):
+    """Insert rows at ``row`` from nine typed input columns."""
+
+    def __init__(self, model, row: int, columns: Sequence, text: str = "Insert rows"):
+        super().__init__(text)
+        self.model = model
+        self.row = row
+        self.columns: List[np.ndarray] = [np.array(col) for col in columns]
+
+    def redo(self):
+        self.model.insert_rows(self.row, self.columns)
+
+    def undo(self):
+        self.model.removeRows(self.row, len(self.columns[0]))
+
+
+class RemoveRows(QUndoCommand):
+    """Remove ``count`` rows at ``row``, keeping their inputs for undo."""
+
+    def __init__(self, model, row: int, count: int, text: str = "Delete rows"):
+        super().__init__(text)
+        self.model = model
+        self.row, self.count = row, count
+        self.columns = [col.copy() for col in model.input_columns(slice(row, row + count))]
+        self.flagged = model.invalid_cells(slice(row, row + count))
+
+    def redo(self):
+        self.model.removeRows(self.row, self.count)
+
+    def undo(self):
+        self.model.insert_rows(self.row, self.columns)
+        for row, column, text in self.flagged:
+            self.model.set_invalid(row, column, text)
+
+
+class ClearSheet(QUndoCommand):
+    """Empty the sheet; the arrays move into the command and back on undo, never copied."""
+
+    def __init__(self, model, text: str = "Delete all"):
+        super().__init__(text)
+        self.model = model
+        self.storage = None
+
+    def redo(self):
+        self.storage = self.model.take_storage()
+
+    def undo(self):
+        self.model.restore_storage(self.storage)
+        self.storage = None
+
+    def release_mapping(self, path: str):
+        if self.storage is not None:
+            self.storage = self.model.unmapped_storage(self.storage, path)
+
+
+def release_mapping(stack, path: str):
+    """Copy sheets kept by the commands of ``stack`` into memory if mapped from ``path``.
+
+    See ``PricingTableModel.release_mapping``.
+    """
+    commands = [stack.command(i) for i in range(stack.count())]
+    while commands:
+        command = commands.pop()
+        commands.extend(command.child(i) for i in range(command.childCount()))
+        if isinstance(command, ClearSheet):
+            command.release_mapping(path)
@@ -0,0 +1,87 @@
+"""Differential check of the batch pricing backends against the Decimal path.
+
+Run as ``python -m gr24.verify --rows 5000000``; exits non-zero if any
+value differs from ``compute_pricing``.
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from gr24.columns import EN_COLS
+from gr24.batch import price_columns
+from gr24.fixed import _dec, compute_pricing_fixed
+from gr24.parsing import hundredths
+from gr24.pricing import compute_pricing
+
+
+def _random_inputs(rng: np.random.Generator, n: int) -> list:
+    """Random input columns in hundredths, biased towards round numbers,
+    half-cent ties and degenerate denominators."""
+    def money_col():
+        col = rng.integers(0, 10_000_000, n)
+        round_ = rng.random(n) < 0.3
+        col[round_] = rng.integers(0, 2000, round_.sum()) * rng.choice([5, 10, 50, 100], round_.sum())
+        return col
+
+    def pct_col():
+        col = rng.integers(-500, 5000, n)
+        common = rng.random(n) < 0.5
+        col[common] = rng.choice([0, 500, 700, 1000, 1200, 1500, 1900, 2500, 3333, 5000],
+                                 common.sum())
+        return col
+
+    cols = [rng.integers(0, 1000, n) * 100, money_col(), money_col(), money_col()]
+    cols += [pct_col() for _ in range(5)]
+    # Percentages summing to exactly 100 % exercise the zero-denominator fallback
+    full = rng.random(n) < 0.01
+    for i in range(5, 9):
+        cols[i][full] = 2500
+    return cols
+
+
+def differential_check(rows: int = 1_000_000, seed: int = 0, backend: str = "fixed",
+                       chunk: int = 100_000, scalar_every: int = 50) -> int:
+    """Compare a batch backend against the Decimal path.
+
+    Prices ``rows`` random rows with ``price_columns`` and every row with
+    ``compute_pricing``, plus every ``scalar_every``-th row with
+    ``compute_pricing_fixed``. Returns the number of mismatching values.
+    """
+    rng = np.random.default_rng(seed)
+    mismatches = 0
+    for start in range(0, rows, chunk):
+        n = min(chunk, rows - start)
+        cols = _random_inputs(rng, n)
+        text = [[str(_dec(v)) for v in col] for col in cols]
+        text[0] = [str(v // 100) for v in cols[0]]
+        out, valid = price_columns(*text, backend=backend)
+        for r in range(n):
+            args = [col[r] for col in text]
+            ref = compute_pricing(*args)
+            got = {key: out[key][r] for key in EN_COLS}
+            for key in EN_COLS:
+                if not valid[r] or got[key] != hundredths(ref[key]):
+                    mismatches += 1
+                    print(f"mismatch {key}: {args} -> {got[key]}, expected {ref[key]}",
+                          file=sys.stderr)
+            if r % scalar_every == 0 and compute_pricing_fixed(*args) != ref:
+                mismatches += 1
+                print(f"scalar mismatch: {args}", file=sys.stderr)
+    return mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Differential check of a batch pricing backend against Decimal.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backend", choices=["fixed", "float"], default="fixed")
+    args = parser.parse_args()
+    started = time.perf_counter()
+    failures = differential_check(args.rows, args.seed, args.backend)
+    print(f"{args.rows} rows checked in {time.perf_counter() - started:.1f}s, "
+          f"{failures} mismatches")
+    sys.exit(1 if failures else 0)
@@ -1,161 +1,84 @@
 
+import time
+_STARTED = time.perf_counter()
+
+import copy
+import os
 import sys
-from decimal import Decimal, ROUND_HALF_UP, getcontext
-from typing import List, Dict
+from typing import List, Dict, Sequence
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import QLocale, Qt, QTimer
+from PySide6.QtGui import QKeySequence, QShortcut, QUndoStack
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QHBoxLayout, QVBoxLayout,
-    QPushButton, QTableWidget, QTableWidgetItem, QFileDialog, QMessageBox,
-    QHeaderView, QLabel, QSpacerItem, QSizePolicy
+    QPushButton, QTableView, QFileDialog, QMessageBox, QLineEdit,
+    QHeaderView, QLabel, QSpacerItem, QSizePolicy, QProgressDialog
 )
 
-import pandas as pd
-
-getcontext().prec = 28
-D = lambda x: Decimal(str(x))
-Q2 = Decimal("0.01")
-
-def money(x: Decimal) -> Decimal:
-    return x.quantize(Q2, rounding=ROUND_HALF_UP)
-
-def compute_pricing(quantity, purchase_price, shipping_costs, packaging_costs,
-                    margin_pct, amazon_pct, ebay_pct, extra_pct, vat_pct):
-
-    quantity      = int(float(str(quantity) or 0))
-    purchase      = D(str(purchase_price or 0))
-    shipping      = D(str(shipping_costs or 0))
-    packaging     = D(str(packaging_costs or 0))
-    margin_pct    = D(str(margin_pct or 0)) / 100
-    amazon_pct    = D(str(amazon_pct or 0)) / 100
-    ebay_pct      = D(str(ebay_pct or 0)) / 100
-    extra_pct     = D(str(extra_pct or 0)) / 100
-    vat_pct       = D(str(vat_pct or 0)) / 100
-
-    base_cost = purchase + shipping + packaging
-    profit_unit = purchase * margin_pct
-    total_costs_unit = base_cost + profit_unit
-
-    total_pct = amazon_pct + ebay_pct + extra_pct + vat_pct
-    denominator = (Decimal(1) - total_pct) if (Decimal(1) - total_pct) != 0 else Decimal(1)
-    selling_price_unit = total_costs_unit / denominator
-
-    total_tax_unit   = selling_price_unit * vat_pct
-    amazon_fee_unit  = selling_price_unit * amazon_pct
-    ebay_fee_unit    = selling_price_unit * ebay_pct
-    extra_fee_unit   = selling_price_unit * extra_pct
-
-    out_unit = {
-        "Quantity": quantity,
-        "Purchase Price (€)": money(purchase),
-        "Shipping Costs (€)": money(shipping),
-        "Packaging Costs (€)": money(packaging),
-        "Margin (%)": money(margin_pct * 100),
-        "Amazon Fees (%)": money(amazon_pct * 100),
-        "eBay Fees (%)": money(ebay_pct * 100),
-        "Additional Costs / Advertising Costs (%)": money(extra_pct * 100),
-        "VAT (%)": money(vat_pct * 100),
-        "Profit (€)": money(profit_unit),
-        "Total Tax (€)": money(total_tax_unit),
-        "Total Costs (€)": money(total_costs_unit),
-        "Total Amazon Fees (€)": money(amazon_fee_unit),
-        "Total eBay Fees (€)": money(ebay_fee_unit),
-        "Total Additional Costs / Advertising Costs (€)": money(extra_fee_unit),
-        "Selling Price (€)": money(selling_price_unit),
-    }
-    return out_unit
-
-
-DE_COLS = [
-    "Menge",
-    "Kaufpreis",
-    "Versandkosten",
-    "Verpackungskosten",
-    "Marge (%)",
-    "Amazon-Gebühren (%)",
-    "eBay-Gebühren (%)",
-    "Zusätzliche Kosten / Werbekosten (%)",
-    "MwSt (%)",
-    "Profit (€)",
-    "Gesamtsteuer (€)",
-    "Gesamtkosten (€)",
-    "Gesamte Amazon-Gebühren (€)",
-    "Gesamte eBay-Gebühren (€)",
-    "Gesamte Zusatzkosten / Werbekosten (€)",
-    "Verkaufspreis (€)",
-]
-
-EN_COLS = [
-    "Quantity",
-    "Purchase Price (€)",
-    "Shipping Costs (€)",
-    "Packaging Costs (€)",
-    "Margin (%)",
-    "Amazon Fees (%)",
-    "eBay Fees (%)",
-    "Additional Costs / Advertising Costs (%)",
-    "VAT (%)",
-    "Profit (€)",
-    "Total Tax (€)",
-    "Total Costs (€)",
-    "Total Amazon Fees (€)",
-    "Total eBay Fees (€)",
-    "Total Additional Costs / Advertising Costs (€)",
-    "Selling Price (€)",
-]
-
-# Wrapped (multi-line) headers for UI readability
-DE_COLS_WRAPPED = [
-    "Menge",
-    "Kaufpreis",
-    "Versand-\nkosten",
-    "Verpackungs-\nkosten",
-    "Marge (%)",
-    "Amazon-\nGebühren (%)",
-    "eBay-\nGebühren (%)",
-    "Zusätzliche Kosten\n/\nWerbekosten (%)",
-    "MwSt (%)",
-    "Profit (€)",
-    "Gesamt-\nsteuer (€)",
-    "Gesamt-\nkosten (€)",
-    "Gesamte Amazon-\nGebühren (€)",
-    "Gesamte eBay-\nGebühren (€)",
-    "Gesamte Zusatzkosten\n/\nWerbekosten (€)",
-    "Verkaufs-\npreis (€)",
-]
-
-EN_COLS_WRAPPED = [
-    "Quantity",
-    "Purchase\nPrice (€)",
-    "Shipping\nCosts (€)",
-    "Packaging\nCosts (€)",
-    "Margin (%)",
-    "Amazon\nFees (%)",
-    "eBay\nFees (%)",
-    "Additional Costs\n/\nAdvertising Costs (%)",
-    "VAT (%)",
-    "Profit (€)",
-    "Total\nTax (€)",
-    "Total\nCosts (€)",
-    "Total Amazon\nFees (€)",
-    "Total eBay\nFees (€)",
-    "Total Additional Costs\n/\nAdvertising Costs (€)",
-    "Selling\nPrice (€)",
-]
-
-
-COL_MAP_EN_TO_DE = dict(zip(EN_COLS, DE_COLS))
-
-INPUT_COLS_IDX = list(range(0, 9))   # first 9 columns are inputs
+import numpy as np
+
+from gr24.columns import (
+    DE_COLS, EN_COLS, DE_COLS_WRAPPED, EN_COLS_WRAPPED, COL_MAP_EN_TO_DE, INPUT_COLS_IDX,
+)
+from gr24.pricing import compute_pricing
+from gr24.fixed import compute_pricing_fixed
+from gr24.instrument import INSTRUMENTATION, instrumented, start_profile
+from gr24.autosave import Autosave
+from gr24.batch import price_columns
+from gr24.cache import PricingCache
+from gr24.export import write_workbook
+from gr24.footer import TotalsFooter
+from gr24.catalog import read_catalog
+from gr24.jobs import FileJob, ImportJob, start
+from gr24.model import OUTPUT_COLS, PricingTableModel, parse_input_block
+from gr24.parsing import hundredths
+from gr24.proxy import NumericSortFilterProxy
+from gr24.project import PROJECT_EXTENSION, read_json, read_project, write_json, write_project
+from gr24.reprice import BackgroundRepricer
+from gr24.scheduler import RecomputeScheduler
+from gr24.startup import StartupTimer
+from gr24.undo import UNDO_LIMIT, ClearSheet, InsertRows, RemoveRows, SetCells, release_mapping
+
+# pandas (only needed by _gather_dataframe) and openpyxl (catalog import)
+# are imported on first use to keep startup short
+_IMPORTED = time.perf_counter()
+
+# Scalar pricing backends; both give identical results, "fixed" computes on
+# integer cents (see "Pricing backends" in the README to choose one)
+PRICING_BACKENDS = {
+    "decimal": compute_pricing,
+    "fixed": compute_pricing_fixed,
+}
+# Memoized scalar backends used for single-row recomputes; inspect with .info()
+PRICING_CACHES = {name: PricingCache(pricer) for name, pricer in PRICING_BACKENDS.items()}
+# Batch backend matching each scalar backend
+BATCH_BACKENDS = {"decimal": "float", "fixed": "fixed"}
+REPRICE_CHUNK_ROWS = 65536
+# Batches at least this large are repriced on a worker thread
+ASYNC_REPRICE_ROWS = 4096
+# Typing pauses this long before the filter is applied
+FILTER_DELAY_MS = 300
+# Excel export choices in the save dialog: the current language only, or
+# DE and EN sheets formatted in one pass, optionally with a summary sheet
+EXCEL_EXPORTS = {
+    "Excel Workbook (*.xlsx)": "single",
+    "Excel Workbook, DE + EN (*.xlsx)": "bilingual",
+    "Excel Workbook, DE + EN + summary (*.xlsx)": "summary",
+}
 
 
 class PricingApp(QMainWindow):
-    def __init__(self):
+    def __init__(self, backend: str = None):
         super().__init__()
         self.setWindowTitle("GR24")
         self.language = "de"  # default DE
+        backend = backend or os.environ.get("GR24_PRICING_BACKEND", "decimal")
+        self.backend = backend if backend in PRICING_BACKENDS else "decimal"
         self.buttons: Dict[str, QPushButton] = {}
+        self._jobs: Dict[object, tuple] = {}  # job signals -> (job, progress dialog, messages)
+        self._import = None  # (job, progress dialog) of the running catalog import
         self._building_ui = False
+        self._diagnostics = None
 
         central = QWidget()
         self.setCentralWidget(central)
@@ -175,7 +98,8 @@ class PricingApp(QMainWindow):
         top_bar.addSpacing(16)
 
         # Buttons
-        for key in ["start", "copy", "expand", "delete", "save", "delete_all", "download"]:
+        for key in ["start", "copy", "expand", "delete", "open", "import", "save", "delete_all",
+                    "download"]:
             btn = QPushButton()
             btn.setCursor(Qt.PointingHandCursor)
             btn.setMinimumHeight(34)
@@ -186,6 +110,13 @@ class PricingApp(QMainWindow):
         # Spacer
         top_bar.addItem(QSpacerItem(20, 20, QSizePolicy.Expanding, QSizePolicy.Minimum))
 
+        # Row filter, e.g. "selling price > 50 and profit < 0"
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.setMinimumHeight(34)
+        self.filter_edit.setMinimumWidth(260)
+        top_bar.addWidget(self.filter_edit)
+
         # Language toggle button (EN/DE)
         lang_btn = QPushButton()
         lang_btn.setCursor(Qt.PointingHandCursor)
@@ -198,38 +129,96 @@ class PricingApp(QMainWindow):
         main_layout.addLayout(top_bar)
 
         # Table
-        self.table = QTableWidget(0, len(EN_COLS))
+        self.model = PricingTableModel(self)
+        self.model.set_pricer(self._price_inputs)
+        self.repricer = BackgroundRepricer(self.model, self._price_inputs, parent=self)
+        # Edits, pastes and deletes go through the undo stack
+        self.undo_stack = QUndoStack(self)
+        self.undo_stack.setUndoLimit(UNDO_LIMIT)
+        self.model.set_undo_stack(self.undo_stack)
+        # Sorting and filtering work on the numeric columns, rows keep their model order
+        self.proxy = NumericSortFilterProxy(self)
+        self.proxy.setSourceModel(self.model)
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
         header = self.table.horizontalHeader()
+        # Unsorted at first; a third click on a header goes back to model order
+        header.setSortIndicator(-1, Qt.AscendingOrder)
+        header.setSortIndicatorClearable(True)
+        self.table.setSortingEnabled(True)
         header.setSectionResizeMode(QHeaderView.Stretch)
         header.setMinimumHeight(48)   # give space for two-line headers
         self.table.verticalHeader().setVisible(False)
+        # Fixed row heights so the view never measures rows it doesn't paint
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(32)
         self.table.setAlternatingRowColors(True)
         self.table.setWordWrap(True)  # for body cells
         self.table.setStyleSheet("""
-            QTableWidget::item { padding: 6px; }
+            QTableView::item { padding: 6px; }
             QHeaderView::section {
                 background: #F0F4FF; padding: 8px; border: 1px solid #CBD5E1;
                 font-weight: 700;            /* bold headers */
             }
         """)
-        main_layout.addWidget(self.table)
+        # Sums and averages pinned right below the table
+        self.footer = TotalsFooter(self.model, self.table, repricer=self.repricer)
+        table_box = QVBoxLayout()
+        table_box.setSpacing(0)
+        table_box.addWidget(self.table)
+        table_box.addWidget(self.footer)
+        main_layout.addLayout(table_box)
 
         # Wire button actions
         self.buttons["start"].clicked.connect(self.action_start)
         self.buttons["copy"].clicked.connect(self.action_copy)
         self.buttons["expand"].clicked.connect(self.action_expand)
         self.buttons["delete"].clicked.connect(self.action_delete)
+        self.buttons["open"].clicked.connect(self.action_open)
+        self.buttons["import"].clicked.connect(self.action_import)
         self.buttons["save"].clicked.connect(self.action_save)
         self.buttons["delete_all"].clicked.connect(self.action_delete_all)
         self.buttons["download"].clicked.connect(self.action_download_excel)
         self.buttons["lang"].clicked.connect(self.toggle_language)
-
-        # React to cell edits
-        self.table.itemChanged.connect(self._on_cell_changed)
-
-        # Apply language & initialize a single blank row
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(FILTER_DELAY_MS)
+        self._filter_timer.timeout.connect(self.apply_filter)
+        self.filter_edit.textChanged.connect(self._filter_timer.start)
+        self.filter_edit.returnPressed.connect(self.apply_filter)
+
+        # Paste spreadsheet ranges: overwrite from the current cell, or insert as new rows
+        QShortcut(QKeySequence.Paste, self.table).activated.connect(self.action_paste)
+        QShortcut(QKeySequence("Ctrl+Shift+V"), self.table).activated.connect(
+            lambda: self.action_paste(insert=True))
+        undo = self.undo_stack.createUndoAction(self)
+        undo.setShortcut(QKeySequence.Undo)
+        redo = self.undo_stack.createRedoAction(self)
+        redo.setShortcut(QKeySequence.Redo)
+        self.addActions([undo, redo])
+        # Hidden timing panel for performance reports
+        QShortcut(QKeySequence("Ctrl+Alt+Shift+D"), self).activated.connect(self.show_diagnostics)
+
+        # React to cell edits; edited rows are repriced in debounced batches
+        self.recompute = RecomputeScheduler(self.model, self._reprice_rows, parent=self)
+        self.model.inputEdited.connect(self._on_cell_changed)
+        # Replacing the sheet stops a catalog import that is still filling it
+        self.model.modelReset.connect(self._cancel_import)
+
+        # Journal every edit; the last session is restored on startup
+        self.autosave = Autosave.from_env(self.model, parent=self)
+
+        # Apply language & restore the last session or start with a single blank row
         self.apply_language()
-        self.action_start()
+        restored = self.autosave.restore() if self.autosave else None
+        if restored is None:
+            self.action_start()
+        elif restored in ("de", "en") and restored != self.language:
+            self.language = restored
+            self.apply_language()
+        if self.autosave:
+            self.autosave.start()
+        self.undo_stack.clear()
 
         # Make window large-ish
         self.resize(1200, 700)
@@ -268,174 +257,430 @@ class PricingApp(QMainWindow):
         if self.language == "de":
             btns = {
                 "start": "Start", "copy": "Kopieren", "expand": "Expandieren",
-                "delete": "Löschen", "save": "Speichern", "delete_all": "Alles löschen",
+                "delete": "Löschen", "open": "Öffnen", "import": "Importieren",
+                "save": "Speichern", "delete_all": "Alles löschen",
                 "download": "Download (Excel)", "lang": "EN"
             }
         else:
             btns = {
                 "start": "Start", "copy": "Copy", "expand": "Expand",
-                "delete": "Delete", "save": "Save", "delete_all": "Delete All",
+                "delete": "Delete", "open": "Open", "import": "Import",
+                "save": "Save", "delete_all": "Delete All",
                 "download": "Download (Excel)", "lang": "DE"
             }
 
         for key, btn in self.buttons.items():
             btn.setText(btns.get(key, key))
+        self.filter_edit.setPlaceholderText(
+            "Filter, z. B. Verkaufspreis > 50 und Gewinn < 0" if self.language == "de"
+            else "Filter, e.g. selling price > 50 and profit < 0")
 
         # Table headers (wrapped for UI)
-        self.table.setHorizontalHeaderLabels(self._headers_for_ui())
+        self.model.set_headers(self._headers_for_ui())
+        # Edits are read with the number format of the language shown
+        self.model.set_locale(QLocale(QLocale.German, QLocale.Germany) if self.language == "de"
+                              else QLocale(QLocale.English, QLocale.UnitedStates))
+        if self.autosave:
+            self.autosave.set_language(self.language)
         self._building_ui = False
 
     def toggle_language(self):
         self.language = "en" if self.language == "de" else "de"
         self.apply_language()
 
+    def apply_filter(self):
+        self._filter_timer.stop()
+        try:
+            self.proxy.set_filter(self.filter_edit.text())
+        except ValueError as e:
+            self.filter_edit.setStyleSheet("border: 1px solid #DC2626;")
+            self.filter_edit.setToolTip(str(e))
+            return
+        self.filter_edit.setStyleSheet("")
+        self.filter_edit.setToolTip("")
+
     # ---- Data helpers ----
-    def _new_row_defaults(self) -> List[str]:
-        return ["0", "0.00", "0.00", "0.00", "0.00", "0.00", "0.00", "0.00", "0.00",
-                "", "", "", "", "", "", ""]
+    def _new_row_defaults(self) -> list:
+        return [0] + [0.0] * 8
 
-    def _add_row(self, values: List[str] = None):
+    @instrumented("add_row")
+    def _add_row(self, values: Sequence = None):
+        """Append a row from nine typed input values (default: all 0)."""
         values = values or self._new_row_defaults()
-        r = self.table.rowCount()
-        self.table.insertRow(r)
-        self.table.blockSignals(True)
-        for c, val in enumerate(values):
-            item = QTableWidgetItem(str(val))
-            flags = Qt.ItemIsSelectable | Qt.ItemIsEnabled
-            if c in INPUT_COLS_IDX:
-                flags |= Qt.ItemIsEditable
-            item.setFlags(flags)
-            item.setTextAlignment(Qt.AlignVCenter | Qt.AlignRight)
-            self.table.setItem(r, c, item)
-        self.table.blockSignals(False)
+        row = [[value] for value in values]
+        r = self.model.rowCount()
+        self.undo_stack.push(InsertRows(self.model, r, row, "Add row"))
         self._recompute_row(r)
 
-    def _on_cell_changed(self, item: QTableWidgetItem):
+    @instrumented("on_cell_changed")
+    def _on_cell_changed(self, row: int, column: int):
         if self._building_ui:
             return
-        if item.column() in INPUT_COLS_IDX:
-            self._recompute_row(item.row())
-
-    def _get_row_inputs(self, row: int) -> Dict[str, str]:
-        def txt(c):
-            it = self.table.item(row, c)
-            return (it.text() if it else "0").replace(",", ".").strip()
-        return {
-            "quantity": txt(0),
-            "purchase_price": txt(1),
-            "shipping_costs": txt(2),
-            "packaging_costs": txt(3),
-            "margin_pct": txt(4),
-            "amazon_pct": txt(5),
-            "ebay_pct": txt(6),
-            "extra_pct": txt(7),
-            "vat_pct": txt(8),
-        }
+        if column in INPUT_COLS_IDX:
+            self.recompute.mark(row)
 
+    def _current_index(self):
+        # The view shows the sorted, filtered proxy; actions work on model rows
+        return self.proxy.mapToSource(self.table.currentIndex())
+
+    @instrumented("recompute_row")
     def _recompute_row(self, row: int):
-        inputs = self._get_row_inputs(row)
         try:
-            out = compute_pricing(**inputs)
+            out = PRICING_CACHES[self.backend](*self.model.row_inputs(row))
+            outputs = {key: hundredths(out[key]) for key in OUTPUT_COLS}
         except Exception:
+            # Flagged in the row's output cells instead of keeping stale outputs
+            self.model.set_outputs(row, dict.fromkeys(OUTPUT_COLS, 0), valid=False)
             return
-
-        outputs = [
-            f"{out['Profit (€)']}",
-            f"{out['Total Tax (€)']}",
-            f"{out['Total Costs (€)']}",
-            f"{out['Total Amazon Fees (€)']}",
-            f"{out['Total eBay Fees (€)']}",
-            f"{out['Total Additional Costs / Advertising Costs (€)']}",
-            f"{out['Selling Price (€)']}",
-        ]
-
-        self.table.blockSignals(True)
-        for i, val in enumerate(outputs, start=9):
-            item = self.table.item(row, i)
-            if item is None:
-                item = QTableWidgetItem()
-                item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-                item.setTextAlignment(Qt.AlignVCenter | Qt.AlignRight)
-                self.table.setItem(row, i, item)
-            item.setText(str(val))
-        self.table.blockSignals(False)
-
-    def _gather_dataframe(self) -> pd.DataFrame:
-        # Always build with EN keys (since compute_pricing returns EN labels),
-        # then rename to DE if language is DE at export time.
-        rows: List[Dict[str, str]] = []
-        for r in range(self.table.rowCount()):
-            inputs = self._get_row_inputs(r)
-            out = compute_pricing(**inputs)
-            rows.append(out)
-        df = pd.DataFrame(rows, columns=EN_COLS)
+        self.model.set_outputs(row, outputs)
+
+    def _price_inputs(self, columns: Sequence[np.ndarray]):
+        return price_columns(*columns, errors="coerce", backend=BATCH_BACKENDS[self.backend])
+
+    @instrumented("reprice_rows", rows=lambda self, rows: len(rows))
+    def _reprice_rows(self, rows: np.ndarray):
+        if len(rows) == 1:
+            self._recompute_row(int(rows[0]))
+        elif len(rows) < ASYNC_REPRICE_ROWS:
+            outputs, valid = self._price_inputs(self.model.input_columns(rows))
+            self.model.set_outputs(rows, outputs, valid)
+        else:
+            # Chunked so results show up as they are ready and temporaries stay small
+            for start in range(0, len(rows), REPRICE_CHUNK_ROWS):
+                self.repricer.submit(rows[start:start + REPRICE_CHUNK_ROWS])
+
+    def _reprice_all(self):
+        n = self.model.rowCount()
+        for start in range(0, n, REPRICE_CHUNK_ROWS):
+            self.repricer.submit(slice(start, min(start + REPRICE_CHUNK_ROWS, n)))
+
+    def load_inputs(self, columns: Sequence[Sequence]):
+        """Replace the sheet with nine typed input columns and reprice it in the background."""
+        self.undo_stack.clear()
+        self.model.set_columns(columns)
+        self._reprice_all()
+
+    @instrumented("gather_dataframe", rows=lambda self: self.model.rowCount())
+    def _gather_dataframe(self) -> "pd.DataFrame":
+        import pandas as pd
+
+        # Always build with EN keys, then rename to DE if language is DE.
+        # Outputs come from the already priced columns, nothing is recomputed.
+        self.recompute.flush()
+        columns, priced = self.model.sheet_columns()
+        data = {key: col for key, col in zip(EN_COLS[:9], columns[:9])}
+        for key, col in zip(EN_COLS[9:], columns[9:]):
+            data[key] = np.where(priced, col / 100, np.nan)
+        df = pd.DataFrame(data, columns=EN_COLS)
         if self.language == "de":
             df = df.rename(columns=COL_MAP_EN_TO_DE)
         return df
 
     # ---- Button actions ----
     def action_start(self):
-        self.table.blockSignals(True)
-        self.table.setRowCount(0)
-        self.table.blockSignals(False)
+        self.undo_stack.beginMacro("Start")
+        self.undo_stack.push(ClearSheet(self.model))
         self._add_row()
+        self.undo_stack.endMacro()
 
     def action_copy(self):
-        r = self.table.currentRow()
+        r = self._current_index().row()
         if r < 0:
-            r = self.table.rowCount() - 1
+            r = self.model.rowCount() - 1
             if r < 0:
                 self._add_row()
                 return
-        vals = [self.table.item(r, c).text() if self.table.item(r, c) else "" for c in range(self.table.columnCount())]
-        self._add_row(vals[:9] + ["", "", "", "", "", "", ""])
+        self._add_row(self.model.row_inputs(r))
 
     def action_expand(self):
         self._add_row()
 
+    def action_paste(self, insert: bool = False):
+        current = self.table.currentIndex()
+        column = current.column() if current.isValid() and current.column() in INPUT_COLS_IDX else 0
+        try:
+            columns = parse_input_block(QApplication.clipboard().text(), column, self.model.locale())
+        except ValueError as e:
+            QMessageBox.warning(self, "Paste", f"Clipboard contains a value that is not a number:\n{e}")
+            return
+        if not columns:
+            return
+        if insert:
+            index = self._current_index()
+            self.paste_inputs(index.row() if index.isValid() else self.model.rowCount(), column,
+                              columns, insert=True)
+            return
+        # Overwrite the rows as they are shown, sorted and filtered; the
+        # rest of the block goes into new rows at the end
+        count = len(columns[0])
+        rows = self.proxy.source_rows(current.row(), count) if current.isValid() else []
+        n = self.model.rowCount()
+        rows = np.concatenate([rows, np.arange(n, n + count - len(rows))]).astype(np.int64)
+        self.paste_inputs(rows, column, columns)
+
+    def paste_inputs(self, row, column: int, columns: Sequence[np.ndarray], insert: bool = False):
+        """Write a block of typed input columns starting at ``(row, column)`` and reprice it once.
+
+        Overwrites (appending rows past the end) or, with ``insert``, inserts
+        the block as new rows whose other inputs are 0. Either way it is one
+        undo step. When overwriting, ``row`` may also be an array giving the
+        model row of each row of the block, as for a paste into a sorted view.
+        """
+        count = len(columns[0])
+        if insert:
+            full = [np.zeros(count, dtype=np.int64 if c == 0 else np.float64) for c in INPUT_COLS_IDX]
+            full[column:column + len(columns)] = columns
+            self.undo_stack.push(InsertRows(self.model, row, full, "Paste"))
+            self._reprice_rows(np.arange(row, row + count))
+            return
+        rows = np.arange(row, row + count) if np.ndim(row) == 0 else np.asarray(row, dtype=np.int64)
+        # One SetCells per run of consecutive rows
+        bounds = [0, *(np.flatnonzero(np.diff(rows) != 1) + 1).tolist(), count]
+        if len(bounds) > 2:
+            self.undo_stack.beginMacro("Paste")
+        for start, stop in zip(bounds, bounds[1:]):
+            self.undo_stack.push(SetCells(self.model, int(rows[start]), column,
+                                          [col[start:stop] for col in columns], "Paste"))
+        if len(bounds) > 2:
+            self.undo_stack.endMacro()
+        self._reprice_rows(rows)
+
     def action_delete(self):
-        r = self.table.currentRow()
+        r = self._current_index().row()
         if r >= 0:
-            self.table.removeRow(r)
+            self.undo_stack.push(RemoveRows(self.model, r, 1))
 
     def action_delete_all(self):
-        self.table.setRowCount(0)
+        # The sheet's arrays move into the undo stack, so undo is instant
+        self.undo_stack.push(ClearSheet(self.model))
 
-    def action_save(self):
-        path, _ = QFileDialog.getSaveFileName(self, "Save data", "pricing_data.json", "JSON (*.json)")
+    def action_open(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Open data", "",
+            f"GR24 files (*{PROJECT_EXTENSION} *.json);;GR24 project (*{PROJECT_EXTENSION});;JSON (*.json)")
+        if not path:
+            return
+        try:
+            if path.lower().endswith(".json"):
+                language, columns, flagged = read_json(path)
+            else:
+                language, quantity, inputs, flagged = read_project(path)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to open file:\n{e}")
+            return
+        self.recompute.cancel()
+        self.undo_stack.clear()
+        if path.lower().endswith(".json"):
+            self.load_inputs(columns)
+        else:
+            # Rows are priced lazily as they are displayed
+            self.model.attach_columns(quantity, inputs)
+        self.model.set_invalid_cells(flagged)
+        if language in ("de", "en") and language != self.language:
+            self.language = language
+            self.apply_language()
+
+    def action_import(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import catalog", "",
+            "Catalogs (*.csv *.xlsx);;CSV (*.csv);;Excel Workbook (*.xlsx)")
         if not path:
             return
-        data = []
-        for r in range(self.table.rowCount()):
-            row_vals = [self.table.item(r, c).text() if self.table.item(r, c) else "" for c in range(self.table.columnCount())]
-            data.append(row_vals)
         try:
-            import json
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump({"language": self.language, "rows": data}, f, ensure_ascii=False, indent=2)
-            QMessageBox.information(self, "Saved", "Data saved successfully.")
+            language, chunks = read_catalog(path)
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save file:\n{e}")
+            QMessageBox.critical(self, "Error", f"Failed to import file:\n{e}")
+            return
+        self.recompute.cancel()
+        self.undo_stack.clear()
+        self.model.clear()
+        if language in ("de", "en") and language != self.language:
+            self.language = language
+            self.apply_language()
+        # Chunks are read and priced on a worker and appended as they arrive
+        job = ImportJob(chunks, self._price_inputs)
+        dialog = QProgressDialog("Importing...", "Cancel", 0, 0, self)
+        dialog.setMinimumDuration(300)
+        dialog.canceled.connect(job.cancel)
+        self._import = (job, dialog)
+        job.signals.chunk.connect(self._on_import_chunk)
+        job.signals.finished.connect(self._on_import_finished)
+        job.signals.failed.connect(self._on_import_failed)
+        job.signals.cancelled.connect(self._on_import_cancelled)
+        start(job)
+
+    def action_save(self):
+        path, selected = QFileDialog.getSaveFileName(
+            self, "Save data", "pricing_data" + PROJECT_EXTENSION,
+            f"GR24 project (*{PROJECT_EXTENSION});;JSON (*.json)")
+        if not path:
+            return
+        language = self.language
+        flagged = self.model.invalid_cells(slice(None))
+        if not (path.lower().endswith(".json") or selected.startswith("JSON")):
+            self.recompute.flush()
+            inputs = [col.copy() for col in self.model.input_columns()]
+            self._start_file_job(path, lambda part, progress: write_project(part, language, inputs,
+                                                                            progress=progress,
+                                                                            flagged=flagged),
+                                 "save_project", "Saving...", "Data saved successfully.", "Failed to save file")
+            return
+        columns, priced = self._snapshot()
+        self._start_file_job(path, lambda part, progress: write_json(part, language, columns, priced,
+                                                                     progress=progress,
+                                                                     flagged=flagged),
+                             "save_json", "Saving...", "Data saved successfully.", "Failed to save file")
 
     def action_download_excel(self):
 
         suggested = "pricing_DE.xlsx" if self.language == "de" else "pricing_EN.xlsx"
-        path, _ = QFileDialog.getSaveFileName(self, "Export to Excel", suggested, "Excel Workbook (*.xlsx)")
+        path, selected = QFileDialog.getSaveFileName(self, "Export to Excel", suggested,
+                                                     ";;".join(EXCEL_EXPORTS))
         if not path:
             return
-        try:
-            df = self._gather_dataframe()
-            df.to_excel(path, index=False)
-            QMessageBox.information(self, "Exported", "Excel file created successfully.")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to export Excel:\n{e}")
-
+        kind = EXCEL_EXPORTS.get(selected, "single")
+        if kind == "single":
+            sheets = [("Sheet1", DE_COLS if self.language == "de" else EN_COLS)]
+        else:
+            sheets = [("DE", DE_COLS), ("EN", EN_COLS)]
+        columns, priced = self._snapshot()
+        flagged = self.model.invalid_cells(slice(None))
+        # Everything is priced now, so the totals cover every row
+        summary = copy.copy(self.model.totals()) if kind == "summary" else None
+        self._start_file_job(path, lambda part, progress: write_workbook(part, sheets, columns, priced,
+                                                                         summary, progress=progress,
+                                                                         flagged=flagged),
+                             "export_excel", "Exporting...", "Excel file created successfully.",
+                             "Failed to export Excel")
+
+    # ---- Background file jobs ----
+    def _snapshot(self):
+        # Copies, so edits made while a job runs don't leak into its file
+        self.recompute.flush()
+        columns, priced = self.model.sheet_columns()
+        return [col.copy() for col in columns], priced.copy()
+
+    def _start_file_job(self, path: str, write, operation: str, label: str, done_message: str,
+                        error_prefix: str):
+        rows = self.model.rowCount()
+        # Windows can't replace the project the sheet is still mapped from
+        self.model.release_mapping(path)
+        release_mapping(self.undo_stack, path)
+
+        def timed_write(part, progress):
+            # Timed on the worker, so this is the write itself without the GUI wait
+            with INSTRUMENTATION.timed(operation, rows):
+                write(part, progress)
+
+        job = FileJob(path, timed_write)
+        dialog = QProgressDialog(label, "Cancel", 0, 100, self)
+        dialog.setMinimumDuration(300)
+        dialog.canceled.connect(job.cancel)
+        self._jobs[job.signals] = (job, dialog, done_message, error_prefix)
+        job.signals.progress.connect(self._on_job_progress)
+        job.signals.finished.connect(self._on_job_finished)
+        job.signals.failed.connect(self._on_job_failed)
+        job.signals.cancelled.connect(self._on_job_cancelled)
+        start(job)
+
+    def _end_job(self) -> tuple:
+        job, dialog, done_message, error_prefix = self._jobs.pop(self.sender())
+        dialog.canceled.disconnect()
+        dialog.reset()
+        dialog.deleteLater()
+        return done_message, error_prefix
+
+    def _on_job_progress(self, done: int, total: int):
+        entry = self._jobs.get(self.sender())
+        if entry is not None:
+            entry[1].setMaximum(total)
+            entry[1].setValue(done)
+
+    def _on_job_finished(self, path: str):
+        done_message, _ = self._end_job()
+        self.statusBar().showMessage(done_message, 5000)
+
+    def _on_job_failed(self, error: str):
+        _, error_prefix = self._end_job()
+        box = QMessageBox(QMessageBox.Critical, "Error", f"{error_prefix}:\n{error}", parent=self)
+        box.setAttribute(Qt.WA_DeleteOnClose)
+        box.open()
+
+    def _is_current_import(self) -> bool:
+        return self._import is not None and self.sender() is self._import[0].signals
+
+    def _end_import(self):
+        job, dialog = self._import
+        self._import = None
+        dialog.canceled.disconnect()
+        dialog.reset()
+        dialog.deleteLater()
+
+    def _cancel_import(self):
+        if self._import is not None:
+            self._import[0].cancel()
+            self._end_import()
+
+    def _on_import_chunk(self, payload):
+        if not self._is_current_import():
+            return
+        columns, outputs, valid = payload
+        r = self.model.rowCount()
+        self.model.insert_rows(r, columns)
+        self.model.set_outputs(slice(r, r + len(columns[0])), outputs, valid)
+        self._import[1].setLabelText(f"Importing... {self.model.rowCount()} rows")
+
+    def _on_import_finished(self, rows: int):
+        if self._is_current_import():
+            self._end_import()
+            self.statusBar().showMessage(f"Imported {rows} rows.", 5000)
+
+    def _on_import_failed(self, error: str):
+        if self._is_current_import():
+            self._end_import()
+            box = QMessageBox(QMessageBox.Critical, "Error", f"Failed to import file:\n{error}",
+                              parent=self)
+            box.setAttribute(Qt.WA_DeleteOnClose)
+            box.open()
+
+    def _on_import_cancelled(self):
+        if self._is_current_import():
+            self._end_import()
+            self.statusBar().showMessage("Cancelled.", 5000)
+
+    def show_diagnostics(self):
+        if self._diagnostics is None:
+            from gr24.diagnostics import DiagnosticsPanel
+
+            self._diagnostics = DiagnosticsPanel(
+                self, extra=lambda: {"pricing cache": PRICING_CACHES[self.backend].info()})
+        self._diagnostics.show()
+        self._diagnostics.raise_()
+
+    def _on_job_cancelled(self):
+        self._end_job()
+        self.statusBar().showMessage("Cancelled.", 5000)
 
 def main():
+    stop_profile = start_profile()
+    timer = StartupTimer.from_env(_STARTED)
+    if timer:
+        timer.mark("imports", _IMPORTED)
     app = QApplication(sys.argv)
+    if timer:
+        timer.mark("QApplication")
     win = PricingApp()
+    if timer:
+        timer.mark("window")
+        timer.watch_first_paint(win.table.viewport())
     win.show()
-    sys.exit(app.exec())
+    status = app.exec()
+    win.repricer.close()
+    if win.autosave:
+        win.autosave.close()
+    if stop_profile:
+        stop_profile()
+    sys.exit(status)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+from gr24.autosave import Autosave
+from gr24.model import PricingTableModel
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Fills a 5-row sheet and edits it, then replaces it by a 3-row one (as
+# open, import and Delete All do), edits that and is killed before the
+# snapshot of the new sheet is written
+_CRASHING_SESSION = textwrap.dedent("""
+    import os, sys, time
+    import numpy as np
+    from PySide6.QtCore import QCoreApplication
+    import gr24.autosave
+    from gr24.model import PricingTableModel
+
+    app = QCoreApplication([])
+    model = PricingTableModel()
+    autosave = gr24.autosave.Autosave(model, sys.argv[1])
+
+    def reset_and_wait(columns):
+        model.set_columns(columns)
+        snapshot = autosave._path("snapshot", autosave.generation)
+        while not os.path.exists(snapshot):
+            time.sleep(0.01)
+
+    autosave.start()
+    reset_and_wait([np.arange(5, dtype=np.int64)] + [np.full(5, float(c)) for c in range(8)])
+    model.set_inputs(1, 1, [np.array([11.0])])
+    autosave.flush()
+
+    gr24.autosave.start = lambda job: None  # the snapshot job never gets to run
+    model.set_columns([np.ones(3, dtype=np.int64)] + [np.zeros(3)] * 8)
+    model.set_inputs(2, 1, [np.array([77.0])])
+    autosave.flush()
+    os._exit(1)
+""")
+
+
+def test_crash_before_reset_snapshot_restores_the_previous_sheet(qapp, tmp_path):
+    result = subprocess.run([sys.executable, "-c", _CRASHING_SESSION, str(tmp_path)],
+                            cwd=ROOT, timeout=60)
+    assert result.returncode == 1
+
+    model = PricingTableModel()
+    Autosave(model, str(tmp_path)).restore()
+    assert model.rowCount() == 5
+    assert model.input_columns()[1].tolist() == [0.0, 11.0, 0.0, 0.0, 0.0]
+    assert any(name.endswith(".log.bad") for name in os.listdir(tmp_path))
@@ -0,0 +1,28 @@
+import pytest
+
+from gr24.cache import PricingCache
+from gr24.pricing import compute_pricing
+
+ROW = (3, 12.5, 4.9, 0.5, 30.0, 15.0, 0.0, 5.0, 19.0)
+
+
+def test_hits_share_a_read_only_result():
+    cache = PricingCache()
+    first = cache(*ROW)
+    assert cache(*ROW) is first
+    assert dict(first) == compute_pricing(*ROW)
+    assert cache.info()["hits"] == 1
+    with pytest.raises(TypeError):
+        first["Selling Price (€)"] = 0
+
+
+def test_least_recently_used_is_evicted():
+    cache = PricingCache(maxsize=2)
+    rows = [(1, float(price)) + ROW[2:] for price in (1, 2, 3)]
+    cache(*rows[0])
+    cache(*rows[1])
+    cache(*rows[0])
+    cache(*rows[2])
+    assert len(cache) == 2
+    cache(*rows[0])
+    assert cache.info()["misses"] == 3
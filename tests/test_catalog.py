@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from openpyxl import Workbook
+
+from gr24.catalog import read_catalog
+from gr24.columns import EN_COLS
+
+HEADER = ",".join(f'"{label}"' for label in EN_COLS[:9])
+
+
+def test_errors_name_the_row_of_the_file(tmp_path):
+    path = tmp_path / "catalog.csv"
+    lines = [HEADER, "1,2,0,0,0,0,0,0,19", "", ",,,,,,,,", "2,x,0,0,0,0,0,0,19"]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    _, chunks = read_catalog(path, chunk_rows=2)
+    with pytest.raises(ValueError, match="row 4"):
+        list(chunks)
+
+
+def test_blank_rows_are_skipped(tmp_path):
+    path = tmp_path / "catalog.csv"
+    lines = [HEADER, "1,2,0,0,0,0,0,0,19", "", "3,4,0,0,0,0,0,0,19", ",,,,,,,,"]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    _, chunks = read_catalog(path, chunk_rows=2)
+    columns = [np.concatenate(cols) for cols in zip(*chunks)]
+    assert columns[0].tolist() == [1, 3]
+    assert columns[1].tolist() == [2.0, 4.0]
+
+
+def test_closing_the_chunks_closes_the_workbook(tmp_path, monkeypatch):
+    import openpyxl
+
+    path = tmp_path / "catalog.xlsx"
+    book = Workbook()
+    book.active.append(list(EN_COLS[:9]))
+    for i in range(10):
+        book.active.append([i, 1.5, 0, 0, 0, 0, 0, 0, 19])
+    book.save(path)
+
+    closed = []
+    load = openpyxl.load_workbook
+
+    def load_workbook(*args, **kwargs):
+        workbook = load(*args, **kwargs)
+        close = workbook.close
+        workbook.close = lambda: (closed.append(True), close())
+        return workbook
+
+    monkeypatch.setattr(openpyxl, "load_workbook", load_workbook)
+    _, chunks = read_catalog(path, chunk_rows=3)
+    assert next(chunks)[0].tolist() == [0, 1, 2]
+    assert not closed
+    chunks.close()
+    assert closed
@@ -0,0 +1,41 @@
+import itertools
+
+import pytest
+
+from gr24.batch import price_columns
+from gr24.columns import EN_COLS
+from gr24.fixed import compute_pricing_fixed
+from gr24.parsing import hundredths
+from gr24.pricing import compute_pricing
+from gr24.verify import differential_check
+
+BACKENDS = ("float", "fixed")
+
+
+def _tie_rows() -> list:
+    """Rows whose profit, costs, selling price or tax land on or next to a half cent."""
+    rows = []
+    purchases = [f"{cents / 100:.2f}" for cents in range(1, 2000, 37)] + ["0.10", "1.01", "2.05"]
+    for purchase, margin, vat, fee in itertools.product(
+            purchases, ("5", "15", "50", "33.33"), ("0", "10", "50", "19"), ("0", "12.5", "33.33")):
+        rows.append(("3", purchase, "0.05", "0", margin, fee, "0", "0", vat))
+    # Percentages summing to 100 %
+    rows.append(("1", "0.10", "0", "0", "5", "25", "25", "25", "25"))
+    return rows
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_random_rows_match_decimal(backend):
+    assert differential_check(5_000, seed=24, backend=backend, chunk=2_500, scalar_every=1) == 0
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_tie_rows_match_decimal(backend):
+    rows = _tie_rows()
+    out, valid = price_columns(*zip(*rows), backend=backend)
+    assert valid.all()
+    for r, row in enumerate(rows):
+        expected = compute_pricing(*row)
+        for key in EN_COLS:
+            assert out[key][r] == hundredths(expected[key]), (row, key)
+        assert compute_pricing_fixed(*row) == expected, row
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from gr24.columns import EN_COLS
+from gr24.filters import filter_mask, match_column, parse_filter
+
+PROFIT = EN_COLS.index("Profit (€)")
+SELLING = EN_COLS.index("Selling Price (€)")
+
+
+@pytest.mark.parametrize("name", ["profit", "Profit (€)", "gewinn", "Gewinn", "gew"])
+def test_profit_column_names(name):
+    assert match_column(name) == PROFIT
+
+
+def test_german_placeholder_example():
+    conditions = parse_filter("Verkaufspreis >= 49,90 und Gewinn < 0")
+    assert [(c.column, c.op, c.value) for c in conditions] == [
+        (SELLING, ">=", 49.9), (PROFIT, "<", 0.0)]
+    columns = {SELLING: np.array([60.0, 60.0, 10.0]), PROFIT: np.array([-1.0, 2.0, -1.0])}
+    assert filter_mask(conditions, columns.__getitem__).tolist() == [True, False, False]
+
+
+def test_unknown_column():
+    with pytest.raises(ValueError, match="unknown column"):
+        match_column("Umsatz")
@@ -0,0 +1,44 @@
+import time
+
+import numpy as np
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QTableView
+
+from gr24.batch import price_columns
+from gr24.footer import TotalsFooter
+from gr24.model import PricingTableModel
+from gr24.reprice import BackgroundRepricer
+
+
+def _pricer(columns):
+    return price_columns(*columns, errors="coerce")
+
+
+def test_footer_totals_cover_every_row_once_priced(qapp):
+    n = 5000
+    model = PricingTableModel()
+    model.set_pricer(_pricer)
+    repricer = BackgroundRepricer(model, _pricer)
+    table = QTableView()
+    table.setModel(model)
+    footer = TotalsFooter(model, table, repricer=repricer)
+
+    quantity = np.ones(n, dtype=np.int64)
+    inputs = np.vstack([np.full(n, 10.0), np.zeros(n), np.zeros(n), np.full(n, 20.0),
+                        np.zeros((4, n))])
+    model.attach_columns(quantity, inputs)
+    selling = footer.totals_model.index(0, 15)
+    qapp.processEvents()
+    assert footer.totals_model.data(selling).endswith("…")
+
+    deadline = time.monotonic() + 30
+    while len(model.stale_rows()) or repricer.pending():
+        assert time.monotonic() < deadline
+        qapp.processEvents()
+        time.sleep(0.01)
+    time.sleep(0.1)
+    qapp.processEvents()
+    assert model.totals().counted == n
+    assert footer.totals_model.data(selling) == f"{12 * n}.00"
+    assert footer.totals_model.data(selling, Qt.ForegroundRole) is None
+    repricer.close()
@@ -0,0 +1,32 @@
+import numpy as np
+from PySide6.QtCore import Qt
+
+from gr24_pricing_app import PricingApp
+
+
+def _prices(app):
+    return app.model.input_columns(slice(None))[1].tolist()
+
+
+def test_paste_into_sorted_view_writes_the_rows_shown(qapp):
+    app = PricingApp()
+    app.load_inputs([np.ones(4, dtype=np.int64), np.array([4.0, 1.0, 3.0, 2.0])]
+                    + [np.zeros(4)] * 7)
+    app.proxy.sort(1, Qt.DescendingOrder)
+    # Shown as 4, 3, 2, 1: paste 40, 30 and 20 from the top, then two rows past the end
+    app.table.setCurrentIndex(app.proxy.index(0, 1))
+    app.paste_inputs(app.proxy.source_rows(0, 3), 1, [np.array([40.0, 30.0, 20.0])])
+    assert _prices(app) == [40.0, 1.0, 30.0, 20.0]
+
+    app.undo_stack.undo()
+    assert _prices(app) == [4.0, 1.0, 3.0, 2.0]
+
+    app.proxy.set_filter("Purchase Price (€) < 3")
+    app.table.setCurrentIndex(app.proxy.index(0, 1))
+    qapp.clipboard().setText("20\n10\n7\n8")
+    app.action_paste()
+    assert _prices(app) == [4.0, 10.0, 3.0, 20.0, 7.0, 8.0]
+    # Several runs of rows, still one undo step
+    app.undo_stack.undo()
+    assert _prices(app) == [4.0, 1.0, 3.0, 2.0]
+    app.close()
@@ -0,0 +1,93 @@
+import json
+
+import numpy as np
+import pytest
+from PySide6.QtGui import QUndoStack
+
+from gr24.jobs import FileJob
+from gr24.model import PricingTableModel
+from gr24.project import read_json, read_project, write_json, write_project
+from gr24.undo import ClearSheet, release_mapping
+
+
+def _sheet(n):
+    inputs = [np.arange(1, n + 1, dtype=np.int64)] + [np.full(n, 1.5 * c) for c in range(8)]
+    return inputs + [np.zeros(n, dtype=np.int64)] * 7, np.zeros(n, dtype=bool)
+
+
+@pytest.mark.parametrize("chunk_bytes", [16, 64, 1 << 20])
+def test_json_keeps_flagged_text_with_brackets(tmp_path, chunk_bytes):
+    path = tmp_path / "sheet.json"
+    columns, priced = _sheet(20)
+    flagged = [(3, 1, 'see "a"], ["b'), (4, 2, "x\\], [y"), (19, 8, "[]")]
+    write_json(path, "en", columns, priced, chunk_rows=7, flagged=flagged)
+
+    language, inputs, read_flagged = read_json(path, chunk_bytes=chunk_bytes)
+    assert language == "en"
+    assert sorted(read_flagged) == sorted(flagged)
+    assert inputs[0].tolist() == list(range(1, 21))
+    assert inputs[2][5] == 1.5
+
+
+def test_json_language_after_rows(tmp_path):
+    path = tmp_path / "sheet.json"
+    rows = [["2", "1.234,56", "0", "0", "0", "0", "0", "0", "19"]]
+    path.write_text(json.dumps({"rows": rows, "language": "de"}), encoding="utf-8")
+    language, inputs, flagged = read_json(path, chunk_bytes=8)
+    assert language == "de"
+    assert flagged == []
+    assert inputs[1].tolist() == [1234.56]
+
+
+def test_json_truncated(tmp_path):
+    path = tmp_path / "sheet.json"
+    row = json.dumps(["1"] * 9)
+    path.write_text('{"language": "en", "rows": [%s, ["3", "]' % row, encoding="utf-8")
+    with pytest.raises(ValueError, match="malformed rows after row 1"):
+        read_json(path, chunk_bytes=8)
+
+
+def _save(path, model):
+    # As the app saves: to a .part file that then replaces the target
+    inputs = [col.copy() for col in model.input_columns()]
+    job = FileJob(str(path), lambda part, progress: write_project(part, "de", inputs, progress))
+    failed = []
+    job.signals.failed.connect(failed.append)
+    job.run()
+    assert failed == []
+
+
+def test_save_over_open_project(qapp, tmp_path):
+    path = tmp_path / "sheet.gr24"
+    columns, _ = _sheet(10)
+    write_project(path, "de", columns[:9])
+    model = PricingTableModel()
+    model.attach_columns(*read_project(path)[1:3])
+    model.set_inputs(2, 1, [np.array([9.25])])
+
+    model.release_mapping(str(path))
+    assert not any(isinstance(col, np.memmap) for col in model.input_columns())
+    _save(path, model)
+
+    _, quantity, inputs, _ = read_project(path)
+    assert quantity.tolist() == list(range(1, 11))
+    assert inputs[0][2] == 9.25
+
+
+def test_save_over_open_project_after_delete_all(qapp, tmp_path):
+    path = tmp_path / "sheet.gr24"
+    columns, _ = _sheet(10)
+    write_project(path, "de", columns[:9])
+    model = PricingTableModel()
+    stack = QUndoStack()
+    model.attach_columns(*read_project(path)[1:3])
+    stack.push(ClearSheet(model))
+
+    model.release_mapping(str(path))
+    release_mapping(stack, str(path))
+    _save(path, model)
+    assert read_project(path)[1].tolist() == []
+
+    stack.undo()
+    assert not any(isinstance(col, np.memmap) for col in model.input_columns())
+    assert model.input_columns()[0].tolist() == list(range(1, 11))